@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+
+import argparse
+import csv
+import json
+
+import numpy as np
+
+from hop_index import build_hop_index
+from traceroute_corpus import load_corpus, directed_link_table
+
+
+# Router-path sentinels: padding after the end of a path and '*' hops
+PAD = -1
+STAR = -2
+
+
+def router_paths(corpus):
+    """
+    Router-level paths of every record, without the final destination hop.
+
+    Returns:
+        tuple: (paths [records, max_hops] with STAR for '*' and PAD after the end,
+                lengths [records])
+    """
+    router = corpus["router"]
+    hop_ip = corpus["hop_ip"]
+    hop = np.arange(router.shape[1])
+
+    valid_hop = hop[None, :] < corpus["length"][:, None]
+    is_star = valid_hop & (hop_ip == 0)
+    is_end = valid_hop & (router < 0) & ~is_star
+
+    # The path stops at the first non-router reply (the destination host)
+    end = np.where(is_end.any(axis=1), is_end.argmax(axis=1), corpus["length"])
+    inside = hop[None, :] < end[:, None]
+
+    paths = np.where(inside, np.where(is_star, STAR, router), PAD).astype(np.int32)
+    return paths, end.astype(np.int32)
+
+
+def reverse_paths(paths, lengths):
+    """Reverse the valid prefix of every padded path."""
+    hop = np.arange(paths.shape[1])
+    idx = lengths[:, None] - 1 - hop[None, :]
+    valid = idx >= 0
+    rows = np.arange(paths.shape[0])[:, None]
+    return np.where(valid, paths[rows, np.maximum(idx, 0)], PAD)
+
+
+def batched_edit_distance(a, len_a, b, len_b):
+    """
+    Levenshtein distance between row pairs of two padded integer matrices,
+    one dynamic-programming sweep vectorized over all rows.
+    """
+    n, k = a.shape[0], max(a.shape[1], b.shape[1], 1)
+    a = np.pad(a, ((0, 0), (0, k - a.shape[1])), constant_values=PAD)
+    b = np.pad(b, ((0, 0), (0, k - b.shape[1])), constant_values=PAD)
+    rows = np.arange(n)
+
+    prev = np.tile(np.arange(k + 1, dtype=np.int32), (n, 1))
+    result = np.where(len_a == 0, len_b, 0).astype(np.int32)
+
+    for i in range(1, k + 1):
+        cur = np.empty_like(prev)
+        cur[:, 0] = i
+        for j in range(1, k + 1):
+            substitution = prev[:, j - 1] + (a[:, i - 1] != b[:, j - 1])
+            cur[:, j] = np.minimum(np.minimum(prev[:, j] + 1, cur[:, j - 1] + 1), substitution)
+        result = np.where(len_a == i, cur[rows, len_b], result)
+        prev = cur
+
+    return result
+
+
+def undirected_link_mask(paths, link_table):
+    """[records, router links] boolean mask of the links each path traverses."""
+    u, v = paths[:, :-1], paths[:, 1:]
+    valid = (u >= 0) & (v >= 0)
+    dl = np.full(u.shape, -1, dtype=np.int32)
+    dl[valid] = link_table[u[valid], v[valid]]
+
+    mask = np.zeros((paths.shape[0], int(link_table.max()) // 2 + 1), dtype=bool)
+    rec, hop = np.nonzero(dl >= 0)
+    mask[rec, dl[rec, hop] // 2] = True
+    return mask
+
+
+def compute_asymmetry(corpus, index=None):
+    """
+    Compare forward and reverse router paths of every unordered host pair in every cell.
+
+    Returns:
+        dict: Per pair arrays "cell", "src", "dst", "complete" (both directions
+              reached with no '*' hop), "asymmetric", "edit_distance",
+              "hop_delta" (forward - reverse router hops) and "link_overlap"
+              (shared links / links used by either direction)
+    """
+    index = build_hop_index() if index is None else index
+    if len(corpus["cell"]) == 0:
+        # No traceroutes (empty tree or only empty cells): no pairs
+        return {
+            "cell": corpus["cell"][:0],
+            "src": corpus["src"][:0],
+            "dst": corpus["dst"][:0],
+            "complete": np.zeros(0, dtype=bool),
+            "asymmetric": np.zeros(0, dtype=bool),
+            "edit_distance": np.zeros(0, dtype=np.int32),
+            "hop_delta": np.zeros(0, dtype=np.int32),
+            "link_overlap": np.zeros(0, dtype=np.float64),
+        }
+    paths, lengths = router_paths(corpus)
+
+    # Row of the reverse direction of every record
+    num_nodes = len(index.nodes)
+    key = (corpus["cell"].astype(np.int64) * num_nodes + corpus["src"]) * num_nodes + corpus["dst"]
+    reverse_key = (corpus["cell"].astype(np.int64) * num_nodes + corpus["dst"]) * num_nodes + corpus["src"]
+    order = np.argsort(key)
+    pos = np.searchsorted(key, reverse_key, sorter=order)
+    pos = order[np.minimum(pos, len(order) - 1)]
+    has_reverse = key[pos] == reverse_key
+
+    fwd = np.nonzero(has_reverse & (corpus["src"] < corpus["dst"]))[0]
+    rev = pos[fwd]
+
+    fwd_paths, fwd_len = paths[fwd], lengths[fwd]
+    rev_paths = reverse_paths(paths[rev], lengths[rev])
+    rev_len = lengths[rev]
+
+    complete = (corpus["reached"][fwd] & corpus["reached"][rev] &
+                ~(fwd_paths == STAR).any(axis=1) & ~(rev_paths == STAR).any(axis=1))
+
+    edit = batched_edit_distance(fwd_paths, fwd_len, rev_paths, rev_len)
+
+    link_table = directed_link_table(index)
+    fwd_mask = undirected_link_mask(fwd_paths, link_table)
+    rev_mask = undirected_link_mask(rev_paths, link_table)
+    shared = (fwd_mask & rev_mask).sum(axis=1)
+    used = (fwd_mask | rev_mask).sum(axis=1)
+
+    return {
+        "cell": corpus["cell"][fwd],
+        "src": corpus["src"][fwd],
+        "dst": corpus["dst"][fwd],
+        "complete": complete,
+        "asymmetric": edit > 0,
+        "edit_distance": edit,
+        "hop_delta": fwd_len - rev_len,
+        "link_overlap": np.where(used > 0, shared / np.maximum(used, 1), 1.0),
+    }
+
+
+def summarize_asymmetry(metrics, cells):
+    """
+    Summary table per (cost model, percentage) over complete pairs.
+
+    Returns:
+        list: Row dictionaries sorted by cost model and percentage
+    """
+    cost_model = np.array([cells[c]["cost_model"] for c in metrics["cell"]], dtype=object)
+    percentage = np.array([cells[c]["percentage"] for c in metrics["cell"]])
+    rows = []
+
+    for model in sorted(set(cost_model)):
+        for pct in sorted(set(percentage[cost_model == model])):
+            group = (cost_model == model) & (percentage == pct)
+            ok = group & metrics["complete"]
+            n = int(ok.sum())
+            rows.append({
+                "cost_model": model,
+                "percentage": int(pct),
+                "runs": len({int(c) for c in metrics["cell"][group]}),
+                "pairs": int(group.sum()),
+                "complete_pairs": n,
+                "asymmetric_fraction": float(metrics["asymmetric"][ok].mean()) if n else 0.0,
+                "mean_edit_distance": float(metrics["edit_distance"][ok].mean()) if n else 0.0,
+                "mean_abs_hop_delta": float(np.abs(metrics["hop_delta"][ok]).mean()) if n else 0.0,
+                "mean_link_overlap": float(metrics["link_overlap"][ok].mean()) if n else 0.0,
+            })
+
+    return rows
+
+
+def print_summary(rows):
+    """Print the summary table in a fixed-width layout."""
+    header = f"{'cost_model':<24} {'pct':>4} {'runs':>5} {'pairs':>6} {'asym':>6} {'edit':>6} {'|dh|':>6} {'overlap':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['cost_model']:<24} {r['percentage']:>4} {r['runs']:>5} {r['complete_pairs']:>6} "
+              f"{r['asymmetric_fraction']:>6.2f} {r['mean_edit_distance']:>6.2f} "
+              f"{r['mean_abs_hop_delta']:>6.2f} {r['mean_link_overlap']:>8.2f}")
+
+
+def save_pair_metrics(filename, metrics, cells, index):
+    """Write per-pair metrics as CSV."""
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["sim", "cost_model", "percentage", "src", "dst", "complete",
+                         "asymmetric", "edit_distance", "hop_delta", "link_overlap"])
+        for i in range(len(metrics["cell"])):
+            cell = cells[metrics["cell"][i]]
+            writer.writerow([cell["sim"], cell["cost_model"], cell["percentage"],
+                             index.nodes[metrics["src"][i]], index.nodes[metrics["dst"][i]],
+                             int(metrics["complete"][i]), int(metrics["asymmetric"][i]),
+                             int(metrics["edit_distance"][i]), int(metrics["hop_delta"][i]),
+                             f"{metrics['link_overlap'][i]:.4f}"])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Forward/reverse path asymmetry metrics over a simulations tree',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('base_dir', type=str, help='Simulations directory to analyze')
+    parser.add_argument('--pairs-csv', type=str, help='Write per-pair metrics to this CSV file')
+    parser.add_argument('--summary-json', type=str, help='Write the summary table to this JSON file')
+    args = parser.parse_args()
+
+    hop_index = build_hop_index()
+    corpus = load_corpus(args.base_dir, index=hop_index)
+    metrics = compute_asymmetry(corpus, hop_index)
+    summary = summarize_asymmetry(metrics, corpus["cells"])
+
+    print_summary(summary)
+
+    if args.pairs_csv:
+        save_pair_metrics(args.pairs_csv, metrics, corpus["cells"], hop_index)
+
+    if args.summary_json:
+        with open(args.summary_json, 'w') as f:
+            json.dump(summary, f, indent=2)
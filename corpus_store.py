@@ -0,0 +1,472 @@
+#!/usr/bin/python3
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from hop_index import build_hop_index
+from topology_spec import HOSTS, host_ip
+from traceroute_corpus import discover_cells
+from traceroute_parser import parse_traceroute_file
+
+
+FORMAT_VERSION = 2
+
+# Router path entry of a '*' hop
+STAR_ROUTER = 0xFFFF
+
+# One fixed-width record per traceroute hop; the addresses live in the
+# interned path table, so a hop only carries its measurements
+HOP_DTYPE = np.dtype([
+    ('rtt', '<f4'),         # mean RTT of the answered probes in ms, NaN if none
+    ('ttl', 'u1'),
+    ('answered', 'u1'),     # probes answered
+    ('lost', 'u1'),         # probes lost ('*')
+    ('pad', 'u1'),
+])
+
+# One record per traceroute (header index)
+RECORD_DTYPE = np.dtype([
+    ('cell', '<u4'),
+    ('src', '<u2'),         # host index in meta["hosts"]
+    ('dst', '<u2'),
+    ('path', '<u4'),        # interned hop-address sequence
+    ('router_path', '<u4'), # interned router-level path
+    ('num_hops', '<u2'),
+    ('reached', 'u1'),
+    ('pad', 'u1'),
+    ('pad2', '<u4'),
+    ('hop_offset', '<u8'),  # first hop record in hops.bin
+])
+
+# One record per (simulation, percentage)
+CELL_DTYPE = np.dtype([
+    ('sim', '<u4'),         # simulation index in meta["sims"]
+    ('percentage', '<u2'),
+    ('pad', '<u2'),
+    ('first_record', '<u8'),
+    ('num_records', '<u4'),
+    ('pad2', '<u4'),
+])
+
+# Interned path tables: elements live in path_hops.bin / router_path_hops.bin
+PATH_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('length', '<u2'),
+    ('pad', '<u2'),
+    ('pad2', '<u4'),
+])
+
+# simulation_metadata.json fields that do not identify a run: two runs of
+# a simulation with the same model, parameters, seed and area plan have the
+# same cells (see CorpusWriter.replaced_cells())
+RUN_METADATA_IGNORED = ("simulation_number", "timestamp", "description", "asymmetry_percentages")
+
+# File name and element dtype of every table of the store
+TABLES = {
+    "hops": ("hops.bin", HOP_DTYPE),
+    "records": ("records.bin", RECORD_DTYPE),
+    "cells": ("cells.bin", CELL_DTYPE),
+    "paths": ("paths.bin", PATH_DTYPE),
+    "path_hops": ("path_hops.bin", np.dtype('<u4')),
+    "router_paths": ("router_paths.bin", PATH_DTYPE),
+    "router_path_hops": ("router_path_hops.bin", np.dtype('<u2')),
+    "slots": ("slots.bin", np.dtype('<i4')),
+}
+
+
+def _ip_to_int(address):
+    if not address:
+        return 0
+    a, b, c, d = (int(x) for x in address.split('.'))
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def _load_meta(store_dir):
+    meta_file = os.path.join(store_dir, "meta.json")
+    if not os.path.exists(meta_file):
+        return None
+    with open(meta_file, 'r') as f:
+        return json.load(f)
+
+
+def _save_meta(store_dir, meta):
+    """Atomically replace meta.json; the counts in it commit the appended data."""
+    tmp_file = os.path.join(store_dir, "meta.json.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(meta, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, os.path.join(store_dir, "meta.json"))
+
+
+def _run_identity(sim_metadata):
+    return {key: value for key, value in sim_metadata.items() if key not in RUN_METADATA_IGNORED}
+
+
+def _same_run(stored, new):
+    """True if two simulation metadata describe the same run (a seedless run never does)."""
+    if stored is None or new is None or new.get("seed") is None:
+        return False
+    return _run_identity(stored) == _run_identity(new)
+
+
+def _sim_metadata_of(filename):
+    """simulation_metadata.json next to a traceroute file (None if missing)."""
+    metadata_file = os.path.join(os.path.dirname(filename), "simulation_metadata.json")
+    if not os.path.exists(metadata_file):
+        return None
+    with open(metadata_file, 'r') as f:
+        return json.load(f)
+
+
+def _map_table(store_dir, name, count):
+    """Memory-map the first 'count' elements of a table (read-only)."""
+    filename, dtype = TABLES[name]
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(os.path.join(store_dir, filename), dtype=dtype, mode='r', shape=(count,))
+
+
+class CorpusWriter:
+    """
+    Append-only writer of the packed traceroute corpus.
+
+    Every distinct hop-address sequence and router-level path is interned
+    once; a traceroute stores only the two path ids plus its per-hop RTTs.
+    Data files are appended first and committed by rewriting meta.json,
+    so a crash during an append never corrupts what readers see. A replaced
+    cell stays in the data files; meta["replaced"] lists it so readers skip it.
+    """
+
+    def __init__(self, store_dir, hosts=None, index=None):
+        self.store_dir = store_dir
+        self.index = build_hop_index() if index is None else index
+        os.makedirs(store_dir, exist_ok=True)
+
+        meta = _load_meta(store_dir)
+        if meta is None:
+            meta = {
+                "format_version": FORMAT_VERSION,
+                "hosts": sorted(HOSTS if hosts is None else hosts),
+                "sims": [],
+                "counts": {name: 0 for name in TABLES},
+                "replaced": [],
+            }
+        if meta["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Corpus format {meta['format_version']} in {store_dir}, "
+                             f"rebuild it with corpus_store.py")
+        self.meta = meta
+        self.host_id = {h: i for i, h in enumerate(meta["hosts"])}
+        self.sim_id = {s: i for i, s in enumerate(meta["sims"])}
+
+        # Rebuild the path intern tables and the committed cells
+        self.interned = {}
+        for table, elements in (("paths", "path_hops"), ("router_paths", "router_path_hops")):
+            paths = _map_table(store_dir, table, meta["counts"][table])
+            values = _map_table(store_dir, elements, meta["counts"][elements])
+            self.interned[table] = {tuple(int(x) for x in values[p['offset']:p['offset'] + p['length']]): i
+                                    for i, p in enumerate(paths)}
+        cells = _map_table(store_dir, "cells", meta["counts"]["cells"])
+        replaced = set(meta.setdefault("replaced", []))
+        self.cell_ids = {(int(c['sim']), int(c['percentage'])): i
+                         for i, c in enumerate(cells) if i not in replaced}
+
+        # Drop anything appended after the last commit
+        for name, (filename, dtype) in TABLES.items():
+            path = os.path.join(store_dir, filename)
+            with open(path, 'ab') as f:
+                f.truncate(meta["counts"][name] * dtype.itemsize)
+
+    def _append(self, name, array):
+        filename, dtype = TABLES[name]
+        array = np.ascontiguousarray(array, dtype=dtype)
+        with open(os.path.join(self.store_dir, filename), 'ab') as f:
+            f.write(array.tobytes())
+        self.meta["counts"][name] += len(array)
+
+    def _intern(self, table, elements, key, pending):
+        """Id of 'key' in an intern table, queueing it in 'pending' if new."""
+        ids = self.interned[table]
+        if key not in ids:
+            new_paths, new_values = pending
+            offset = self.meta["counts"][elements] + sum(len(p) for p in new_values)
+            ids[key] = self.meta["counts"][table] + len(new_paths)
+            new_paths.append((offset, len(key), 0, 0))
+            new_values.append(key)
+        return ids[key]
+
+    def router_path(self, ips, dst):
+        """Router-level path of a hop-address sequence, up to the destination host."""
+        dst_ip = _ip_to_int(host_ip(dst))
+        routers = self.index.router_of(np.array(ips, dtype=np.uint32))
+        path = []
+        for ip, router in zip(ips, routers):
+            if ip == dst_ip or (ip and router < 0):
+                break
+            path.append(STAR_ROUTER if ip == 0 else int(router))
+        return tuple(path)
+
+    def has_cell(self, sim, percentage):
+        """True if (simulation name, percentage) is already stored."""
+        return sim in self.sim_id and (self.sim_id[sim], percentage) in self.cell_ids
+
+    def replaced_cells(self, sim, percentage, sim_metadata):
+        """
+        Stored cells a new cell of 'sim' replaces: the cell of the same
+        percentage, and every cell of the simulation if the metadata
+        describes another run under the same simulation name (e.g. a new
+        sweep into the same directory with another seed or parameters).
+        A re-run with identical model, parameters, seed and area plan only
+        replaces the cells it re-collects.
+        """
+        if sim not in self.sim_id:
+            return []
+        sim_id = self.sim_id[sim]
+        if sim_metadata is not None and not _same_run(self.meta.get("sim_metadata", {}).get(sim), sim_metadata):
+            return sorted(i for (s, _), i in self.cell_ids.items() if s == sim_id)
+        return [self.cell_ids[(sim_id, percentage)]] if (sim_id, percentage) in self.cell_ids else []
+
+    def append_cell(self, sim, percentage, traceroutes, sim_metadata=None, replace=False):
+        """
+        Append one cell.
+
+        Args:
+            sim: Simulation name (e.g. "sim3" or "random/sim3")
+            percentage: Asymmetry percentage of the cell
+            traceroutes: (src, dst) -> hop dictionaries (traceroute_parser format)
+            sim_metadata: simulation_metadata.json content of the simulation
+            replace: Replace the stored cells of an earlier run (see
+                     replaced_cells()) instead of refusing a stored cell
+
+        Returns:
+            int: Cell id
+
+        Raises:
+            ValueError: If the cell is already stored and replace is False
+        """
+        replaced = self.replaced_cells(sim, percentage, sim_metadata) if replace else []
+        if self.has_cell(sim, percentage) and not replace:
+            raise ValueError(f"Cell {sim} {percentage}% already stored")
+        if sim not in self.sim_id:
+            self.sim_id[sim] = len(self.meta["sims"])
+            self.meta["sims"].append(sim)
+        sim_id = self.sim_id[sim]
+
+        num_hosts = len(self.meta["hosts"])
+        cell_id = self.meta["counts"]["cells"]
+        first_record = self.meta["counts"]["records"]
+        hop_offset = self.meta["counts"]["hops"]
+
+        hops = []
+        records = []
+        pending = {"paths": ([], []), "router_paths": ([], [])}
+        slots = np.full(num_hosts * num_hosts, -1, dtype=np.int32)
+
+        for (src, dst), trace in sorted(traceroutes.items()):
+            ips = [_ip_to_int(h["ip"]) for h in trace]
+            path = self._intern("paths", "path_hops", tuple(ips), pending["paths"])
+            router_path = self._intern("router_paths", "router_path_hops",
+                                       self.router_path(ips, dst), pending["router_paths"])
+            reached = bool(trace) and trace[-1]["ip"] == host_ip(dst)
+
+            slots[self.host_id[src] * num_hosts + self.host_id[dst]] = first_record + len(records)
+            records.append((cell_id, self.host_id[src], self.host_id[dst], path, router_path,
+                            len(trace), reached, 0, 0, hop_offset + len(hops)))
+            for h in trace:
+                rtt = sum(h["rtts"]) / len(h["rtts"]) if h["rtts"] else np.nan
+                hops.append((rtt, h["ttl"], len(h["rtts"]), h["lost"], 0))
+
+        self._append("hops", np.array(hops, dtype=HOP_DTYPE))
+        for table, elements in (("paths", "path_hops"), ("router_paths", "router_path_hops")):
+            new_paths, new_values = pending[table]
+            self._append(elements, np.array([v for p in new_values for v in p], dtype=TABLES[elements][1]))
+            self._append(table, np.array(new_paths, dtype=PATH_DTYPE))
+        self._append("records", np.array(records, dtype=RECORD_DTYPE))
+        self._append("slots", slots)
+        self._append("cells", np.array([(sim_id, percentage, 0, first_record, len(records), 0)],
+                                       dtype=CELL_DTYPE))
+
+        if sim_metadata is not None:
+            self.meta.setdefault("sim_metadata", {})[sim] = sim_metadata
+        self.meta["replaced"].extend(replaced)
+
+        _save_meta(self.store_dir, self.meta)
+        for key in [key for key, i in self.cell_ids.items() if i in replaced]:
+            del self.cell_ids[key]
+        self.cell_ids[(sim_id, percentage)] = cell_id
+        return cell_id
+
+    def append_traceroute_file(self, sim, percentage, filename, replace=False):
+        """
+        Parse a traceroutes_asymmetry_Xpercent.txt file and append it as a cell,
+        together with the simulation_metadata.json found next to it.
+        """
+        return self.append_cell(sim, percentage, parse_traceroute_file(filename),
+                                _sim_metadata_of(filename), replace)
+
+
+class CorpusStore:
+    """
+    Read-only, memory-mapped view of a packed traceroute corpus.
+    Every accessor returns NumPy views into the mapped files; no text is parsed.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.meta = _load_meta(store_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"No corpus store in {store_dir}")
+        if self.meta["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus format {self.meta['format_version']}")
+
+        counts = self.meta["counts"]
+        for name in TABLES:
+            setattr(self, name, _map_table(store_dir, name, counts[name]))
+
+        self.hosts = self.meta["hosts"]
+        self.sims = self.meta["sims"]
+        self.sim_metadata = self.meta.get("sim_metadata", {})
+        self.host_id = {h: i for i, h in enumerate(self.hosts)}
+        self.sim_id = {s: i for i, s in enumerate(self.sims)}
+        self.num_hosts = len(self.hosts)
+        self.slots = self.slots.reshape(-1, self.num_hosts * self.num_hosts)
+
+        # Cells replaced by a later run stay in the tables but are not live
+        self.live = np.ones(len(self.cells), dtype=bool)
+        self.live[self.meta.get("replaced", [])] = False
+        self.live_cells = np.nonzero(self.live)[0]
+        self.cell_id = {(int(self.cells[i]['sim']), int(self.cells[i]['percentage'])): int(i)
+                        for i in self.live_cells}
+
+    def find_cell(self, sim, percentage):
+        """Cell id of (simulation name, percentage)."""
+        return self.cell_id[(self.sim_id[sim], percentage)]
+
+    def record_index(self, sim, percentage, src, dst):
+        """Record position of a traceroute, -1 if the pair was not traced. O(1)."""
+        cell = self.find_cell(sim, percentage)
+        return int(self.slots[cell, self.host_id[src] * self.num_hosts + self.host_id[dst]])
+
+    def hops_of(self, record):
+        """Per-hop measurements (HOP_DTYPE view) of a record position."""
+        r = self.records[record]
+        return self.hops[r['hop_offset']:r['hop_offset'] + r['num_hops']]
+
+    def get(self, sim, percentage, src, dst):
+        """
+        Traceroute of a pair in a run.
+
+        Returns:
+            tuple: (record, hop addresses, hop measurements) as NumPy views,
+                   or None if the pair was not traced
+        """
+        record = self.record_index(sim, percentage, src, dst)
+        if record < 0:
+            return None
+        r = self.records[record]
+        return r, self.path(r['path']), self.hops_of(record)
+
+    def path(self, path_id):
+        """Hop addresses (uint32 view) of an interned path."""
+        p = self.paths[path_id]
+        return self.path_hops[p['offset']:p['offset'] + p['length']]
+
+    def router_path(self, router_path_id):
+        """Router node ids (uint16 view, STAR_ROUTER for '*') of an interned router path."""
+        p = self.router_paths[router_path_id]
+        return self.router_path_hops[p['offset']:p['offset'] + p['length']]
+
+    def path_id_matrix(self, field='router_path'):
+        """
+        [cells, hosts * hosts] matrix of path ids per pair slot (-1 if not traced).
+        Comparing runs is an integer comparison of two rows.
+        """
+        ids = np.full(self.slots.shape, -1, dtype=np.int64)
+        traced = self.slots >= 0
+        ids[traced] = self.records[field][self.slots[traced]]
+        return ids
+
+    def changed_pairs(self, cell_a, cell_b, field='router_path'):
+        """(src, dst) pairs whose interned path differs between two cells."""
+        a = self.records[field][self.slots[cell_a]].astype(np.int64)
+        b = self.records[field][self.slots[cell_b]].astype(np.int64)
+        a[self.slots[cell_a] < 0] = -1
+        b[self.slots[cell_b] < 0] = -1
+        return [(self.hosts[s // self.num_hosts], self.hosts[s % self.num_hosts])
+                for s in np.nonzero(a != b)[0]]
+
+    def cell_records(self, cell):
+        """Records (RECORD_DTYPE view) of a cell."""
+        c = self.cells[cell]
+        return self.records[c['first_record']:c['first_record'] + c['num_records']]
+
+
+def corpus_store_dir(sim_dir):
+    """Store shared by all simulations of a sweep: <base_dir>/corpus."""
+    return os.path.join(os.path.dirname(os.path.normpath(sim_dir)), "corpus")
+
+
+def append_collected_cell(sim_dir, percentage, filename, writer=None):
+    """
+    Append a freshly collected traceroute file to the sweep's corpus store.
+    It replaces the cells stored by an earlier sweep into the same directory
+    under the same simulation name (see CorpusWriter.replaced_cells()).
+
+    Args:
+        sim_dir: Simulation directory
+        percentage: Asymmetry percentage of the cell
+        filename: Traceroute file of the cell
+        writer: CorpusWriter of the sweep's store, kept open across cells so
+                the intern tables are loaded once (default: a new one)
+
+    Returns:
+        tuple: (cell id, sorted percentages of the simulation's replaced cells)
+    """
+    writer = writer or CorpusWriter(corpus_store_dir(sim_dir))
+    sim = os.path.basename(os.path.normpath(sim_dir))
+    sim_metadata = _sim_metadata_of(filename)
+
+    stored = {i: p for (_, p), i in writer.cell_ids.items()}
+    replaced = sorted(stored[i] for i in writer.replaced_cells(sim, percentage, sim_metadata))
+    cell_id = writer.append_cell(sim, percentage, parse_traceroute_file(filename), sim_metadata, replace=True)
+    return cell_id, replaced
+
+
+def build_store_from_tree(base_dir, store_dir):
+    """
+    Convert every cell of a simulations/ tree into a packed store,
+    skipping cells that are already stored.
+
+    Returns:
+        int: Number of cells appended
+    """
+    writer = CorpusWriter(store_dir)
+    appended = 0
+
+    for cell in discover_cells(base_dir):
+        if writer.has_cell(cell["sim"], cell["percentage"]):
+            continue
+        writer.append_traceroute_file(cell["sim"], cell["percentage"], cell["filename"])
+        appended += 1
+
+    return appended
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Pack a simulations tree into a memory-mapped traceroute corpus',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('base_dir', type=str, help='Simulations directory to convert')
+    parser.add_argument('--store-dir', type=str, help='Corpus store directory (default: BASE_DIR/corpus)')
+    args = parser.parse_args()
+
+    store_dir = args.store_dir or os.path.join(args.base_dir, "corpus")
+    appended = build_store_from_tree(args.base_dir, store_dir)
+    store = CorpusStore(store_dir)
+    print(f"Appended {appended} cells; store has {len(store.live_cells)} live cells, "
+          f"{len(store.records)} traceroutes, {len(store.paths)} distinct hop paths, "
+          f"{len(store.router_paths)} distinct router paths")
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""
+Vectorized batch engine for the asymmetry cost models.
+
+Produces directed link cost arrays (entry 2*l is rA->rB of router link l,
+2*l+1 is rB->rA, as cost_models.cost_vector()) for whole batches of seeds
+and percentages at once from a NumPy Generator. Tables of a batch are
+identified by (batch seed, row); they follow the same models as
+cost_models.py but not its legacy random sequence, which stays the
+reference for emulated runs.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from cost_models import cost_vector, directional_link_masks
+from topology_spec import ROUTER_LINKS, baseline_ospf_costs
+
+
+COST_DTYPE = np.uint16  # OSPF interface costs are 1..65535
+
+
+def _selection_mask(rng, num_seeds, num_links, counts):
+    """
+    [seeds, percentages, links] mask selecting counts[p] random links per row.
+    One random ranking per seed is shared by all percentages, so the links
+    selected at a higher percentage include those of every lower one.
+    """
+    rank = np.argsort(rng.random((num_seeds, num_links)), axis=1).argsort(axis=1)
+    return rank[:, None, :] < np.asarray(counts)[None, :, None]
+
+
+def random_cost_batch(num_seeds, percentages, seed=0, min_cost=10, max_cost=100, router_links=None):
+    """
+    Random model ("random_different") for a batch of seeds and percentages.
+
+    int(links * percentage / 100) links per table get two different uniform
+    costs in [min_cost, max_cost] on their two interfaces; every other
+    interface keeps cost 1.
+
+    Args:
+        num_seeds: Number of tables per percentage
+        percentages: Asymmetry percentages
+        seed: Seed of the batch Generator
+        min_cost, max_cost: Cost range of the asymmetric links
+        router_links: Router-to-router link table (default: topology_spec.ROUTER_LINKS)
+
+    Returns:
+        ndarray: [seeds, percentages, directed links] costs (COST_DTYPE)
+    """
+    if max_cost <= min_cost:
+        raise ValueError("max_cost must be greater than min_cost to draw two different costs")
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    num_links = len(router_links)
+    rng = np.random.default_rng(seed)
+
+    counts = [int(num_links * p / 100) for p in percentages]
+    selected = _selection_mask(rng, num_seeds, num_links, counts)
+
+    # Second cost uniform over the range without the first one
+    cost_a = rng.integers(min_cost, max_cost + 1, size=(num_seeds, num_links), dtype=np.int32)
+    cost_b = rng.integers(min_cost, max_cost, size=(num_seeds, num_links), dtype=np.int32)
+    cost_b += cost_b >= cost_a
+
+    costs = np.ones((num_seeds, len(counts), num_links, 2), dtype=COST_DTYPE)
+    costs[..., 0] = np.where(selected, cost_a[:, None, :], 1)
+    costs[..., 1] = np.where(selected, cost_b[:, None, :], 1)
+    return costs.reshape(num_seeds, len(counts), 2 * num_links)
+
+
+def directional_cost_batch(num_seeds, percentages, seed=0, low_cost_range=(20, 40),
+                           high_cost_range=(100, 200), router_links=None, positions=None):
+    """
+    Directional model ("geographic_directional") for a batch of seeds and percentages.
+
+    max(1, int(links * percentage / 100)) links per table (none at 0%) get the
+    table's low cost in their favorable direction and its high cost in the
+    other; every other interface keeps cost 1.
+
+    Args:
+        num_seeds: Number of tables per percentage
+        percentages: Asymmetry percentages
+        seed: Seed of the batch Generator
+        low_cost_range, high_cost_range: Inclusive (min, max) ranges of the two costs
+        router_links: Router-to-router link table (default: topology_spec.ROUTER_LINKS)
+        positions: Router -> (x, y) grid position (default: cost_models.ROUTER_POSITIONS)
+
+    Returns:
+        ndarray: [seeds, percentages, directed links] costs (COST_DTYPE)
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    num_links = len(router_links)
+    rng = np.random.default_rng(seed)
+
+    counts = [max(1, int(num_links * p / 100)) if p > 0 else 0 for p in percentages]
+    selected = _selection_mask(rng, num_seeds, num_links, counts)
+
+    shape = (num_seeds, len(counts), 1)
+    low = rng.integers(low_cost_range[0], low_cost_range[1] + 1, size=shape, dtype=np.int32)
+    high = rng.integers(high_cost_range[0], high_cost_range[1] + 1, size=shape, dtype=np.int32)
+
+    a_to_b_high, b_to_a_high, directional = directional_link_masks(router_links, positions)
+    selected &= directional[None, None, :]
+
+    costs = np.ones((num_seeds, len(counts), num_links, 2), dtype=COST_DTYPE)
+    costs[..., 0] = np.where(selected, np.where(a_to_b_high, high, low), 1)
+    costs[..., 1] = np.where(selected, np.where(b_to_a_high, high, low), 1)
+    return costs.reshape(num_seeds, len(counts), 2 * num_links)
+
+
+def costs_to_dict(costs, router_links=None, host_router_links=None):
+    """
+    Convert one directed link cost array to the "router.interface" dict form
+    (host-facing interfaces keep cost 1).
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    ospf_costs = baseline_ospf_costs(router_links, host_router_links)
+    for l, (rA, rB, intfA, intfB, _, _) in enumerate(router_links):
+        ospf_costs[f"{rA}.{intfA}"] = int(costs[2 * l])
+        ospf_costs[f"{rB}.{intfB}"] = int(costs[2 * l + 1])
+    return ospf_costs
+
+
+def costs_from_dict(ospf_costs, router_links=None):
+    """Convert a "router.interface" cost dict to a directed link cost array."""
+    return np.array(cost_vector(ospf_costs, router_links), dtype=COST_DTYPE)
+
+
+MODELS = {
+    "random_different": random_cost_batch,
+    "geographic_directional": directional_cost_batch,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Generate a batch of cost tables and report the throughput',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--cost-model', choices=sorted(MODELS), default='random_different', help='Cost model')
+    parser.add_argument('--tables', type=int, default=1000000, help='Total number of tables (seeds x percentages)')
+    parser.add_argument('--asymmetry-percentages', type=int, nargs='+', default=[0, 20, 40, 60, 80, 100],
+                        help='Percentages of every seed')
+    parser.add_argument('--seed', type=int, default=0, help='Batch seed')
+    parser.add_argument('--output', type=str, help='Save the batch to this .npy file')
+    args = parser.parse_args()
+
+    seeds = -(-args.tables // len(args.asymmetry_percentages))
+    start = time.perf_counter()
+    batch = MODELS[args.cost_model](seeds, args.asymmetry_percentages, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{batch.shape[0] * batch.shape[1]} {args.cost_model} tables "
+          f"({batch.shape[2]} directed links) in {elapsed:.2f} s")
+
+    if args.output:
+        np.save(args.output, batch)
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+Cost model plugins of the asymmetry experiments.
+
+A cost model decides which router links become asymmetric at a given
+percentage and seed (select()), which OSPF costs their interfaces get
+(assign_costs()) and how it is recorded in simulation_metadata.json
+(describe_metadata()). topo_runner.py drives any registered model through
+this interface; the model's name is the "cost_model" metadata field, so
+cost_models.cost_table_for_cell() can rebuild its tables offline.
+
+A new model subclasses CostModel, declares its parameters and defaults in
+'defaults' and is registered with @register_cost_model. Its parameters
+must be JSON-serializable, since they are stored in the metadata, and its
+command-line options must be named after them (--min-cost -> min_cost).
+"""
+
+from cost_models import (select_random_links, random_link_costs,
+                         select_links_for_asymmetry, compute_directional_costs)
+from topology_spec import baseline_ospf_costs
+
+
+COST_MODELS = {}
+
+
+def register_cost_model(cls):
+    """Class decorator adding a cost model to COST_MODELS under its name."""
+    COST_MODELS[cls.name] = cls
+    return cls
+
+
+class CostModel:
+    """
+    Base class of the cost model plugins.
+
+    Class attributes:
+        name: "cost_model" metadata value (registry key)
+        simulation_type: "simulation_type" metadata value
+        description: Phrase used in the simulation description
+        defaults: Parameter name -> default value
+        convergence_wait: Maximum seconds to wait for OSPF convergence after a restart
+        traceroute_options, ping_options: Options of the per-pair probes
+        trace_delay: Seconds between two traceroutes
+    """
+
+    name = None
+    simulation_type = None
+    description = None
+    defaults = {}
+
+    convergence_wait = 70
+    traceroute_options = "-I -n -m 64"
+    ping_options = ""
+    trace_delay = 4
+
+    def __init__(self, **params):
+        self.params = {key: params.get(key, default) for key, default in self.defaults.items()}
+
+    @classmethod
+    def from_config(cls, config):
+        """Model with the parameters found in a simulation config or metadata dict."""
+        return cls(**{key: config[key] for key in cls.defaults if key in config})
+
+    @classmethod
+    def add_arguments(cls, parser):
+        """Add the model's command-line options to an argparse parser."""
+
+    @classmethod
+    def params_from_args(cls, args):
+        """Model parameters from parsed command-line options."""
+        return {key: getattr(args, key) for key in cls.defaults if hasattr(args, key)}
+
+    def select(self, percentage, seed):
+        """
+        Links made asymmetric in the cell (percentage, seed).
+
+        Returns:
+            list: Selected links, in the form assign_costs() expects
+        """
+        raise NotImplementedError
+
+    def assign_costs(self, selected, percentage, seed):
+        """
+        OSPF costs of the selected links. Called right after select() with
+        its output, so a model may continue the random sequence select() seeded.
+
+        Returns:
+            dict: "router.interface" -> cost overrides (other interfaces keep cost 1)
+        """
+        raise NotImplementedError
+
+    def describe_metadata(self):
+        """
+        Model fields of simulation_metadata.json: the parameters plus
+        "cost_model" and "simulation_type".
+        """
+        return dict(self.params, simulation_type=self.simulation_type, cost_model=self.name)
+
+    def cost_table(self, percentage, seed):
+        """
+        Complete cost table of a cell: cost 1 on every interface, overridden
+        by the costs assigned to the selected links.
+
+        Returns:
+            dict: Dictionary with "router.interface" keys and OSPF costs as values
+        """
+        ospf_costs = baseline_ospf_costs()
+        selected = self.select(percentage, seed)
+        if selected:
+            ospf_costs.update(self.assign_costs(selected, percentage, seed))
+        return ospf_costs
+
+
+@register_cost_model
+class RandomCostModel(CostModel):
+    """
+    Randomly selected links get DIFFERENT random costs on their two interfaces.
+    """
+
+    name = "random_different"
+    simulation_type = "random_asymmetry"
+    description = "random asymmetry"
+    defaults = {"min_cost": 10, "max_cost": 100}
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument('--min-cost', type=int, default=10,
+                          help='Minimum OSPF cost for asymmetric links (default: 10)')
+        parser.add_argument('--max-cost', type=int, default=100,
+                          help='Maximum OSPF cost for asymmetric links (default: 100)')
+
+    def select(self, percentage, seed):
+        return select_random_links(percentage, seed)
+
+    def assign_costs(self, selected, percentage, seed):
+        return random_link_costs(selected, self.params["min_cost"], self.params["max_cost"])
+
+
+@register_cost_model
+class DirectionalCostModel(CostModel):
+    """
+    Selected links get a low cost left-to-right and top-to-bottom in the
+    router grid and a high cost in the opposite direction.
+    """
+
+    name = "geographic_directional"
+    simulation_type = "directional_geographic_asymmetry"
+    description = "directional geographic asymmetry"
+    defaults = {"low_cost_range": [20, 40], "high_cost_range": [100, 200]}
+
+    convergence_wait = 75
+    traceroute_options = "-I -n -m 30 -w 3"
+    ping_options = "-W 2"
+    trace_delay = 1
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument('--low-cost-range', type=int, nargs=2, default=[20, 40],
+                          help='Range (min max) for low OSPF costs (default: 20 40)')
+        parser.add_argument('--high-cost-range', type=int, nargs=2, default=[100, 200],
+                          help='Range (min max) for high OSPF costs (default: 100 200)')
+
+    def select(self, percentage, seed):
+        if percentage == 0:
+            return []
+        return select_links_for_asymmetry(percentage, seed)
+
+    def assign_costs(self, selected, percentage, seed):
+        return compute_directional_costs(selected, self.params["low_cost_range"], self.params["high_cost_range"])
+
+    def describe_metadata(self):
+        metadata = super().describe_metadata()
+        metadata["cost_rules"] = {
+            "left_to_right": "low_cost",
+            "right_to_left": "high_cost",
+            "top_to_bottom": "low_cost",
+            "bottom_to_top": "high_cost"
+        }
+        return metadata
@@ -0,0 +1,219 @@
+#!/usr/bin/python3
+"""
+OSPF cost models of the asymmetry experiments.
+
+The functions reproduce exactly the tables applied by the random and
+directional cost model plugins (same Python random sequence for a given
+seed), without Mininet, so cost tables can be rebuilt offline from
+simulation_metadata.json.
+"""
+
+import random
+
+import numpy as np
+
+from topology_spec import ROUTER_LINKS, HOST_ROUTER_LINKS, baseline_ospf_costs
+
+
+# Actual router positions in topology (vertical pairs) used by the directional model
+ROUTER_POSITIONS = {
+    # Upper level: vertical pairs LEFT-CENTER-RIGHT
+    'r1': (0, 0), 'r2': (0, 1),  # left pair
+    'r3': (1, 0), 'r4': (1, 1),  # center pair
+    'r5': (2, 0), 'r6': (2, 1),  # right pair
+
+    # Middle level: vertical pairs LEFT-CENTER-RIGHT
+    'r7': (0, 2), 'r8': (0, 3),   # left pair
+    'r9': (1, 2), 'r10': (1, 3),  # center pair
+    'r11': (2, 2), 'r12': (2, 3), # right pair
+
+    # Lower level: vertical pairs LEFT-CENTER-RIGHT
+    'r13': (0, 4), 'r14': (0, 5), # left pair
+    'r15': (1, 4), 'r16': (1, 5), # center pair
+    'r17': (2, 4), 'r18': (2, 5)  # right pair
+}
+
+
+def select_random_links(percentage, seed):
+    """
+    Seed the global random state and select the links of the random model:
+    int(links * percentage / 100) indices into ROUTER_LINKS.
+    """
+    random.seed(seed)
+    num_links = len(ROUTER_LINKS)
+    num_asymmetric_links = int(num_links * percentage / 100)
+    return random.sample(range(num_links), num_asymmetric_links)
+
+
+def random_link_costs(links_to_modify, min_cost=10, max_cost=100):
+    """
+    Draw two DIFFERENT random costs for both interfaces of each selected link.
+    Draws from the global random state, so it must be called right after
+    select_random_links() to reproduce the same table.
+
+    Returns:
+        dict: "router.interface" -> cost overrides of the selected links
+    """
+    link_costs = {}
+    for link_idx in links_to_modify:
+        rA, rB, intfA, intfB, _, _ = ROUTER_LINKS[link_idx]
+        
+        # Generate two DIFFERENT randomized costs for both interfaces
+        cost_A = random.randint(min_cost, max_cost)
+        
+        # Ensure cost_B is different from cost_A
+        cost_B = random.randint(min_cost, max_cost)
+        while cost_B == cost_A:
+            cost_B = random.randint(min_cost, max_cost)
+        
+        link_costs[f"{rA}.{intfA}"] = cost_A
+        link_costs[f"{rB}.{intfB}"] = cost_B
+    
+    return link_costs
+
+
+def generate_random_ospf_costs(percentage=30, seed=42, min_cost=10, max_cost=100):
+    """
+    Generate random OSPF costs for router links with specified asymmetry percentage.
+    Selected links will have DIFFERENT costs on both interfaces.
+    ALL other interfaces of ALL routers will have cost = 1.
+    
+    Returns:
+        dict: Dictionary with "router.interface" keys and corresponding OSPF costs as values
+    """
+    links_to_modify = select_random_links(percentage, seed)
+    
+    # Overwrite default costs = 1 with asymmetric ones
+    ospf_costs = baseline_ospf_costs(ROUTER_LINKS, HOST_ROUTER_LINKS)
+    ospf_costs.update(random_link_costs(links_to_modify, min_cost, max_cost))
+    return ospf_costs
+
+
+def select_links_for_asymmetry(percentage, seed):
+    """
+    Select links for asymmetry based on percentage and seed
+    """
+    # Complete list of links (26 total links)
+    all_links = [(rA, rB, intfA, intfB) for rA, rB, intfA, intfB, _, _ in ROUTER_LINKS]
+    
+    # Calculate number of links to modify
+    num_links_to_modify = max(1, int(len(all_links) * percentage / 100))
+    
+    # Randomly select with seed
+    random.seed(seed)
+    selected_links = random.sample(all_links, num_links_to_modify)
+    
+    return selected_links
+
+
+def directional_link_masks(router_links=None, positions=None):
+    """
+    Per router link, whether its rA->rB and rB->rA directions take the high
+    cost in the directional model (moving right-to-left or bottom-to-top,
+    the higher cost winning on diagonals), and whether it can be made
+    directional at all (both routers placed, not at the same position).
+
+    Returns:
+        tuple: (a_to_b_high, b_to_a_high, directional) boolean arrays [links]
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    positions = ROUTER_POSITIONS if positions is None else positions
+
+    placed = np.array([link[0] in positions and link[1] in positions for link in router_links], dtype=bool)
+    delta = np.array([np.subtract(positions[link[1]], positions[link[0]]) if ok else (0, 0)
+                      for ok, link in zip(placed, router_links)]).reshape(-1, 2)
+    dx, dy = delta[:, 0], delta[:, 1]
+
+    return (dx < 0) | (dy < 0), (dx > 0) | (dy > 0), placed & ((dx != 0) | (dy != 0))
+
+
+def compute_directional_costs(selected_links, low_cost_range, high_cost_range):
+    """
+    Compute directional costs of the selected links from router positions.
+    Draws low/high cost from the global random state, so it must be called
+    right after select_links_for_asymmetry() to reproduce the same table.
+    """
+    # Extract low and high values from ranges
+    low_cost = low_cost_range[0] if len(set(low_cost_range)) == 1 else random.randint(low_cost_range[0], low_cost_range[1])
+    high_cost = high_cost_range[0] if len(set(high_cost_range)) == 1 else random.randint(high_cost_range[0], high_cost_range[1])
+    
+    # LEFT->RIGHT and TOP->BOTTOM get the low cost, the opposite directions
+    # the high cost; diagonal links use the higher (more restrictive) one
+    a_to_b_high, b_to_a_high, directional = directional_link_masks(selected_links)
+    
+    directional_costs = {}
+    for (rA, rB, intfA, intfB), high_a, high_b, ok in zip(selected_links, a_to_b_high, b_to_a_high, directional):
+        if ok:
+            directional_costs[f"{rA}.{intfA}"] = high_cost if high_a else low_cost
+            directional_costs[f"{rB}.{intfB}"] = high_cost if high_b else low_cost
+    
+    return directional_costs
+
+
+def directional_ospf_costs(percentage, seed, low_cost_range, high_cost_range):
+    """
+    Complete cost table of a directional cell, as applied by
+    DirectionalCostModel (cost_model_plugins.py): baseline cost 1 everywhere,
+    overridden by the directional costs of the selected links.
+
+    Returns:
+        dict: Dictionary with "router.interface" keys and OSPF costs as values
+    """
+    ospf_costs = baseline_ospf_costs()
+    if percentage == 0:
+        return ospf_costs
+
+    selected_links = select_links_for_asymmetry(percentage, seed)
+    ospf_costs.update(compute_directional_costs(selected_links, low_cost_range, high_cost_range))
+    return ospf_costs
+
+
+def uniform_random_costs(router_links, percentage=100, seed=42, min_cost=10, max_cost=100):
+    """
+    Random-model cost table for an arbitrary link table (e.g. a generated
+    topology): the selected share of links gets independent random costs
+    on both interfaces, every other interface keeps cost 1.
+    Uses its own random.Random, so the legacy global sequence is untouched.
+    """
+    rng = random.Random(seed)
+    ospf_costs = {}
+    for rA, rB, intfA, intfB, _, _ in router_links:
+        ospf_costs[f"{rA}.{intfA}"] = 1
+        ospf_costs[f"{rB}.{intfB}"] = 1
+
+    num_selected = int(len(router_links) * percentage / 100)
+    for rA, rB, intfA, intfB, _, _ in rng.sample(list(router_links), num_selected):
+        ospf_costs[f"{rA}.{intfA}"] = rng.randint(min_cost, max_cost)
+        ospf_costs[f"{rB}.{intfB}"] = rng.randint(min_cost, max_cost)
+
+    return ospf_costs
+
+
+def cost_table_for_cell(metadata, percentage):
+    """
+    Rebuild the cost table of a cell from its simulation_metadata.json content,
+    through the cost model plugin named by its "cost_model" field.
+
+    Returns:
+        dict: "router.interface" -> OSPF cost, or None for an unknown cost model
+    """
+    # Plugins build on the generators of this module
+    from cost_model_plugins import COST_MODELS
+
+    model = COST_MODELS.get(metadata.get("cost_model"))
+    if model is None:
+        return None
+    return model.from_config(metadata).cost_table(percentage, metadata.get("seed"))
+
+
+def cost_vector(ospf_costs, router_links=None):
+    """
+    Directed link costs of a cost table: entry 2*l is the cost of rA->rB
+    of router link l (rA's interface), entry 2*l+1 the cost of rB->rA.
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    costs = []
+    for rA, rB, intfA, intfB, _, _ in router_links:
+        costs.append(ospf_costs.get(f"{rA}.{intfA}", 1))
+        costs.append(ospf_costs.get(f"{rB}.{intfB}", 1))
+    return costs
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Client of the emulation daemon (emulation_daemon.py).
+
+Mininet-free, so experiment scripts and notebooks can drive the warm
+network without root privileges beyond access to the socket.
+"""
+
+import argparse
+import json
+import socket
+
+
+DEFAULT_SOCKET = "/tmp/sdwan_emulation.sock"
+
+
+class EmulationClient:
+    """
+    One connection to the daemon; calls are answered in order.
+
+    Usage:
+        with EmulationClient() as client:
+            client.apply_costs(cost_model="random_different", percentage=40, seed=123)
+            outputs = client.trace([("h11", "h36")])
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self.reader = self.sock.makefile('r', encoding='utf-8')
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def call(self, method, **params):
+        """
+        Send one request and wait for its response.
+
+        Returns:
+            The method's result
+
+        Raises:
+            RuntimeError: If the daemon reports an error
+        """
+        self.sock.sendall((json.dumps({"method": method, "params": params}) + "\n").encode())
+        line = self.reader.readline()
+        if not line:
+            raise RuntimeError("connection closed by the daemon")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error"))
+        return response["result"]
+
+    def status(self):
+        return self.call("status")
+
+    def apply_costs(self, ospf_costs=None, cost_model=None, percentage=0, seed=None, params=None,
+                    wait=True, timeout=None):
+        return self.call("apply_costs", ospf_costs=ospf_costs, cost_model=cost_model, percentage=percentage,
+                         seed=seed, params=params, wait=wait, timeout=timeout)
+
+    def wait_convergence(self, timeout=None):
+        return self.call("wait_convergence", timeout=timeout)
+
+    def trace(self, pairs=None, cost_model=None, prober="traceroute", flows=0):
+        return self.call("trace", pairs=[list(p) for p in pairs] if pairs is not None else None,
+                         cost_model=cost_model, prober=prober, flows=flows)
+
+    def dump_fib(self, routers=None):
+        return self.call("dump_fib", routers=routers)
+
+    def reset(self, wait=True, timeout=None):
+        return self.call("reset", wait=wait, timeout=timeout)
+
+    def shutdown(self):
+        return self.call("shutdown")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Send one call to the emulation daemon and print the result as JSON',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('method', choices=['status', 'apply', 'wait', 'trace', 'fib', 'reset', 'shutdown'],
+                        help='API call')
+    parser.add_argument('--socket', type=str, default=DEFAULT_SOCKET, help='Unix socket path')
+    parser.add_argument('--metadata', type=str,
+                        help='apply: simulation_metadata.json whose cost model, seed and parameters to apply')
+    parser.add_argument('--percentage', type=int, default=0, help='apply: asymmetry percentage of the cell')
+    parser.add_argument('--pairs', type=str, nargs='+', metavar='SRC:DST', help='trace: host pairs (default: all)')
+    parser.add_argument('--prober', choices=['traceroute', 'icmp'], default='traceroute',
+                        help='trace: one traceroute per pair, or one ICMP prober per source host')
+    parser.add_argument('--flows', type=int, default=0,
+                        help='trace: Paris-style flows per pair, returning the observed path sets')
+    parser.add_argument('--routers', type=str, nargs='+', help='fib: routers (default: all)')
+    args = parser.parse_args()
+
+    with EmulationClient(args.socket) as client:
+        if args.method == 'apply':
+            metadata = {}
+            if args.metadata:
+                with open(args.metadata, 'r') as f:
+                    metadata = json.load(f)
+            result = client.apply_costs(cost_model=metadata.get("cost_model"), percentage=args.percentage,
+                                        seed=metadata.get("seed"), params=metadata)
+        elif args.method == 'trace':
+            result = client.trace([p.split(':') for p in args.pairs] if args.pairs else None,
+                                  prober=args.prober, flows=args.flows)
+        elif args.method == 'fib':
+            result = client.dump_fib(args.routers)
+        else:
+            result = {"status": client.status, "wait": client.wait_convergence, "reset": client.reset,
+                      "shutdown": client.shutdown}[args.method]()
+
+    print(json.dumps(result, indent=2))
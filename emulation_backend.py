@@ -0,0 +1,382 @@
+#!/usr/bin/python3
+"""
+Record/replay emulation backends for the orchestration in topo_runner.py.
+
+RecordBackend wraps the real Mininet backend and appends every node command,
+with its output and duration, to a JSON-lines recording. ReplayBackend is a
+root-free stand-in network answering the same commands instantly: from a
+recording when it holds the command, otherwise from the SPF predictor using
+the OSPF costs of the FRR configurations the orchestration deployed. Waits
+only advance a virtual clock, so a whole sweep runs in milliseconds while
+clock() still reports the emulated wall time.
+
+Select a backend with topo_runner.set_backend() or the runner's --backend option.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from ospf_areas import expected_ospf_routes
+from path_predictor import predict_router_paths, host_address_map
+from topology_spec import HOSTS, HOST_ROUTER_LINKS, ROUTER_LINKS, ROUTERS, host_ip, baseline_ospf_costs
+
+
+def load_recording(filename):
+    """
+    Load a recording written by RecordBackend.
+
+    Returns:
+        dict: (node, command) -> list of (output, seconds) in recording order
+              (node is None for host shell commands, whose output is the success flag)
+    """
+    responses = {}
+    with open(filename, 'r') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                responses.setdefault((entry["node"], entry["cmd"]), []).append((entry["output"], entry["seconds"]))
+    return responses
+
+
+class RecordingNode:
+    """Node proxy recording the output and duration of every cmd() call."""
+
+    def __init__(self, node, backend):
+        self.node = node
+        self.backend = backend
+
+    def cmd(self, command, *args, **kwargs):
+        start = time.perf_counter()
+        output = self.node.cmd(command, *args, **kwargs)
+        self.backend.record(self.node.name, command, output, time.perf_counter() - start)
+        return output
+
+    def __getattr__(self, name):
+        return getattr(self.node, name)
+
+
+class RecordingNetwork:
+    """Network proxy handing out RecordingNode wrappers."""
+
+    def __init__(self, net, backend):
+        self.net = net
+        self.backend = backend
+        self.nodes = {}
+
+    def __getitem__(self, name):
+        if name not in self.nodes:
+            self.nodes[name] = RecordingNode(self.net[name], self.backend)
+        return self.nodes[name]
+
+    def keys(self):
+        return self.net.keys()
+
+    def __getattr__(self, name):
+        return getattr(self.net, name)
+
+
+class RecordBackend:
+    """
+    Backend recording every node and host shell command of another backend
+    (normally topo_runner.MininetBackend) to a JSON-lines file.
+    """
+
+    interactive = False
+
+    def __init__(self, backend, filename):
+        self.backend = backend
+        self.file = open(filename, 'a')
+        # Nodes may be driven from several threads (concurrent probing)
+        self.lock = threading.Lock()
+
+    def record(self, node, command, output, seconds):
+        with self.lock:
+            self.file.write(json.dumps({"node": node, "cmd": command, "output": output, "seconds": seconds}) + "\n")
+            self.file.flush()
+
+    def start_network(self):
+        return RecordingNetwork(self.backend.start_network(), self)
+
+    def stop_network(self, net):
+        self.backend.stop_network(net.net)
+
+    def sleep(self, seconds):
+        self.backend.sleep(seconds)
+
+    def clock(self):
+        return self.backend.clock()
+
+    def shell(self, cmd, timeout=120):
+        start = time.perf_counter()
+        ok = self.backend.shell(cmd, timeout)
+        self.record(None, cmd, ok, time.perf_counter() - start)
+        return ok
+
+    def close(self):
+        self.file.close()
+
+
+def read_frr_costs(config_dir, router_name):
+    """
+    Interface costs of one router's generated frr.conf.
+
+    Returns:
+        dict: "router.interface" -> OSPF cost
+    """
+    costs = {}
+    interface = None
+    with open(os.path.join(config_dir, router_name, "frr.conf"), 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("interface "):
+                interface = line.split()[1]
+            elif line == "!":
+                interface = None
+            elif interface and line.startswith("ip ospf cost "):
+                costs[f"{router_name}.{interface}"] = int(line.split()[3])
+    return costs
+
+
+def read_frr_areas(config_dir, router_name):
+    """
+    OSPF areas of one router's generated frr.conf (multi-area configurations only).
+
+    Returns:
+        tuple: ("router.interface" -> area, stub area type or None)
+    """
+    areas = {}
+    stub = None
+    interface = None
+    with open(os.path.join(config_dir, router_name, "frr.conf"), 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("interface "):
+                interface = line.split()[1]
+            elif line == "!":
+                interface = None
+            elif interface and line.startswith("ip ospf area "):
+                areas[f"{router_name}.{interface}"] = int(line.split()[3])
+            elif line.startswith("area ") and " stub" in line:
+                stub = "totally-stubby" if line.endswith("no-summary") else stub or "stub"
+    return areas, stub
+
+
+class ReplayNode:
+    """Stand-in node answering commands through its ReplayNetwork."""
+
+    def __init__(self, name, network):
+        self.name = name
+        self.network = network
+
+    def cmd(self, command, *args, **kwargs):
+        return self.network.answer(self.name, command)
+
+    def IP(self):
+        if self.name in HOSTS:
+            return host_ip(self.name)
+        return next(ip.split('/')[0] for _, rname, _, ip in HOST_ROUTER_LINKS if rname == self.name)
+
+    def setIP(self, *args, **kwargs):
+        pass
+
+
+class ReplayNetwork:
+    """
+    Root-free stand-in for the Mininet network (see ReplayBackend).
+    The cost table follows the frr.conf files of routers (re)started with frrinit.sh,
+    and the link state and cost changes applied by failure scenarios.
+    """
+
+    FRR_START = re.compile(r'frrinit\.sh start (\S+)')
+    LINK_STATE = re.compile(r'^ip link set dev (\S+) (up|down)$')
+    COST_CHANGE = re.compile(r"-c 'interface (\S+)' -c 'ip ospf cost (\d+)'")
+    IPV4 = re.compile(r'^\d+\.\d+\.\d+\.\d+$')
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.ospf_costs = baseline_ospf_costs()
+        self.interface_areas = {}
+        self.stub_areas = {}
+        self.down_interfaces = set()
+        self.nodes = {name: ReplayNode(name, self) for name in ROUTERS + sorted(HOSTS)}
+
+    def __getitem__(self, name):
+        return self.nodes[name]
+
+    def keys(self):
+        return list(self.nodes)
+
+    def stop(self):
+        pass
+
+    def answer(self, node, command):
+        """Output of a node command: recorded if available, else predicted."""
+        started = self.FRR_START.search(command)
+        if started and os.path.exists(os.path.join(self.backend.config_dir, started.group(1), "frr.conf")):
+            self.ospf_costs.update(read_frr_costs(self.backend.config_dir, started.group(1)))
+            areas, stub = read_frr_areas(self.backend.config_dir, started.group(1))
+            self.interface_areas.update(areas)
+            self.stub_areas[started.group(1)] = stub
+        link_state = self.LINK_STATE.match(command)
+        if link_state:
+            if link_state.group(2) == "down":
+                self.down_interfaces.add(f"{node}.{link_state.group(1)}")
+            else:
+                self.down_interfaces.discard(f"{node}.{link_state.group(1)}")
+        cost_change = self.COST_CHANGE.search(command)
+        if cost_change:
+            self.ospf_costs[f"{node}.{cost_change.group(1)}"] = int(cost_change.group(2))
+
+        recorded = self.backend.replay(node, command)
+        if recorded is not None:
+            return recorded
+        return self.predict(node, command) if self.backend.predict else ""
+
+    def areas(self):
+        """Area plan of the deployed configurations (None for a single area)."""
+        if not any(self.interface_areas.values()):
+            return None
+        stub = "totally-stubby" if "totally-stubby" in self.stub_areas.values() else \
+            "stub" if "stub" in self.stub_areas.values() else None
+        return {"mode": "replay", "stub": stub, "interface_areas": self.interface_areas}
+
+    def predict(self, node, command):
+        """Synthesize the output of the commands the orchestration relies on."""
+        if command.endswith("& echo $!"):
+            # Background jobs (failure scenario monitors and pings) are not emulated
+            return ""
+        if command.startswith("traceroute"):
+            return self.predicted_traceroute(node, host_address_map().get(command.split()[-1]))
+        if "icmp_prober.py" in command:
+            return self.predicted_probe(node, command)
+        if command.startswith("ping"):
+            return "1 packets transmitted, 1 received, 0% packet loss"
+        if command.startswith("ip -4 route show proto ospf"):
+            areas = self.areas()
+            if areas is not None:
+                return "\n".join(f"{prefix} proto ospf metric 20"
+                                 for prefix in sorted(expected_ospf_routes(areas).get(node, ())))
+            own = {ip.rsplit('.', 1)[0] for _, rname, _, ip in HOST_ROUTER_LINKS if rname == node}
+            return "\n".join(f"{prefix}.0/24 proto ospf metric 20"
+                             for prefix in sorted({ip.rsplit('.', 1)[0] for _, _, _, ip in HOST_ROUTER_LINKS} - own))
+        return ""
+
+    def up_links(self):
+        """Router links with both interfaces up."""
+        return [link for link in ROUTER_LINKS
+                if f"{link[0]}.{link[2]}" not in self.down_interfaces
+                and f"{link[1]}.{link[3]}" not in self.down_interfaces]
+
+    def predicted_hops(self, src, dst):
+        """Hop addresses (ingress addresses) of every equal-cost path, [] if none."""
+        if dst is None or src not in HOSTS:
+            return []
+        paths = predict_router_paths(self.ospf_costs, pairs=[(src, dst)], router_links=self.up_links(),
+                                     areas=self.areas())[(src, dst)]
+
+        ingress = {}
+        for rA, rB, _, _, ipA, ipB in ROUTER_LINKS:
+            ingress[(rA, rB)] = ipB.split('/')[0]
+            ingress[(rB, rA)] = ipA.split('/')[0]
+        gateway = HOSTS[src][1]
+
+        return [[gateway] + [ingress[(u, v)] for u, v in zip(path[:-1], path[1:])] + [host_ip(dst)]
+                for path in paths]
+
+    def predicted_traceroute(self, src, dst):
+        """traceroute -n output along the first shortest path."""
+        paths = self.predicted_hops(src, dst)
+        if not paths:
+            return ""
+        lines = [f"traceroute to {host_ip(dst)} ({host_ip(dst)}), 64 hops max, 60 byte packets"]
+        for ttl, ip in enumerate(paths[0], 1):
+            rtt = 0.05 * ttl
+            lines.append(f"{ttl:2d}  {ip}  {rtt:.3f} ms  {rtt:.3f} ms  {rtt:.3f} ms")
+        return "\n".join(lines)
+
+    @staticmethod
+    def predicted_hop_records(hops, queries):
+        """icmp_prober.py hop records of a predicted path."""
+        return [{"ttl": ttl, "ip": ip, "ips": [ip], "rtts": [0.05 * ttl] * queries, "lost": 0,
+                 "probes": [[ip, 0.05 * ttl]] * queries}
+                for ttl, ip in enumerate(hops, 1)]
+
+    def predicted_probe(self, src, command):
+        """
+        icmp_prober.py --json output along the first shortest paths, or with
+        --flows N the flows spread round-robin over the equal-cost paths.
+        """
+        tokens = command.split()
+        addresses = [token for token in tokens if self.IPV4.match(token)]
+        flows = int(tokens[tokens.index("--flows") + 1]) if "--flows" in tokens else 0
+
+        results = []
+        for address in addresses:
+            paths = self.predicted_hops(src, host_address_map().get(address))
+            if not flows:
+                hops = paths[0] if paths else []
+                results.append({"dst": address, "reached": bool(hops),
+                                "hops": self.predicted_hop_records(hops, 3)})
+                continue
+
+            flow_paths = [paths[flow % len(paths)] if paths else [] for flow in range(flows)]
+            counts = {}
+            for hops in flow_paths:
+                counts[tuple(hops)] = counts.get(tuple(hops), 0) + 1
+            results.append({
+                "dst": address,
+                "flows": [{"dst": address, "flow": 33434 + flow, "reached": bool(hops),
+                           "hops": self.predicted_hop_records(hops, 1)}
+                          for flow, hops in enumerate(flow_paths)],
+                "paths": [{"hops": list(hops), "flows": count, "frequency": count / flows}
+                          for hops, count in sorted(counts.items(), key=lambda item: -item[1])],
+            })
+        return json.dumps(results)
+
+
+class ReplayBackend:
+    """
+    Root-free backend: ReplayNetwork nodes, a virtual clock advanced by waits
+    and by the recorded durations of replayed commands, and no host commands.
+
+    Recorded outputs of the same (node, command) are returned in order; the
+    last one is repeated once they are exhausted.
+    """
+
+    interactive = False
+
+    def __init__(self, recording=None, config_dir="./config", predict=True):
+        if isinstance(recording, str):
+            recording = load_recording(recording)
+        self.responses = {key: list(outputs) for key, outputs in (recording or {}).items()}
+        self.config_dir = config_dir
+        self.predict = predict
+        self.virtual_seconds = 0.0
+
+    def replay(self, node, command):
+        """Next recorded output of a command (None if never recorded)."""
+        outputs = self.responses.get((node, command))
+        if not outputs:
+            return None
+        output, seconds = outputs.pop(0) if len(outputs) > 1 else outputs[0]
+        self.virtual_seconds += seconds
+        return output
+
+    def start_network(self):
+        return ReplayNetwork(self)
+
+    def stop_network(self, net):
+        net.stop()
+
+    def sleep(self, seconds):
+        self.virtual_seconds += seconds
+
+    def clock(self):
+        return self.virtual_seconds
+
+    def shell(self, cmd, timeout=120):
+        recorded = self.replay(None, cmd)
+        return True if recorded is None else recorded
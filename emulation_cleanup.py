@@ -0,0 +1,392 @@
+#!/usr/bin/python3
+"""
+Fast teardown and stale-state reaping for the Mininet/FRR emulation.
+
+A crashed run leaves FRR daemons (started per router with
+"frrinit.sh start rX", i.e. pathspace -N rX), their pid files and vty/zserv
+sockets under /var/run/frr/rX, Mininet node shells ("mininet:rX") holding
+their namespaces, and veths in the root namespace behind. reap_stale_state()
+finds them through /proc, /sys/class/net and the FRR run directory,
+terminates the processes (TERM, then KILL), deletes the interfaces in one
+"ip -batch" call and removes the pid files and sockets. It replaces a slow
+"mn -c" between runs.
+
+Every entry point that builds the network holds the EmulationLock, and
+records its nodes (name, shell pid and start time) in the lock file while
+the network exists. Only the nodes recorded by the previous run are reaped,
+so other Mininet sessions with similar node names are left alone.
+delete_links() removes the links of a running network in bulk, one command
+per node, all nodes concurrently, before Mininet terminates the nodes.
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import signal
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from topology_spec import ROUTER_LINKS, HOST_ROUTER_LINKS
+
+
+FRR_RUN_DIR = "/var/run/frr"
+
+FRR_DAEMONS = ("watchfrr", "zebra", "ospfd", "staticd", "mgmtd", "bgpd", "ospf6d")
+
+# Names of our nodes, and of their interfaces when left in the root namespace
+NODE_NAME = re.compile(r'^[rh]\d+$')
+INTERFACE_NAME = re.compile(r'^[rh]\d+-eth\d+$')
+
+# Files of a router's FRR pathspace that outlive a crashed daemon
+STALE_FILE = re.compile(r'^(?:\w+\.pid|\w+\.vty|zserv\.api)$')
+
+# Held while an emulation runs (see EmulationLock)
+LOCK_FILE = os.path.join(tempfile.gettempdir(), "topo_emulation.lock")
+
+# Seconds processes get to exit on SIGTERM before SIGKILL
+TERM_GRACE = 2.0
+
+
+class EmulationLock:
+    """
+    Exclusive lock of the emulation (node names and FRR pathspaces are
+    global), held from network start to stop. The lock file holds the node
+    record of the network while it exists (see record()).
+    """
+
+    def __init__(self, filename=LOCK_FILE):
+        self.filename = filename
+        self.file = None
+        # Nodes recorded by the previous holder, read when the lock is taken
+        self.previous = {}
+
+    def acquire(self):
+        """
+        Take the lock and read the node record left by the previous run.
+
+        Raises:
+            RuntimeError: If another emulation holds it
+        """
+        self.file = open(self.filename, 'a+')
+        try:
+            fcntl.flock(self.file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.file.close()
+            self.file = None
+            raise RuntimeError(f"Another emulation is running (lock {self.filename})")
+
+        self.file.seek(0)
+        try:
+            self.previous = json.loads(self.file.read() or "{}").get("nodes", {})
+        except (ValueError, AttributeError):
+            self.previous = {}
+
+    def record(self, nodes):
+        """
+        Replace the node record of the lock file (see node_record(); {} once
+        the network is stopped). Call it while holding the lock.
+        """
+        self.file.truncate(0)
+        self.file.write(json.dumps({"pid": os.getpid(), "nodes": nodes}))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def release(self):
+        if self.file is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+
+
+def _cmdline(pid):
+    try:
+        with open(f"/proc/{pid}/cmdline", 'rb') as f:
+            return [arg.decode(errors='replace') for arg in f.read().split(b'\0') if arg]
+    except OSError:
+        return []
+
+
+def _netns(pid):
+    try:
+        return os.readlink(f"/proc/{pid}/ns/net")
+    except OSError:
+        return None
+
+
+def process_start_time(pid):
+    """Start time of a process in clock ticks since boot (None if it is gone)."""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            return int(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def node_record(net):
+    """
+    Node record of a Mininet network for EmulationLock.record().
+
+    Returns:
+        dict: node name -> {"pid": shell pid, "start": its start time}
+    """
+    return {node.name: {"pid": node.pid, "start": process_start_time(node.pid)} for node in net.hosts}
+
+
+def _owns(nodes, node):
+    """True if node belongs to the reaped run (any node with our naming if nodes is None)."""
+    return bool(NODE_NAME.match(node)) and (nodes is None or node in nodes)
+
+
+def stale_processes(nodes=None):
+    """
+    FRR daemons running with the pathspace of one of the nodes, the nodes'
+    Mininet shells (same pid and start time as recorded) and any other
+    process inside the namespaces of those daemons and shells.
+
+    Args:
+        nodes: Node record of the previous run (see node_record()), or None
+               to match every node with our naming
+
+    Returns:
+        dict: pid -> description
+    """
+    found = {}
+    namespaces = {}
+    others = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit() or int(entry) == os.getpid():
+            continue
+        args = _cmdline(entry)
+        if not args:
+            continue
+        name = os.path.basename(args[0])
+        shell = next((arg for arg in args if arg.startswith("mininet:")), None)
+        if name in FRR_DAEMONS and "-N" in args[:-1] and _owns(nodes, args[args.index("-N") + 1]):
+            found[int(entry)] = f"{name} -N {args[args.index('-N') + 1]}"
+            namespaces.setdefault(_netns(entry), found[int(entry)])
+        elif shell and _owns(nodes, shell[len("mininet:"):]) and (
+                nodes is None or (nodes[shell[len("mininet:"):]]["pid"] == int(entry) and
+                                  nodes[shell[len("mininet:"):]]["start"] == process_start_time(entry))):
+            found[int(entry)] = shell
+            namespaces[_netns(entry)] = shell
+        else:
+            others.append((int(entry), name))
+
+    # Processes started in a node namespace keep it alive after its shell is gone
+    namespaces.pop(_netns("self"), None)
+    namespaces.pop(None, None)
+    for pid, name in others:
+        namespace = _netns(pid)
+        if namespace in namespaces:
+            found[pid] = f"{name} in {namespaces[namespace]}"
+    return found
+
+
+def stale_pid_files(run_dir=FRR_RUN_DIR, nodes=None):
+    """
+    Live FRR daemons named by the pid files of our pathspaces (even if their
+    command line does not show the pathspace).
+
+    Returns:
+        dict: pid -> description
+    """
+    found = {}
+    for node in _pathspaces(run_dir, nodes):
+        for filename in os.listdir(os.path.join(run_dir, node)):
+            if not filename.endswith(".pid"):
+                continue
+            try:
+                with open(os.path.join(run_dir, node, filename), 'r') as f:
+                    pid = int(f.read().strip())
+            except (OSError, ValueError):
+                continue
+            args = _cmdline(pid)
+            if args and os.path.basename(args[0]) in FRR_DAEMONS:
+                found[pid] = f"{os.path.basename(args[0])} ({node}/{filename})"
+    return found
+
+
+def _pathspaces(run_dir, nodes=None):
+    if not os.path.isdir(run_dir):
+        return []
+    return sorted(name for name in os.listdir(run_dir)
+                  if _owns(nodes, name) and os.path.isdir(os.path.join(run_dir, name)))
+
+
+def stale_files(run_dir=FRR_RUN_DIR, nodes=None):
+    """Pid files and vty/zserv sockets left in the FRR pathspaces of the nodes."""
+    return [os.path.join(run_dir, node, filename)
+            for node in _pathspaces(run_dir, nodes)
+            for filename in sorted(os.listdir(os.path.join(run_dir, node)))
+            if STALE_FILE.match(filename)]
+
+
+def stale_interfaces(nodes=None):
+    """Interfaces of the nodes left in the root namespace."""
+    try:
+        return sorted(name for name in os.listdir("/sys/class/net")
+                      if INTERFACE_NAME.match(name) and _owns(nodes, name.split('-')[0]))
+    except OSError:
+        return []
+
+
+def find_stale_state(nodes=None, run_dir=FRR_RUN_DIR):
+    """
+    Leftovers of an earlier run.
+
+    Args:
+        nodes: Node record of that run (EmulationLock.previous), or None to
+               match every node with our naming
+
+    Returns:
+        dict: "processes" (pid -> description), "files", "interfaces"
+    """
+    processes = stale_processes(nodes)
+    processes.update(stale_pid_files(run_dir, nodes))
+    return {"processes": processes, "files": stale_files(run_dir, nodes), "interfaces": stale_interfaces(nodes)}
+
+
+def terminate(pids, grace=TERM_GRACE):
+    """
+    SIGTERM every process, then SIGKILL those still alive after grace seconds.
+
+    Returns:
+        list: Pids that had to be killed
+    """
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+    deadline = time.monotonic() + grace
+    alive = set(pids)
+    while alive and time.monotonic() < deadline:
+        alive = {pid for pid in alive if os.path.exists(f"/proc/{pid}") and not _zombie(pid)}
+        if alive:
+            time.sleep(0.05)
+
+    for pid in alive:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    return sorted(alive)
+
+
+def _zombie(pid):
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] == 'Z'
+    except (OSError, IndexError):
+        return True
+
+
+def delete_interfaces(interfaces):
+    """Delete root namespace interfaces in a single "ip -batch" call."""
+    if not interfaces:
+        return True
+    commands = "".join(f"link del {name}\n" for name in interfaces)
+    result = subprocess.run(["ip", "-force", "-batch", "-"], input=commands, text=True, capture_output=True)
+    return result.returncode == 0
+
+
+def reap_stale_state(nodes, run_dir=FRR_RUN_DIR, dry_run=False):
+    """
+    Find and remove the leftovers of the previous run (see module docstring).
+    Call it while holding the EmulationLock.
+
+    Args:
+        nodes: Node record of the previous run (EmulationLock.previous), or
+               None to reap every node with our naming
+        run_dir: FRR run directory
+        dry_run: Only report what would be reaped
+
+    Returns:
+        dict: What was found, plus "killed" (pids that needed SIGKILL) unless dry_run
+    """
+    state = find_stale_state(nodes, run_dir)
+    if dry_run:
+        return state
+
+    state["killed"] = terminate(list(state["processes"]))
+    delete_interfaces(state["interfaces"])
+    for path in stale_files(run_dir, nodes):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return state
+
+
+def link_deletions(router_links=None, host_router_links=None):
+    """
+    One "ip link del" per veth pair, grouped by the node owning the deleted
+    end (deleting one end removes its peer).
+
+    Returns:
+        dict: node -> list of interface names
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+    deletions = {}
+    for rA, _, intfA, _, _, _ in router_links:
+        deletions.setdefault(rA, []).append(intfA)
+    for _, rname, intfName, _ in host_router_links:
+        deletions.setdefault(rname, []).append(intfName)
+    return deletions
+
+
+def delete_links(net, router_links=None, host_router_links=None):
+    """
+    Delete the links of a running network in bulk: one "ip -batch" command
+    per node, all nodes concurrently.
+    """
+    deletions = link_deletions(router_links, host_router_links)
+
+    def delete(node):
+        batch = "\\n".join(f"link del {name}" for name in deletions[node])
+        return net[node].cmd(f"printf '{batch}\\n' | ip -force -batch -")
+
+    with ThreadPoolExecutor(max_workers=len(deletions) or 1) as pool:
+        list(pool.map(delete, deletions))
+
+
+def _print_state(state, verb):
+    print(f"{verb} {len(state['processes'])} processes, {len(state['files'])} pid files/sockets, "
+          f"{len(state['interfaces'])} interfaces")
+    for pid, description in sorted(state["processes"].items()):
+        print(f"  pid {pid}: {description}")
+    for path in state["files"]:
+        print(f"  {path}")
+    for name in state["interfaces"]:
+        print(f"  interface {name}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Reap FRR daemons, sockets, node shells and interfaces left behind by crashed emulation runs',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--dry-run', action='store_true', help='Only list the stale state')
+    parser.add_argument('--run-dir', type=str, default=FRR_RUN_DIR, help='FRR run directory')
+    parser.add_argument('--by-name', action='store_true',
+                        help='Reap every node named rN/hN instead of the nodes recorded by the last run '
+                             '(also matches other Mininet sessions)')
+    args = parser.parse_args()
+
+    lock = EmulationLock()
+    lock.acquire()
+    try:
+        start = time.perf_counter()
+        state = reap_stale_state(None if args.by_name else lock.previous, args.run_dir, args.dry_run)
+        _print_state(state, "Found" if args.dry_run else "Reaped")
+        if not args.dry_run:
+            lock.record({})
+            print(f"Done in {time.perf_counter() - start:.2f} s")
+    finally:
+        lock.release()
@@ -0,0 +1,235 @@
+#!/usr/bin/python3
+"""
+Long-running emulation daemon.
+
+Builds the topology once, keeps it converged and serves a local JSON API
+on a Unix-domain socket, so experiment scripts and notebooks can share one
+warm network instead of paying for the full bring-up on every run.
+
+Protocol: one JSON object per line, {"method": ..., "params": {...}},
+answered by one line {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+Calls are executed one at a time; see daemon_client.py for the client.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socketserver
+import threading
+import time
+
+from mininet.log import setLogLevel, info, error
+
+from cost_model_plugins import COST_MODELS
+from ospf_areas import area_plan
+from daemon_client import DEFAULT_SOCKET
+from routing_snapshot import collect_routing_snapshot
+from topology_spec import HOSTS, ROUTERS, baseline_ospf_costs
+from topo_runner import (start_network, stop_network, create_frr_configs, copy_configs_to_frr,
+                         restart_frr_routers, wait_for_convergence, trace_pair, probe_host,
+                         probe_pairs, run_prober, disable_icmp_ratelimit, enable_flow_hashing,
+                         MininetBackend, set_backend)
+
+
+class EmulationDaemon:
+    """
+    Warm network plus the API methods. Every public method takes keyword
+    parameters from the request and returns a JSON-serializable result.
+    """
+
+    METHODS = ("status", "apply_costs", "wait_convergence", "trace", "dump_fib", "reset", "shutdown")
+
+    def __init__(self, config_dir="./config", convergence_timeout=120, areas=None):
+        self.config_dir = config_dir
+        self.convergence_timeout = convergence_timeout
+        self.areas = areas
+        self.lock = threading.Lock()
+        self.server = None
+        self.started = time.time()
+        self.net = start_network()
+        self.state = {"cost_model": None, "percentage": 0, "seed": None, "converged": None}
+
+    @staticmethod
+    def _model(cost_model):
+        if cost_model not in COST_MODELS:
+            raise ValueError(f"unknown cost model: {cost_model}")
+        return COST_MODELS[cost_model]
+
+    def status(self):
+        """Uptime and the cost table currently applied."""
+        return dict(self.state, uptime=time.time() - self.started)
+
+    def apply_costs(self, ospf_costs=None, cost_model=None, percentage=0, seed=None,
+                    params=None, wait=True, timeout=None):
+        """
+        Deploy a cost table and restart OSPF.
+
+        Args:
+            ospf_costs: Explicit "router.interface" -> cost table, or
+            cost_model, percentage, seed, params: a cell of a cost model plugin
+            wait: Wait for convergence before returning
+            timeout: Convergence timeout in seconds (default: daemon setting)
+
+        Returns:
+            dict: "interfaces" (non-unit costs applied), "converged", "seconds"
+        """
+        if ospf_costs is None:
+            if cost_model is None:
+                ospf_costs = baseline_ospf_costs()
+            else:
+                model = self._model(cost_model).from_config(params or {})
+                ospf_costs = model.cost_table(percentage, seed)
+
+        if not create_frr_configs(ospf_costs, self.config_dir, self.areas):
+            raise RuntimeError("could not generate the FRR configurations")
+        if not copy_configs_to_frr(self.config_dir):
+            raise RuntimeError("could not install the FRR configurations")
+        restart_frr_routers(self.net, convergence_wait=0)
+
+        self.state = {"cost_model": cost_model, "percentage": percentage, "seed": seed, "converged": None}
+        result = {"interfaces": sum(1 for cost in ospf_costs.values() if cost != 1)}
+        if wait:
+            result.update(self.wait_convergence(timeout))
+        return result
+
+    def wait_convergence(self, timeout=None, interval=2, stable_polls=3):
+        """Block until the FIBs are complete and stable (see wait_for_convergence())."""
+        converged, seconds = wait_for_convergence(self.net, timeout or self.convergence_timeout,
+                                                  interval, stable_polls, self.areas)
+        self.state["converged"] = converged
+        return {"converged": converged, "seconds": seconds}
+
+    def trace(self, pairs=None, cost_model=None, prober="traceroute", flows=0):
+        """
+        Traceroute a list of [src, dst] host pairs (default: all pairs) with the
+        probe options of a cost model (default: the applied one, else random),
+        one traceroute per pair or one ICMP prober per source host ("icmp").
+        With flows set, every pair is probed with that many Paris-style flows.
+
+        Returns:
+            dict: "src->dst" -> raw traceroute output, or with flows the
+                  observed paths with their flow counts and frequencies
+        """
+        model = self._model(cost_model or self.state["cost_model"] or "random_different")()
+        if pairs is None:
+            hosts = sorted(HOSTS)
+            pairs = [(src, dst) for src in hosts for dst in hosts if src != dst]
+        pairs = [tuple(pair) for pair in pairs]
+
+        if flows:
+            enable_flow_hashing(self.net)
+            disable_icmp_ratelimit(self.net, ROUTERS + sorted(HOSTS))
+            results = probe_pairs(self.net, pairs, lambda src, dsts: run_prober(self.net, src, dsts, model, flows))
+            return {f"{src}->{dst}": results[(src, dst)]["paths"] if (src, dst) in results else []
+                    for src, dst in pairs}
+        if prober == "icmp":
+            disable_icmp_ratelimit(self.net)
+            traces = probe_pairs(self.net, pairs, lambda src, dsts: probe_host(self.net, src, dsts, model))
+            return {f"{src}->{dst}": traces[(src, dst)] for src, dst in pairs}
+        return {f"{src}->{dst}": trace_pair(self.net, src, dst, model) for src, dst in pairs}
+
+    def dump_fib(self, routers=None):
+        """FIB and OSPF state of the routers (see collect_routing_snapshot())."""
+        return collect_routing_snapshot(self.net, routers)
+
+    def reset(self, wait=True, timeout=None):
+        """Go back to the symmetric baseline (cost 1 everywhere)."""
+        return self.apply_costs(wait=wait, timeout=timeout)
+
+    def shutdown(self):
+        """Stop serving; the network is torn down once the server loop exits."""
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return True
+
+    def handle(self, request):
+        """Execute one decoded request and build its response."""
+        method = request.get("method")
+        if method not in self.METHODS:
+            return {"ok": False, "error": f"unknown method: {method}"}
+
+        try:
+            with self.lock:
+                result = getattr(self, method)(**request.get("params", {}))
+            return {"ok": True, "result": result}
+        except Exception as e:
+            error(f"{method} failed: {e}\n")
+            return {"ok": False, "error": str(e)}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON requests on one connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.daemon.handle(json.loads(line))
+            except ValueError as e:
+                response = {"ok": False, "error": f"invalid request: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+def serve(socket_path=DEFAULT_SOCKET, config_dir="./config", convergence_timeout=120, socket_mode=0o660,
+          areas=None):
+    """
+    Bring up the network, serve the API until shutdown (API call, SIGINT or
+    SIGTERM), then stop the network and remove the socket. Cost tables are
+    deployed with the given OSPF area plan (see ospf_areas.area_plan()).
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    daemon = EmulationDaemon(config_dir, convergence_timeout, areas)
+    server = socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler)
+    server.daemon = daemon
+    daemon.server = server
+    os.chmod(socket_path, socket_mode)
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    # Signal handlers can only be installed from the main thread
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+    try:
+        daemon.wait_convergence()
+        info(f"*** Emulation daemon listening on {socket_path}\n")
+        server.serve_forever()
+    finally:
+        server.server_close()
+        stop_network(daemon.net)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Keep the emulated network running and serve a JSON API on a Unix socket',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--socket', type=str, default=DEFAULT_SOCKET, help='Unix socket path')
+    parser.add_argument('--config-dir', type=str, default='./config', help='FRR configuration directory')
+    parser.add_argument('--convergence-timeout', type=int, default=120,
+                        help='Default convergence timeout in seconds')
+    parser.add_argument('--socket-mode', type=lambda s: int(s, 8), default=0o660,
+                        help='Permissions of the socket file (octal)')
+    parser.add_argument('--ospf-areas', choices=['tier', 'site'],
+                        help='Deploy cost tables with OSPF areas per tier or site group (default: single area)')
+    parser.add_argument('--stub-areas', choices=['stub', 'totally-stubby'],
+                        help='Make every non-backbone area stub or totally stubby (with --ospf-areas)')
+    parser.add_argument('--hostless', action='store_true',
+                        help='Realize the host subnets as VRFs inside their edge routers instead of host namespaces')
+    parser.add_argument('--log-level', type=str, default='info', choices=['debug', 'info', 'warning', 'error'],
+                        help='Logging level')
+    args = parser.parse_args()
+
+    setLogLevel(args.log_level)
+    if args.hostless:
+        set_backend(MininetBackend(hostless=True))
+    plan = area_plan(args.ospf_areas, stub=args.stub_areas) if args.ospf_areas else None
+    serve(args.socket, args.config_dir, args.convergence_timeout, args.socket_mode, plan)
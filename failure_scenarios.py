@@ -0,0 +1,369 @@
+#!/usr/bin/python3
+"""
+Link failure and recovery scenarios with reconvergence latency measurement.
+
+A scenario is a list of timed events on the router-to-router links of
+topology_spec.ROUTER_LINKS (NetworkTopo.router_links): a link going down or
+up (ip link inside both router namespaces) or an OSPF cost change (vtysh).
+While it runs, every router logs its FIB changes with "ip -4 -ts monitor
+route" and every probed host pair pings continuously with timestamped
+replies. This module builds those commands, parses their logs and derives,
+per event, the FIB reconvergence time of every router and the outage and
+recovery time of every pair. topo_runner.run_failure_scenario() drives the
+emulation.
+
+Scenario file format (JSON):
+    {"duration": 60, "probe_interval": 0.05,
+     "events": [{"at": 5, "action": "down", "link": "r4-r9"},
+                {"at": 35, "action": "up", "link": "r4-r9"},
+                {"at": 50, "action": "cost", "link": "r4.r4-eth4", "cost": 80}]}
+
+"link" is "rA-rB" (both directions) or a "router.interface" key (cost
+changes of that direction only); "at" is seconds from the scenario start.
+"""
+
+import argparse
+import json
+import re
+from datetime import datetime
+
+from topology_spec import ROUTER_LINKS
+
+
+ACTIONS = ("down", "up", "cost")
+
+# Seconds between two pings of a pair
+DEFAULT_PROBE_INTERVAL = 0.05
+
+# Seconds of the scenario after its last event (default duration)
+DEFAULT_SETTLE = 30.0
+
+# Per-router FIB change log (one "[ISO time] route" line per change)
+MONITOR_COMMAND = "ip -4 -ts monitor route"
+
+# A pair whose last reply is older than this at the end never recovered
+UNRECOVERED_GRACE = 1.0
+
+MONITOR_LINE = re.compile(r'^\[(\S+)\]\s+(.*)$')
+PING_REPLY = re.compile(r'^\[(\d+\.\d+)\].*icmp_seq=(\d+) ttl=(\d+) time=([\d.]+)')
+
+
+def link_flap_scenario(link, down_at=5.0, down_for=20.0, settle=DEFAULT_SETTLE,
+                       probe_interval=DEFAULT_PROBE_INTERVAL):
+    """
+    Scenario taking one link down and back up.
+
+    Returns:
+        dict: Normalized scenario
+    """
+    return normalize_scenario({
+        "duration": down_at + down_for + settle,
+        "probe_interval": probe_interval,
+        "events": [{"at": down_at, "action": "down", "link": link},
+                   {"at": down_at + down_for, "action": "up", "link": link}],
+    })
+
+
+def normalize_scenario(scenario, router_links=None):
+    """
+    Validate a scenario and fill in its defaults.
+
+    Raises:
+        ValueError: On an unknown action, link or a cost event without a cost
+
+    Returns:
+        dict: Scenario with sorted events, "duration" and "probe_interval"
+    """
+    events = sorted(scenario.get("events", []), key=lambda event: float(event["at"]))
+    for event in events:
+        if event.get("action") not in ACTIONS:
+            raise ValueError(f"Unknown scenario action: {event.get('action')}")
+        if event["action"] == "cost" and "cost" not in event:
+            raise ValueError(f"Cost event without a cost: {event}")
+        link_ends(event["link"], router_links)
+
+    last = float(events[-1]["at"]) if events else 0.0
+    return {
+        "duration": float(scenario.get("duration", last + DEFAULT_SETTLE)),
+        "probe_interval": float(scenario.get("probe_interval", DEFAULT_PROBE_INTERVAL)),
+        "events": [dict(event, at=float(event["at"])) for event in events],
+    }
+
+
+def load_scenario(filename):
+    """Load and normalize a scenario JSON file."""
+    with open(filename, 'r') as f:
+        return normalize_scenario(json.load(f))
+
+
+def link_ends(link, router_links=None):
+    """
+    (router, interface) ends an event acts on: both ends of "rA-rB", or the
+    single interface of a "router.interface" key.
+
+    Raises:
+        ValueError: If no router link matches
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    if '.' in link:
+        router, interface = link.split('.', 1)
+        if any((rA, intfA) == (router, interface) or (rB, intfB) == (router, interface)
+               for rA, rB, intfA, intfB, _, _ in router_links):
+            return [(router, interface)]
+    elif '-' in link:
+        ends = set(link.split('-', 1))
+        for rA, rB, intfA, intfB, _, _ in router_links:
+            if {rA, rB} == ends:
+                return [(rA, intfA), (rB, intfB)]
+    raise ValueError(f"No router link matches {link!r}")
+
+
+def event_commands(event, router_links=None):
+    """
+    Commands applying an event.
+
+    Returns:
+        list: (router, shell command) in execution order
+    """
+    commands = []
+    for router, interface in link_ends(event["link"], router_links):
+        if event["action"] == "cost":
+            commands.append((router, f"vtysh -N {router} -c 'configure terminal' -c 'interface {interface}' "
+                                     f"-c 'ip ospf cost {int(event['cost'])}'"))
+        else:
+            commands.append((router, f"ip link set dev {interface} {event['action']}"))
+    return commands
+
+
+def restore_commands(scenario, ospf_costs, router_links=None):
+    """
+    Commands undoing a scenario: every touched link up again and every
+    changed interface back to its cost in ospf_costs (cost 1 where missing).
+
+    Returns:
+        list: (router, shell command)
+    """
+    commands = []
+    for event in scenario["events"]:
+        for router, interface in link_ends(event["link"], router_links):
+            if event["action"] == "cost":
+                restore = {"action": "cost", "link": f"{router}.{interface}",
+                           "cost": ospf_costs.get(f"{router}.{interface}", 1)}
+            else:
+                restore = {"action": "up", "link": f"{router}.{interface}"}
+            for command in event_commands(restore, router_links):
+                if command not in commands:
+                    commands.append(command)
+    return commands
+
+
+def ping_command(address, interval, log):
+    """Background ping of one address with timestamped replies, echoing its pid."""
+    return f"ping -D -n -i {interval} -W 1 {address} > {log} 2>&1 & echo $!"
+
+
+def monitor_command(log):
+    """Background FIB change log, echoing its pid."""
+    return f"{MONITOR_COMMAND} > {log} 2>&1 & echo $!"
+
+
+def parse_route_monitor(output):
+    """
+    Parse "ip -ts monitor route" output.
+
+    Returns:
+        list: (epoch seconds, route line) per FIB change
+    """
+    changes = []
+    for line in output.splitlines():
+        match = MONITOR_LINE.match(line.strip())
+        if match:
+            try:
+                changes.append((datetime.fromisoformat(match.group(1)).timestamp(), match.group(2)))
+            except ValueError:
+                continue
+    return changes
+
+
+def parse_ping(output):
+    """
+    Parse "ping -D" output.
+
+    Returns:
+        list: (send time, icmp_seq, ttl) per reply, by sequence number
+    """
+    replies = []
+    for line in output.splitlines():
+        match = PING_REPLY.match(line.strip())
+        if match:
+            received, seq, ttl, rtt = match.groups()
+            replies.append((float(received) - float(rtt) / 1000, int(seq), int(ttl)))
+    return sorted(replies, key=lambda reply: reply[1])
+
+
+def event_windows(event_times, end):
+    """[start, end) window of every event: until the next event or the scenario end."""
+    return list(zip(event_times, list(event_times[1:]) + [end]))
+
+
+def window_of(t, windows):
+    """Index of the window containing t (None before the first event)."""
+    for i, (start, stop) in enumerate(windows):
+        if start <= t < stop:
+            return i
+    return None
+
+
+def pair_timeline(replies, windows, interval, end):
+    """
+    Outages and path changes of one pair, attributed to the event windows.
+
+    A run of lost probes between two replies a and b is an outage of
+    send(b) - send(a) - interval seconds; a pair without replies at the end
+    is unrecovered. A TTL change between two replies is a path change.
+
+    Returns:
+        list: Per event {"lost", "outage", "recovery", "path_change", "recovered"}
+              (seconds relative to the event, None where nothing happened)
+    """
+    timeline = [{"lost": 0, "outage": 0.0, "recovery": None, "path_change": None, "recovered": True}
+                for _ in windows]
+
+    for (send_a, seq_a, ttl_a), (send_b, seq_b, ttl_b) in zip(replies, replies[1:]):
+        if seq_b - seq_a > 1:
+            i = window_of(send_a + interval, windows)
+            if i is not None:
+                timeline[i]["lost"] += seq_b - seq_a - 1
+                timeline[i]["outage"] += max(send_b - send_a - interval, 0.0)
+                timeline[i]["recovery"] = send_b - windows[i][0]
+        if ttl_b != ttl_a:
+            i = window_of(send_b, windows)
+            if i is not None:
+                timeline[i]["path_change"] = send_b - windows[i][0]
+
+    if replies and end - replies[-1][0] > UNRECOVERED_GRACE + interval:
+        i = window_of(replies[-1][0] + interval, windows)
+        if i is not None:
+            timeline[i]["lost"] += int((end - replies[-1][0]) / interval)
+            timeline[i]["outage"] += end - replies[-1][0] - interval
+            timeline[i]["recovery"] = None
+            timeline[i]["recovered"] = False
+    return timeline
+
+
+def latency_distribution(values):
+    """
+    Count, mean and nearest-rank percentiles of a list of seconds.
+
+    Returns:
+        dict: count, min, p50, p90, p99, max, mean (None without values)
+    """
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "min": None, "p50": None, "p90": None, "p99": None, "max": None, "mean": None}
+
+    def rank(p):
+        return values[min(len(values) - 1, max(0, -(-p * len(values) // 100) - 1))]
+
+    return {"count": len(values), "min": values[0], "p50": rank(50), "p90": rank(90), "p99": rank(99),
+            "max": values[-1], "mean": sum(values) / len(values)}
+
+
+def analyze_scenario(scenario, event_times, start, end, fib_logs, ping_logs):
+    """
+    Per-event FIB reconvergence and per-pair outage/recovery of a scenario run.
+
+    Args:
+        scenario: Normalized scenario
+        event_times: Epoch seconds at which each event was applied
+        start: Epoch seconds of the scenario start
+        end: Epoch seconds of the scenario end
+        fib_logs: Router -> "ip -ts monitor route" output
+        ping_logs: (src, dst) -> "ping -D" output
+
+    Returns:
+        dict: Scenario, per-event results with latency distributions, per-pair timelines
+    """
+    interval = scenario["probe_interval"]
+    windows = event_windows(event_times, end)
+    fib_changes = {router: parse_route_monitor(output) for router, output in fib_logs.items()}
+    pairs = {pair: pair_timeline(parse_ping(output), windows, interval, end)
+             for pair, output in ping_logs.items() if parse_ping(output)}
+
+    events = []
+    for i, (event, (window_start, window_end)) in enumerate(zip(scenario["events"], windows)):
+        fib = {}
+        for router, changes in fib_changes.items():
+            times = [t for t, _ in changes if window_start <= t < window_end]
+            if times:
+                fib[router] = {"updates": len(times), "reconvergence": max(times) - window_start}
+
+        outages = [timeline[i]["outage"] for timeline in pairs.values() if timeline[i]["lost"]]
+        reconvergence = [max(t for t in (timeline[i]["recovery"], timeline[i]["path_change"]) if t is not None)
+                         for timeline in pairs.values()
+                         if timeline[i]["recovered"] and (timeline[i]["recovery"] is not None
+                                                          or timeline[i]["path_change"] is not None)]
+        events.append({
+            **event,
+            "time": window_start - start,
+            "fib_reconvergence": max((r["reconvergence"] for r in fib.values()), default=None),
+            "fib_routers": fib,
+            "pairs_probed": len(pairs),
+            "pairs_affected": len(outages),
+            "pairs_rerouted": sum(1 for timeline in pairs.values() if timeline[i]["path_change"] is not None),
+            "pairs_unrecovered": sum(1 for timeline in pairs.values() if not timeline[i]["recovered"]),
+            "outage": latency_distribution(outages),
+            "reconvergence": latency_distribution(reconvergence),
+        })
+
+    return {
+        "scenario": scenario,
+        "duration": end - start,
+        "events": events,
+        "pairs": {f"{src}->{dst}": timeline for (src, dst), timeline in sorted(pairs.items())},
+    }
+
+
+def summarize_report(report):
+    """Per-event headline numbers of an analyze_scenario() report."""
+    return [{"time": event["time"], "action": event["action"], "link": event["link"],
+             "fib_reconvergence": event["fib_reconvergence"],
+             "pairs_affected": event["pairs_affected"],
+             "pairs_unrecovered": event["pairs_unrecovered"],
+             "outage_p50": event["outage"]["p50"], "outage_max": event["outage"]["max"],
+             "reconvergence_p90": event["reconvergence"]["p90"]}
+            for event in report["events"]]
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.3f}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Write a link flap scenario, or print the per-event latencies of failover result files',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('reports', nargs='*', help='failover_asymmetry_Xpercent.json files to summarize')
+    parser.add_argument('--flap', type=str, help='Write a scenario flapping this link ("rA-rB") to stdout')
+    parser.add_argument('--down-at', type=float, default=5.0, help='Seconds before the link goes down')
+    parser.add_argument('--down-for', type=float, default=20.0, help='Seconds the link stays down')
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE, help='Seconds after the link comes back')
+    parser.add_argument('--probe-interval', type=float, default=DEFAULT_PROBE_INTERVAL,
+                        help='Seconds between two pings of a pair')
+    args = parser.parse_args()
+
+    if args.flap:
+        print(json.dumps(link_flap_scenario(args.flap, args.down_at, args.down_for, args.settle,
+                                            args.probe_interval), indent=2))
+
+    for filename in args.reports:
+        with open(filename, 'r') as f:
+            report = json.load(f)
+        print(f"{filename}:")
+        for row in summarize_report(report):
+            print(f"  t={row['time']:7.2f}s {row['action']:4s} {row['link']:12s} "
+                  f"FIB {_seconds(row['fib_reconvergence'])} s, "
+                  f"{row['pairs_affected']} pairs lost packets ({row['pairs_unrecovered']} unrecovered), "
+                  f"outage p50 {_seconds(row['outage_p50'])} s max {_seconds(row['outage_max'])} s, "
+                  f"reconvergence p90 {_seconds(row['reconvergence_p90'])} s")
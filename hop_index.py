@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+
+import argparse
+import socket
+import time
+
+import numpy as np
+
+from topology_spec import ROUTER_LINKS, HOST_ROUTER_LINKS, HOSTS
+
+
+def ipv4_to_uint32(addresses):
+    """
+    Convert dotted-quad strings to a uint32 array (network order value).
+    Empty strings and None ('*' hops) become 0, which matches no interface.
+    """
+    packed = b''.join(socket.inet_aton(a) if a else b'\0\0\0\0' for a in addresses)
+    return np.frombuffer(packed, dtype='>u4').astype(np.uint32)
+
+
+def uint32_to_ipv4(values):
+    """Convert a uint32 array back to dotted-quad strings."""
+    return [socket.inet_ntoa(int(v).to_bytes(4, 'big')) for v in values]
+
+
+def _parse_cidr(cidr):
+    """Return (address, network start, network end) of "a.b.c.d/len" as integers."""
+    address, prefix_len = cidr.split('/')
+    value = int(ipv4_to_uint32([address])[0])
+    mask = (0xFFFFFFFF << (32 - int(prefix_len))) & 0xFFFFFFFF
+    start = value & mask
+    return value, start, start | (~mask & 0xFFFFFFFF)
+
+
+class HopIndex:
+    """
+    Immutable address index of the topology for traceroute hop annotation.
+
+    Every interface address (routers and hosts) maps to
+    (node, interface, link id, direction), where link ids 0..L-1 are the
+    router-to-router links in table order and L.. are the host-router links.
+    Direction is 0 when the address sits on the first endpoint of the link
+    (rA for router links, the router for host links) and 1 otherwise.
+
+    Addresses that are not an interface but fall inside a link subnet
+    resolve to that link only (node, interface and direction are -1).
+    """
+
+    def __init__(self, router_links=None, host_router_links=None, hosts=None):
+        router_links = ROUTER_LINKS if router_links is None else router_links
+        host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+        hosts = HOSTS if hosts is None else hosts
+
+        routers = sorted({r for link in router_links for r in link[:2]} |
+                         {rname for _, rname, _, _ in host_router_links},
+                         key=lambda r: (len(r), r))
+        self.nodes = tuple(routers + [h for h, _, _, _ in host_router_links])
+        self.num_routers = len(routers)
+        self.links = tuple([(rA, rB) for rA, rB, _, _, _, _ in router_links] +
+                           [(rname, hname) for hname, rname, _, _ in host_router_links])
+        self.num_router_links = len(router_links)
+        node_id = {name: i for i, name in enumerate(self.nodes)}
+
+        interfaces = []
+        entries = []
+        subnets = {}
+
+        def add(cidr, node, intf, link_id, direction):
+            value, start, end = _parse_cidr(cidr)
+            entries.append((value, node_id[node], len(interfaces), link_id, direction))
+            interfaces.append(intf)
+            subnets[(start, end)] = link_id
+
+        for link_id, (rA, rB, intfA, intfB, ipA, ipB) in enumerate(router_links):
+            add(ipA, rA, intfA, link_id, 0)
+            add(ipB, rB, intfB, link_id, 1)
+
+        host_addresses = {}
+        for offset, (hname, rname, intf, ip) in enumerate(host_router_links):
+            link_id = len(router_links) + offset
+            add(ip, rname, intf, link_id, 0)
+            add(hosts[hname][0], hname, f"{hname}-eth0", link_id, 1)
+            host_addresses[hname] = hosts[hname][0].split('/')[0]
+
+        self.interfaces = tuple(interfaces)
+        self.host_addresses = tuple(sorted(host_addresses.items()))
+
+        entries.sort()
+        table = np.array(entries, dtype=np.int64).reshape(-1, 5)
+        self._addr = table[:, 0].astype(np.uint32)
+        self._node = table[:, 1].astype(np.int32)
+        self._intf = table[:, 2].astype(np.int32)
+        self._link = table[:, 3].astype(np.int32)
+        self._direction = table[:, 4].astype(np.int8)
+
+        bounds = sorted(subnets.items())
+        self._subnet_start = np.array([b[0][0] for b in bounds], dtype=np.uint32)
+        self._subnet_end = np.array([b[0][1] for b in bounds], dtype=np.uint32)
+        self._subnet_link = np.array([b[1] for b in bounds], dtype=np.int32)
+
+        # Lookup tables are shared between callers: make them read-only
+        for array in (self._addr, self._node, self._intf, self._link, self._direction,
+                      self._subnet_start, self._subnet_end, self._subnet_link):
+            array.setflags(write=False)
+
+    def lookup(self, ips):
+        """
+        Annotate an array of hop addresses.
+
+        Args:
+            ips: uint32 array (see ipv4_to_uint32()) of any shape; 0 means no reply
+
+        Returns:
+            dict: "node", "interface", "link", "direction" int arrays with the
+                  shape of ips (-1 where unresolved) and boolean "exact" mask
+        """
+        q = np.asarray(ips, dtype=np.uint32)
+        flat = q.ravel()
+
+        pos = np.searchsorted(self._addr, flat)
+        pos_c = np.minimum(pos, len(self._addr) - 1)
+        exact = self._addr[pos_c] == flat
+
+        node = np.where(exact, self._node[pos_c], -1)
+        intf = np.where(exact, self._intf[pos_c], -1)
+        direction = np.where(exact, self._direction[pos_c], -1).astype(np.int8)
+
+        spos = np.searchsorted(self._subnet_start, flat, side='right') - 1
+        spos_c = np.maximum(spos, 0)
+        in_subnet = (spos >= 0) & (flat <= self._subnet_end[spos_c])
+        link = np.where(exact, self._link[pos_c], np.where(in_subnet, self._subnet_link[spos_c], -1))
+
+        return {
+            "node": node.reshape(q.shape),
+            "interface": intf.reshape(q.shape),
+            "link": link.reshape(q.shape),
+            "direction": direction.reshape(q.shape),
+            "exact": exact.reshape(q.shape),
+        }
+
+    def router_of(self, ips):
+        """Router index of every hop address, -1 for hosts, '*' hops and unknown addresses."""
+        node = self.lookup(ips)["node"]
+        return np.where(node < self.num_routers, node, -1)
+
+
+def build_hop_index(router_links=None, host_router_links=None, hosts=None):
+    """Build the hop index of a topology."""
+    return HopIndex(router_links, host_router_links, hosts)
+
+
+def benchmark_lookup(num_hops=1000000, seed=42):
+    """
+    Time the annotation of a synthetic corpus of interface addresses.
+
+    Returns:
+        float: Seconds spent in HopIndex.lookup()
+    """
+    index = build_hop_index()
+    rng = np.random.default_rng(seed)
+    ips = rng.choice(np.asarray(index._addr), size=num_hops)
+
+    start = time.perf_counter()
+    index.lookup(ips)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Interface-address index for traceroute hop annotation',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--benchmark', type=int, default=1000000,
+                        help='Number of synthetic hops to annotate')
+    args = parser.parse_args()
+
+    elapsed = benchmark_lookup(args.benchmark)
+    print(f"Annotated {args.benchmark} hops in {elapsed:.3f} s")
@@ -0,0 +1,403 @@
+#!/usr/bin/python3
+"""
+In-process concurrent ICMP TTL prober.
+
+Replaces one "traceroute -I" subprocess per pair with a single process per
+source host: one raw ICMP socket sends TTL-limited echo requests to every
+destination at once, matches Time Exceeded / Echo Reply messages by
+identifier and sequence number, and stops probing a destination as soon as
+it answers. Per-hop timeouts adapt to the RTTs of nearer hops, so silent
+hops cost a fraction of a fixed wait.
+
+Run inside a host namespace (root is needed for the raw socket):
+
+    python3 icmp_prober.py --json 10.0.12.100 10.0.13.100
+
+Hop records have the fields of traceroute_parser.parse_hop_line(), and
+format_traceroute() renders them as "traceroute -n" text, so collected
+files keep their format.
+
+With --flows N the probes are Paris-traceroute style UDP flows instead
+(probe_flows()): N source ports per destination, each kept constant across
+TTLs, giving the set of equal-cost paths observed with their frequencies.
+"""
+
+import argparse
+import json
+import os
+import select
+import socket
+import struct
+import sys
+import time
+
+
+ICMP_ECHO_REPLY = 0
+ICMP_DEST_UNREACH = 3
+ICMP_ECHO_REQUEST = 8
+ICMP_TIME_EXCEEDED = 11
+
+# Adaptive timeout: NEAR_FACTOR times the largest RTT of the nearer hops,
+# within [MIN_WAIT, wait] (as traceroute's -w MAX,HERE,NEAR)
+NEAR_FACTOR = 10
+MIN_WAIT = 0.05
+
+# Multi-flow UDP probes: destination port and payload length below the TTL
+UDP_PORT = 33434
+PAYLOAD_BASE = 16
+
+
+def icmp_checksum(data):
+    """Internet checksum of an ICMP message."""
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def echo_request(ident, seq, payload=b'\0' * 32):
+    """ICMP Echo Request message with a valid checksum."""
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+
+def parse_icmp(packet):
+    """
+    Match a packet read from a raw ICMP socket (IP header included) to the
+    echo request it answers.
+
+    Returns:
+        tuple: (icmp type, identifier, sequence) or None if unrelated
+    """
+    if len(packet) < 28:
+        return None
+    ihl = (packet[0] & 0x0F) * 4
+    icmp_type = packet[ihl]
+
+    if icmp_type == ICMP_ECHO_REPLY:
+        ident, seq = struct.unpack('!HH', packet[ihl + 4:ihl + 8])
+        return icmp_type, ident, seq
+
+    if icmp_type in (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACH):
+        # Quoted original datagram: IP header + first 8 bytes of our echo request
+        inner = ihl + 8
+        if len(packet) < inner + 20 or packet[inner + 9] != socket.IPPROTO_ICMP:
+            return None
+        original = inner + (packet[inner] & 0x0F) * 4
+        if len(packet) < original + 8 or packet[original] != ICMP_ECHO_REQUEST:
+            return None
+        ident, seq = struct.unpack('!HH', packet[original + 4:original + 8])
+        return icmp_type, ident, seq
+
+    return None
+
+
+def parse_udp_quote(packet):
+    """
+    Match an ICMP error read from a raw ICMP socket to the UDP probe it quotes.
+
+    Returns:
+        tuple: (icmp type, probe destination, source port, UDP length) or None
+    """
+    if len(packet) < 28:
+        return None
+    ihl = (packet[0] & 0x0F) * 4
+    icmp_type = packet[ihl]
+    if icmp_type not in (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACH):
+        return None
+
+    inner = ihl + 8
+    if len(packet) < inner + 20 or packet[inner + 9] != socket.IPPROTO_UDP:
+        return None
+    original = inner + (packet[inner] & 0x0F) * 4
+    if len(packet) < original + 8:
+        return None
+    destination = socket.inet_ntoa(packet[inner + 16:inner + 20])
+    sport, _, length = struct.unpack('!HHH', packet[original:original + 6])
+    return icmp_type, destination, sport, length
+
+
+def _trace(sock, targets, send, match, max_ttl, queries, wait, window):
+    """
+    Probe loop shared by probe() and probe_flows().
+
+    Each target keeps up to 'window' TTLs in flight ('queries' probes per
+    TTL). send(target, ttl, query) sends one probe and returns its key (None
+    if it could not be sent); match(packet, address) returns (key, final,
+    reached) for a reply to one of our probes, else None. A final reply (the
+    destination's, or an unreachable report) ends its target: deeper TTLs are
+    no longer sent and their pending probes are dropped.
+
+    Returns:
+        dict: target -> (last TTL, reached, TTL -> [(address, RTT in ms) or None] * queries)
+    """
+    answers = {target: {} for target in targets}
+    final = {}                                    # target -> (ttl, reached)
+    next_ttl = {target: 1 for target in targets}
+    pending = {}                                  # key -> (target, ttl, query, sent, deadline)
+
+    def timeout(target, ttl):
+        near = [slot[1] for t, slots in answers[target].items() if t < ttl for slot in slots if slot]
+        return min(wait, max(MIN_WAIT, NEAR_FACTOR * max(near))) if near else wait
+
+    def in_flight(target):
+        return len({ttl for t, ttl, _, _, _ in pending.values() if t == target})
+
+    def refill():
+        for target in targets:
+            if target in final:
+                continue
+            while next_ttl[target] <= max_ttl and in_flight(target) < window:
+                ttl = next_ttl[target]
+                answers[target][ttl] = [None] * queries
+                for query in range(queries):
+                    now = time.monotonic()
+                    key = send(target, ttl, query)
+                    if key is not None:
+                        pending[key] = (target, ttl, query, now, now + timeout(target, ttl))
+                next_ttl[target] += 1
+            if next_ttl[target] > max_ttl and not in_flight(target):
+                final[target] = (max_ttl, False)
+
+    refill()
+    while pending:
+        now = time.monotonic()
+        deadline = min(entry[4] for entry in pending.values())
+        readable, _, _ = select.select([sock], [], [], max(0.0, deadline - now))
+
+        if readable:
+            while True:
+                try:
+                    packet, (address, _) = sock.recvfrom(1500)
+                except BlockingIOError:
+                    break
+                received = time.monotonic()
+                matched = match(packet, address)
+                if matched is None or matched[0] not in pending:
+                    continue
+                key, is_final, reached = matched
+                target, ttl, query, sent, _ = pending.pop(key)
+                answers[target][ttl][query] = (address, (received - sent) * 1000)
+
+                if is_final:
+                    # Destination (or an unreachable report) found: stop going deeper
+                    if target not in final or ttl < final[target][0]:
+                        final[target] = (ttl, reached)
+                    for other in [k for k, entry in pending.items() if entry[0] == target and entry[1] > ttl]:
+                        del pending[other]
+
+        # Expire probes past their deadline (left as lost)
+        now = time.monotonic()
+        for key in [k for k, entry in pending.items() if entry[4] <= now]:
+            del pending[key]
+
+        refill()
+
+    return {target: final.get(target, (max_ttl, False)) + (answers[target],) for target in targets}
+
+
+def hop_records(answers, last, queries):
+    """Hop records of TTLs 1..last from the per-TTL answers of _trace()."""
+    hops = []
+    for ttl in range(1, last + 1):
+        slots = answers.get(ttl, [None] * queries)
+        ips = []
+        for slot in slots:
+            if slot and slot[0] not in ips:
+                ips.append(slot[0])
+        hops.append({
+            "ttl": ttl,
+            "ip": ips[0] if ips else None,
+            "ips": ips,
+            "rtts": [slot[1] for slot in slots if slot],
+            "lost": sum(1 for slot in slots if slot is None),
+            "probes": slots,
+        })
+    return hops
+
+
+def probe(destinations, max_ttl=30, queries=3, wait=3.0, window=8, ident=None):
+    """
+    Trace the route to every destination concurrently over one raw socket.
+
+    Args:
+        destinations: Destination IPv4 addresses
+        max_ttl: Maximum TTL
+        queries: Probes per hop
+        wait: Maximum seconds to wait for a probe
+        window: TTLs in flight per destination
+        ident: ICMP identifier (default: process id)
+
+    Returns:
+        list: Per destination {"dst", "reached", "hops"}, hops being
+              {"ttl", "ip", "ips", "rtts", "lost", "probes"} with "probes"
+              the (address, RTT in ms) of every query, None when lost
+    """
+    ident = (os.getpid() if ident is None else ident) & 0xFFFF
+    sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    sock.setblocking(False)
+    sequence = 0
+
+    def send(dst, ttl, query):
+        nonlocal sequence
+        sequence = (sequence + 1) & 0xFFFF
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+        try:
+            sock.sendto(echo_request(ident, sequence), (dst, 0))
+        except OSError:
+            return None
+        return sequence
+
+    def match(packet, address):
+        matched = parse_icmp(packet)
+        if matched is None or matched[1] != ident:
+            return None
+        icmp_type = matched[0]
+        return matched[2], icmp_type in (ICMP_ECHO_REPLY, ICMP_DEST_UNREACH), icmp_type == ICMP_ECHO_REPLY
+
+    try:
+        traces = _trace(sock, destinations, send, match, max_ttl, queries, wait, window)
+    finally:
+        sock.close()
+
+    return [{"dst": dst, "reached": traces[dst][1], "hops": hop_records(traces[dst][2], traces[dst][0], queries)}
+            for dst in destinations]
+
+
+def probe_flows(destinations, flows=8, max_ttl=30, wait=3.0, window=8, port=UDP_PORT):
+    """
+    Paris-traceroute style multi-flow tracing of every destination at once.
+
+    Each flow is a UDP socket with its own source port; the flow identifier
+    (addresses, protocol and ports) stays constant across TTLs, so per-flow
+    ECMP hashing keeps each flow on one path while different flows spread
+    over the equal-cost paths. One probe per flow and TTL, identified in the
+    quoted header by its source port and its UDP length (which encodes the TTL).
+
+    Args:
+        destinations: Destination IPv4 addresses
+        flows: Flows per destination
+        max_ttl: Maximum TTL
+        wait: Maximum seconds to wait for a probe
+        window: TTLs in flight per flow
+        port: Destination UDP port (unused port, answered with Port Unreachable)
+
+    Returns:
+        list: Per destination {"dst", "flows", "paths"}: "flows" the
+              {"dst", "flow" (source port), "reached", "hops"} of every flow,
+              "paths" the distinct hop address sequences (None for '*') with
+              the number and share of flows that took them, most frequent first
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    sock.setblocking(False)
+    senders = []
+    for _ in range(flows):
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.bind(('', 0))
+        senders.append(sender)
+    ports = [sender.getsockname()[1] for sender in senders]
+    flow_of_port = dict(zip(ports, range(flows)))
+
+    def send(target, ttl, query):
+        dst, flow = target
+        senders[flow].setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+        try:
+            senders[flow].sendto(b'\0' * (PAYLOAD_BASE + ttl), (dst, port))
+        except OSError:
+            return None
+        return dst, ports[flow], 8 + PAYLOAD_BASE + ttl
+
+    def match(packet, address):
+        matched = parse_udp_quote(packet)
+        if matched is None or matched[2] not in flow_of_port:
+            return None
+        icmp_type, dst, sport, length = matched
+        return (dst, sport, length), icmp_type == ICMP_DEST_UNREACH, address == dst
+
+    targets = [(dst, flow) for dst in destinations for flow in range(flows)]
+    try:
+        traces = _trace(sock, targets, send, match, max_ttl, 1, wait, window)
+    finally:
+        sock.close()
+        for sender in senders:
+            sender.close()
+
+    results = []
+    for dst in destinations:
+        flow_results = []
+        counts = {}
+        for flow in range(flows):
+            last, reached, answers = traces[(dst, flow)]
+            hops = hop_records(answers, last, 1)
+            flow_results.append({"dst": dst, "flow": ports[flow], "reached": reached, "hops": hops})
+            path = tuple(hop["ip"] for hop in hops)
+            counts[path] = counts.get(path, 0) + 1
+
+        paths = [{"hops": list(path), "flows": count, "frequency": count / flows}
+                 for path, count in sorted(counts.items(), key=lambda item: -item[1])]
+        results.append({"dst": dst, "flows": flow_results, "paths": paths})
+
+    return results
+
+
+def path_flow(result, path):
+    """First flow of a probe_flows() result that took one of its distinct paths."""
+    return next(flow for flow in result["flows"] if [hop["ip"] for hop in flow["hops"]] == path["hops"])
+
+
+def format_traceroute(result, max_ttl=30, packet_size=60):
+    """Render one probe() result as "traceroute -n" output."""
+    lines = [f"traceroute to {result['dst']} ({result['dst']}), {max_ttl} hops max, {packet_size} byte packets"]
+    for hop in result["hops"]:
+        tokens = []
+        last_ip = None
+        for slot in hop["probes"]:
+            if slot is None:
+                tokens.append("*")
+                continue
+            ip, rtt = slot
+            if ip != last_ip:
+                tokens.append(ip)
+                last_ip = ip
+            tokens.append(f"{rtt:.3f} ms")
+        lines.append(f"{hop['ttl']:2d}  " + "  ".join(tokens))
+    return "\n".join(lines)
+
+
+def prober_command(destinations, max_ttl=30, queries=3, wait=3.0, window=8, flows=0):
+    """Shell command running this prober on a Mininet node, with JSON output."""
+    flow_option = f"--flows {flows} " if flows else ""
+    return (f"{sys.executable} {os.path.abspath(__file__)} --json --max-ttl {max_ttl} "
+            f"--queries {queries} --wait {wait} --window {window} {flow_option}" + " ".join(destinations))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Concurrent ICMP TTL probing of several destinations over one raw socket',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('destinations', nargs='+', help='Destination IPv4 addresses')
+    parser.add_argument('--max-ttl', type=int, default=30, help='Maximum TTL')
+    parser.add_argument('--queries', type=int, default=3, help='Probes per hop')
+    parser.add_argument('--wait', type=float, default=3.0, help='Maximum seconds to wait for a probe')
+    parser.add_argument('--window', type=int, default=8, help='TTLs in flight per destination')
+    parser.add_argument('--flows', type=int, default=0,
+                        help='Paris-style UDP flows per destination (0: ICMP echo probes, one flow)')
+    parser.add_argument('--json', action='store_true', help='Print hop records as JSON instead of traceroute text')
+    args = parser.parse_args()
+
+    if args.flows:
+        traces = probe_flows(args.destinations, args.flows, args.max_ttl, args.wait, args.window)
+        # Text output: the traceroute of one flow per distinct path
+        shown = [path_flow(trace, path) for trace in traces for path in trace["paths"]]
+    else:
+        traces = probe(args.destinations, args.max_ttl, args.queries, args.wait, args.window)
+        shown = traces
+
+    if args.json:
+        print(json.dumps(traces))
+    else:
+        print("\n\n".join(format_traceroute(trace, args.max_ttl) for trace in shown))
@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+
+import argparse
+import json
+from functools import reduce
+
+import numpy as np
+
+from hop_index import build_hop_index
+from traceroute_corpus import load_corpus, directed_link_table, directed_links
+
+
+class LinkPairIndex:
+    """
+    Inverted index from (cell, directed link) to the host pairs crossing it.
+
+    Stored in CSR form: row r = cell * num_dlinks + dlink, and
+    indices[indptr[r]:indptr[r + 1]] are the sorted pair ids of that row.
+    Pair id = src_host * num_hosts + dst_host (host order of HopIndex.nodes),
+    directed link 2*l is rA->rB of router link l and 2*l+1 is rB->rA.
+    """
+
+    def __init__(self, indptr, indices, cells, nodes, links, num_routers):
+        self.indptr = indptr
+        self.indices = indices
+        self.cells = cells
+        self.nodes = tuple(nodes)
+        self.links = tuple(tuple(link) for link in links)
+        self.num_routers = num_routers
+        self.num_hosts = len(self.nodes) - num_routers
+        self.num_dlinks = 2 * len(self.links)
+
+    @classmethod
+    def from_corpus(cls, corpus, index=None):
+        """
+        Build the index from load_corpus() output.
+        Traceroutes that never reached their destination are still indexed
+        for the links they were observed on.
+        """
+        index = build_hop_index() if index is None else index
+        num_routers = index.num_routers
+        num_hosts = len(index.nodes) - num_routers
+        num_dlinks = 2 * index.num_router_links
+        num_cells = len(corpus["cells"])
+
+        dl = directed_links(corpus["router"], directed_link_table(index))
+        rec, _ = np.nonzero(dl >= 0)
+        pair = (corpus["src"][rec] - num_routers) * num_hosts + (corpus["dst"][rec] - num_routers)
+        row = corpus["cell"][rec].astype(np.int64) * num_dlinks + dl[dl >= 0]
+
+        # Sort and deduplicate (row, pair) in one pass on a combined key
+        num_pairs = num_hosts * num_hosts
+        combined = np.unique(row * num_pairs + pair)
+        rows = combined // num_pairs
+
+        indptr = np.zeros(num_cells * num_dlinks + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_cells * num_dlinks), out=indptr[1:])
+        indices = (combined % num_pairs).astype(np.int32)
+
+        return cls(indptr, indices, corpus["cells"], index.nodes,
+                   index.links[:index.num_router_links], num_routers)
+
+    @classmethod
+    def build(cls, base_dir):
+        """Parse a simulations/ tree and build its index."""
+        index = build_hop_index()
+        return cls.from_corpus(load_corpus(base_dir, index=index), index)
+
+    def save(self, filename):
+        """Store the index as a compressed .npz file."""
+        np.savez_compressed(
+            filename,
+            indptr=self.indptr,
+            indices=self.indices,
+            num_routers=self.num_routers,
+            meta=json.dumps({"cells": self.cells, "nodes": self.nodes, "links": self.links}),
+        )
+
+    @classmethod
+    def load(cls, filename):
+        """Load an index written by save()."""
+        with np.load(filename) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(data["indptr"], data["indices"], meta["cells"], meta["nodes"],
+                       meta["links"], int(data["num_routers"]))
+
+    def dlink(self, router_from, router_to):
+        """Directed link id of router_from -> router_to."""
+        for link_id, (rA, rB) in enumerate(self.links):
+            if (rA, rB) == (router_from, router_to):
+                return 2 * link_id
+            if (rB, rA) == (router_from, router_to):
+                return 2 * link_id + 1
+        raise KeyError(f"{router_from}->{router_to} is not a router link")
+
+    def dlink_name(self, dlink):
+        """(from, to) router names of a directed link id."""
+        rA, rB = self.links[dlink // 2]
+        return (rA, rB) if dlink % 2 == 0 else (rB, rA)
+
+    def pair_names(self, pairs):
+        """Convert pair ids to (src, dst) host names."""
+        return [(self.nodes[self.num_routers + p // self.num_hosts],
+                 self.nodes[self.num_routers + p % self.num_hosts]) for p in pairs]
+
+    def select_cells(self, sim=None, percentage=None, cost_model=None):
+        """Ids of the cells matching every given attribute."""
+        return [i for i, c in enumerate(self.cells)
+                if (sim is None or c["sim"] == sim)
+                and (percentage is None or c["percentage"] == percentage)
+                and (cost_model is None or c["cost_model"] == cost_model)]
+
+    def pairs(self, cell, dlink):
+        """Sorted pair ids crossing dlink in cell (a view into the CSR arrays)."""
+        row = cell * self.num_dlinks + dlink
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def union(self, dlink, cells):
+        """Pairs crossing dlink in at least one of the cells."""
+        return reduce(np.union1d, (self.pairs(c, dlink) for c in cells), np.empty(0, dtype=np.int32))
+
+    def intersection(self, dlink, cells):
+        """Pairs crossing dlink in every one of the cells."""
+        cells = list(cells)
+        if not cells:
+            return np.empty(0, dtype=np.int32)
+        return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True),
+                      (self.pairs(c, dlink) for c in cells[1:]), self.pairs(cells[0], dlink))
+
+    def difference(self, dlink, cell_a, cell_b):
+        """Pairs crossing dlink in cell_a but not in cell_b."""
+        return np.setdiff1d(self.pairs(cell_a, dlink), self.pairs(cell_b, dlink), assume_unique=True)
+
+    def link_load(self):
+        """[cells, dlinks] matrix with the number of pairs crossing each directed link."""
+        return np.diff(self.indptr).reshape(len(self.cells), self.num_dlinks)
+
+    def changed_cells(self, dlink, reference_percentage=0):
+        """
+        Cells whose pair set on dlink differs from the cell of the same
+        simulation at reference_percentage (the symmetric baseline by default).
+        """
+        reference = {c["sim"]: i for i, c in enumerate(self.cells) if c["percentage"] == reference_percentage}
+        changed = []
+        for i, c in enumerate(self.cells):
+            ref = reference.get(c["sim"])
+            if ref is None or ref == i:
+                continue
+            if not np.array_equal(self.pairs(i, dlink), self.pairs(ref, dlink)):
+                changed.append(i)
+        return changed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Build and query the (run, directed link) -> host pairs inverted index',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('base_dir', type=str, help='Simulations directory to index')
+    parser.add_argument('--output', type=str, help='Save the index to this .npz file')
+    parser.add_argument('--link', type=str, nargs=2, metavar=('FROM', 'TO'),
+                        help='Print the pairs crossing this directed link in every cell')
+    args = parser.parse_args()
+
+    link_index = LinkPairIndex.build(args.base_dir)
+    print(f"Indexed {len(link_index.cells)} cells, {len(link_index.indices)} (cell, link, pair) entries")
+
+    if args.output:
+        link_index.save(args.output)
+
+    if args.link:
+        dlink = link_index.dlink(*args.link)
+        for cell_id, cell in enumerate(link_index.cells):
+            pairs = link_index.pair_names(link_index.pairs(cell_id, dlink))
+            print(f"{cell['sim']} {cell['percentage']}%: {len(pairs)} pairs")
+        changed = link_index.changed_cells(dlink)
+        print(f"Cells with changed traffic on {args.link[0]}->{args.link[1]}: "
+              f"{[(link_index.cells[c]['sim'], link_index.cells[c]['percentage']) for c in changed]}")
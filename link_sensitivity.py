@@ -0,0 +1,251 @@
+#!/usr/bin/python3
+
+import argparse
+import heapq
+import json
+import math
+import time
+
+import numpy as np
+
+from cost_models import cost_table_for_cell, generate_random_ospf_costs, uniform_random_costs
+from path_predictor import build_directed_graph, shortest_path_dag, edge_router_map
+from topology_spec import ROUTER_LINKS, HOST_ROUTER_LINKS, generate_topology
+
+
+def reverse_graph(graph):
+    """Graph with every edge reversed: v -> list of (u, cost of u->v)."""
+    reverse = {}
+    for u, edges in graph.items():
+        reverse.setdefault(u, [])
+        for v, cost in edges:
+            reverse.setdefault(v, []).append((u, cost))
+    return reverse
+
+
+def delete_edge_update(graph, in_edges, dist, preds, children, u, v):
+    """
+    Incremental SPF: distances from the same source after deleting u->v.
+
+    Only the nodes whose every shortest path crosses u->v can change; they
+    are found by walking the predecessor DAG below v, and re-settled by a
+    Dijkstra restricted to them, seeded from their unaffected in-neighbors.
+
+    Args:
+        graph: router -> list of (neighbor, cost)
+        in_edges: reverse_graph(graph)
+        dist, preds: shortest_path_dag() output of the source
+        children: Successor lists of the predecessor DAG
+        u, v: Deleted edge
+
+    Returns:
+        dict: New distance of every changed node (math.inf if unreachable)
+    """
+    if preds.get(v) != [u]:
+        # v keeps another equal-cost predecessor: no distance changes
+        return {}
+
+    affected = {v}
+    seen = {v}
+    heap = [(dist[c], c) for c in children.get(v, ())]
+    heapq.heapify(heap)
+    while heap:
+        _, x = heapq.heappop(heap)
+        if x in seen:
+            continue
+        seen.add(x)
+        # Predecessors have a strictly smaller distance, so they are decided
+        if all(p in affected for p in preds[x]):
+            affected.add(x)
+            for c in children.get(x, ()):
+                heapq.heappush(heap, (dist[c], c))
+
+    new = {}
+    heap = []
+    for a in affected:
+        best = math.inf
+        for w, cost in in_edges.get(a, ()):
+            if w in affected or (w == u and a == v) or w not in dist:
+                continue
+            best = min(best, dist[w] + cost)
+        new[a] = best
+        if best < math.inf:
+            heap.append((best, a))
+    heapq.heapify(heap)
+
+    while heap:
+        d, a = heapq.heappop(heap)
+        if d > new[a]:
+            continue
+        for b, cost in graph.get(a, ()):
+            if b in affected and d + cost < new[b]:
+                new[b] = d + cost
+                heapq.heappush(heap, (d + cost, b))
+
+    return new
+
+
+def link_sensitivity(ospf_costs, router_links=None, host_router_links=None):
+    """
+    Cost thresholds at which each host pair's shortest path changes, per directed link.
+
+    For a pair whose shortest paths cross link e, the threshold is the cost of e
+    at which an alternative path becomes equal-cost (raising e beyond it moves
+    the pair away); it comes from an incremental SPF update after deleting e.
+    For a pair that does not cross e, it is the cost at which a path through e
+    ties with the current one (lowering e below it pulls the pair onto e),
+    obtained directly from the forward and reverse distance tables.
+
+    Args:
+        ospf_costs: Dictionary with "router.interface" keys and OSPF costs as values
+        router_links: Router-to-router link table (default: topology_spec.ROUTER_LINKS)
+        host_router_links: Host-router link table (default: topology_spec.HOST_ROUTER_LINKS)
+
+    Returns:
+        dict: "links" (directed (from, to), 2*l = rA->rB of router link l),
+              "pairs" (host pairs), "current_cost" [links],
+              "threshold" [links, pairs] (inf if the path never changes),
+              "direction" [links, pairs] (+1: changes when raised, -1: when lowered)
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+
+    graph = build_directed_graph(ospf_costs, router_links)
+    in_edges = reverse_graph(graph)
+    routers = sorted(in_edges, key=lambda r: (len(r), r))
+    node_id = {r: i for i, r in enumerate(routers)}
+
+    links = []
+    costs = []
+    for rA, rB, intfA, intfB, _, _ in router_links:
+        links += [(rA, rB), (rB, rA)]
+        costs += [ospf_costs.get(f"{rA}.{intfA}", 1), ospf_costs.get(f"{rB}.{intfB}", 1)]
+    link_u = np.array([node_id[u] for u, _ in links])
+    link_v = np.array([node_id[v] for _, v in links])
+    link_cost = np.array(costs, dtype=np.float64)
+
+    edge = edge_router_map(host_router_links)
+    ends = sorted(set(edge.values()), key=lambda r: (len(r), r))
+    end_id = {r: i for i, r in enumerate(ends)}
+    end_nodes = np.array([node_id[r] for r in ends])
+
+    # Distances from every edge router and to every edge router
+    forward = {s: shortest_path_dag(graph, s) for s in ends}
+    dist_from = np.full((len(ends), len(routers)), np.inf)
+    dist_to = np.full((len(ends), len(routers)), np.inf)
+    for i, r in enumerate(ends):
+        for x, d in forward[r][0].items():
+            dist_from[i, node_id[x]] = d
+        for x, d in shortest_path_dag(in_edges, r)[0].items():
+            dist_to[i, node_id[x]] = d
+
+    # [links, sources, targets]: cost of e at which a path through e ties the best path
+    best = dist_from[:, end_nodes]
+    with np.errstate(invalid='ignore'):
+        tie = best[None, :, :] - dist_from[:, link_u].T[:, :, None] - dist_to[:, link_v].T[:, None, :]
+    on_path = tie == link_cost[:, None, None]
+
+    threshold = np.where(on_path | (tie < 1) | np.isnan(tie), np.inf, tie)
+    direction = np.where(on_path, 1, -1).astype(np.int8)
+
+    # Links on a shortest path: distance after deleting them, incrementally per source
+    link_index = {link: e for e, link in enumerate(links)}
+    for s in ends:
+        dist, preds = forward[s]
+        children = {}
+        for x, ps in preds.items():
+            for p in ps:
+                children.setdefault(p, []).append(x)
+        si = end_id[s]
+        for v, ps in preds.items():
+            for u in ps:
+                e = link_index[(u, v)]
+                if not on_path[e, si].any():
+                    continue
+                new_best = best[si].copy()
+                for x, d in delete_edge_update(graph, in_edges, dist, preds, children, u, v).items():
+                    if x in end_id:
+                        new_best[end_id[x]] = d
+                targets = on_path[e, si]
+                threshold[e, si, targets] = link_cost[e] + new_best[targets] - best[si, targets]
+
+    # Expand edge-router pairs to host pairs
+    hosts = sorted(edge)
+    pairs = [(a, b) for a in hosts for b in hosts if a != b and edge[a] != edge[b]]
+    src = np.array([end_id[edge[a]] for a, _ in pairs], dtype=np.int64)
+    dst = np.array([end_id[edge[b]] for _, b in pairs], dtype=np.int64)
+
+    return {
+        "links": links,
+        "pairs": pairs,
+        "current_cost": link_cost,
+        "threshold": threshold[:, src, dst],
+        "direction": direction[:, src, dst],
+    }
+
+
+def sensitive_mask(result, cost_range):
+    """[links, pairs] mask of path changes reachable within the cost range (low, high)."""
+    low, high = cost_range
+    raised = (result["direction"] > 0) & (result["threshold"] <= high)
+    lowered = (result["direction"] < 0) & (result["threshold"] >= low) & np.isfinite(result["threshold"])
+    return raised | lowered
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Per-link cost thresholds at which host pair paths change',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--topology', choices=['spec', 'generated'], default='spec',
+                        help='The 18-router topology or a generated one')
+    parser.add_argument('--num-routers', type=int, default=500, help='Routers of the generated topology')
+    parser.add_argument('--num-hosts', type=int, default=50, help='Hosts of the generated topology')
+    parser.add_argument('--seed', type=int, default=42, help='Seed of the cost table and generated topology')
+    parser.add_argument('--percentage', type=int, default=40, help='Asymmetry percentage of the cost table')
+    parser.add_argument('--metadata', type=str,
+                        help='simulation_metadata.json to rebuild the cost table from (spec topology)')
+    parser.add_argument('--min-cost', type=int, default=10, help='Minimum OSPF cost (random model)')
+    parser.add_argument('--max-cost', type=int, default=100, help='Maximum OSPF cost (random model)')
+    parser.add_argument('--low-cost-range', type=int, nargs=2, help='Low cost range (directional model)')
+    parser.add_argument('--high-cost-range', type=int, nargs=2, help='High cost range (directional model)')
+    parser.add_argument('--output', type=str, help='Save thresholds to this .npz file')
+    args = parser.parse_args()
+
+    if args.low_cost_range and args.high_cost_range:
+        sweep = (args.low_cost_range[0], args.high_cost_range[1])
+    else:
+        sweep = (args.min_cost, args.max_cost)
+
+    if args.topology == 'generated':
+        r_links, h_links, _ = generate_topology(args.num_routers, num_hosts=args.num_hosts, seed=args.seed)
+        costs = uniform_random_costs(r_links, args.percentage, args.seed, *sweep)
+    else:
+        r_links, h_links = ROUTER_LINKS, HOST_ROUTER_LINKS
+        if args.metadata:
+            with open(args.metadata, 'r') as f:
+                costs = cost_table_for_cell(json.load(f), args.percentage)
+        else:
+            costs = generate_random_ospf_costs(args.percentage, args.seed, *sweep)
+
+    start = time.perf_counter()
+    sensitivity = link_sensitivity(costs, r_links, h_links)
+    elapsed = time.perf_counter() - start
+
+    mask = sensitive_mask(sensitivity, sweep)
+    per_link = mask.sum(axis=1)
+    print(f"{len(sensitivity['links'])} directed links x {len(sensitivity['pairs'])} host pairs "
+          f"in {elapsed:.2f} s, cost range {sweep[0]}-{sweep[1]}")
+    for e in np.argsort(-per_link, kind='stable')[:10]:
+        u, v = sensitivity["links"][e]
+        print(f"  {u}->{v} (cost {sensitivity['current_cost'][e]:.0f}): {per_link[e]} pairs change")
+
+    if args.output:
+        np.savez_compressed(
+            args.output,
+            threshold=sensitivity["threshold"],
+            direction=sensitivity["direction"],
+            current_cost=sensitivity["current_cost"],
+            links=np.array(sensitivity["links"]),
+            pairs=np.array(sensitivity["pairs"]),
+        )
@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+
+import argparse
+import csv
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import lsq_linear
+from scipy.sparse.linalg import lsqr
+
+from corpus_store import CorpusStore, STAR_ROUTER
+from hop_index import build_hop_index
+from traceroute_corpus import directed_link_table, directed_links
+
+
+# Router path sentinels: padding after the end of a path and '*' hops
+PAD = -1
+STAR = -2
+
+
+def router_path_links(store, link_table):
+    """
+    Directed links of every interned router path of the store.
+
+    Returns:
+        tuple: (links [router paths, max_len - 1] directed link ids, -1 after the end,
+                complete [router paths] True if the path has no '*' hop and every
+                consecutive router pair is a known link)
+    """
+    lengths = store.router_paths['length'].astype(np.int64)
+    max_len = max(int(lengths.max(initial=0)), 2)
+    hop = np.arange(max_len)
+    inside = hop[None, :] < lengths[:, None]
+
+    paths = np.full((len(lengths), max_len), PAD, dtype=np.int32)
+    if inside.any():
+        offsets = store.router_paths['offset'].astype(np.int64)
+        values = store.router_path_hops[(offsets[:, None] + hop[None, :])[inside]].astype(np.int32)
+        paths[inside] = np.where(values == STAR_ROUTER, STAR, values)
+
+    links = directed_links(paths, link_table)
+    expected = hop[None, 1:] < lengths[:, None]
+    complete = ~(paths == STAR).any(axis=1) & ~(expected & (links < 0)).any(axis=1) & (lengths > 0)
+    return links, complete
+
+
+def build_routing_matrix(store, cells=None, pool="cell", index=None):
+    """
+    Sparse routing matrix of the end-to-end RTTs of a set of cells.
+
+    Every traceroute that reached its destination, whose reverse traceroute
+    (dst -> src in the same cell) also reached, and whose two router paths
+    are complete gives one equation: its destination RTT is the sum of the
+    one-way delays of the forward path, of the reverse path and of both
+    host access links (each counted twice, in and out).
+
+    Unknowns are grouped per pool: one delay per directed router link and
+    one per access link for every cell ("cell"), every simulation ("sim")
+    or the whole selection ("all"). Pooling assumes link delays do not
+    change with the OSPF costs, which makes more links identifiable.
+
+    Returns:
+        dict: "matrix" (CSR, equations x groups * columns), "rtt" (ms),
+              "record" and "group" of each equation, "groups" (list of cell
+              id lists), "num_dlinks" and "num_columns" per group
+    """
+    index = build_hop_index() if index is None else index
+    cells = store.live_cells if cells is None else np.asarray(cells, dtype=np.int64)
+    link_table = directed_link_table(index)
+    num_dlinks = 2 * index.num_router_links
+    num_columns = num_dlinks + store.num_hosts
+
+    path_links, path_complete = router_path_links(store, link_table)
+
+    # Group of every selected cell
+    if pool == "cell":
+        keys = cells
+    elif pool == "sim":
+        keys = store.cells['sim'][cells].astype(np.int64)
+    elif pool == "all":
+        keys = np.zeros(len(cells), dtype=np.int64)
+    else:
+        raise ValueError(f"Unknown pool '{pool}'")
+    unique_keys, cell_group = np.unique(keys, return_inverse=True)
+    groups = [cells[cell_group == g].tolist() for g in range(len(unique_keys))]
+
+    # Records of the selected cells and their reverse records
+    first = store.cells['first_record'][cells].astype(np.int64)
+    count = store.cells['num_records'][cells].astype(np.int64)
+    record = np.repeat(first - np.cumsum(count) + count, count) + np.arange(count.sum())
+    group = np.repeat(cell_group, count)
+
+    records = store.records[record]
+    reverse = store.slots[records['cell'], records['dst'].astype(np.int64) * store.num_hosts + records['src']]
+    reverse_records = store.records[np.maximum(reverse, 0)]
+
+    last_hop = store.hops[records['hop_offset'].astype(np.int64) + np.maximum(records['num_hops'], 1) - 1]
+    usable = ((reverse >= 0) & (records['reached'] > 0) & (reverse_records['reached'] > 0) &
+              path_complete[records['router_path']] & path_complete[reverse_records['router_path']] &
+              (records['num_hops'] > 0) & (last_hop['answered'] > 0))
+
+    record, group, records, reverse_records = record[usable], group[usable], records[usable], reverse_records[usable]
+    rtt = last_hop['rtt'][usable].astype(np.float64)
+
+    # Forward and reverse directed links of every equation, plus the access links
+    links = np.concatenate([path_links[records['router_path']], path_links[reverse_records['router_path']]], axis=1)
+    rows, hops = np.nonzero(links >= 0)
+    cols = links[rows, hops].astype(np.int64)
+
+    num_rows = len(record)
+    access_rows = np.concatenate([np.arange(num_rows), np.arange(num_rows)])
+    access_cols = num_dlinks + np.concatenate([records['src'], records['dst']]).astype(np.int64)
+
+    rows = np.concatenate([rows, access_rows])
+    cols = np.concatenate([cols, access_cols])
+    data = np.concatenate([np.ones(len(hops)), np.full(len(access_rows), 2.0)])
+    cols += group[rows] * num_columns
+
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(num_rows, len(groups) * num_columns))
+    matrix.sum_duplicates()
+
+    return {
+        "matrix": matrix,
+        "rtt": rtt,
+        "record": record,
+        "group": group,
+        "groups": groups,
+        "num_dlinks": num_dlinks,
+        "num_columns": num_columns,
+    }
+
+
+def solve_link_delays(system, solver="nnls", damp=0.0):
+    """
+    Solve a routing system from build_routing_matrix() for all groups at once
+    (the matrix is block diagonal, so one sparse solve covers the whole sweep).
+
+    Args:
+        system: Output of build_routing_matrix()
+        solver: "lsq" (LSQR, minimum-norm least squares) or "nnls" (bounded to >= 0)
+        damp: Tikhonov damping of the LSQR solver
+
+    Returns:
+        dict: "link_delay" [groups, directed links] and "access_delay" [groups, hosts]
+              one-way estimates in ms (NaN where no equation covers the link),
+              "observed" mask, "residual_rms" [groups] and "equations" [groups]
+    """
+    matrix, rtt = system["matrix"], system["rtt"]
+    num_groups = len(system["groups"])
+    num_columns, num_dlinks = system["num_columns"], system["num_dlinks"]
+
+    if matrix.shape[0] == 0:
+        estimate = np.zeros(matrix.shape[1])
+    elif solver == "lsq":
+        estimate = lsqr(matrix, rtt, damp=damp)[0]
+    elif solver == "nnls":
+        estimate = lsq_linear(matrix, rtt, bounds=(0, np.inf), lsq_solver='lsmr').x
+    else:
+        raise ValueError(f"Unknown solver '{solver}'")
+
+    observed = np.diff(matrix.tocsc().indptr) > 0
+    estimate = np.where(observed, estimate, np.nan).reshape(num_groups, num_columns)
+    observed = observed.reshape(num_groups, num_columns)
+
+    residual = matrix @ np.nan_to_num(estimate.ravel()) - rtt
+    equations = np.bincount(system["group"], minlength=num_groups)
+    sq_error = np.bincount(system["group"], weights=residual ** 2, minlength=num_groups)
+
+    return {
+        "link_delay": estimate[:, :num_dlinks],
+        "access_delay": estimate[:, num_dlinks:],
+        "observed": observed,
+        "residual_rms": np.sqrt(sq_error / np.maximum(equations, 1)),
+        "equations": equations,
+    }
+
+
+def save_link_delays(filename, store, system, result, index):
+    """Write the directed link delay estimates as CSV, one row per group and link."""
+    links = index.links[:index.num_router_links]
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["cells", "from", "to", "delay_ms"])
+        for g, cells in enumerate(system["groups"]):
+            label = ";".join(f"{store.sims[store.cells[c]['sim']]}:{int(store.cells[c]['percentage'])}"
+                             for c in cells)
+            for dlink, delay in enumerate(result["link_delay"][g]):
+                rA, rB = links[dlink // 2]
+                u, v = (rA, rB) if dlink % 2 == 0 else (rB, rA)
+                writer.writerow([label, u, v, "" if np.isnan(delay) else f"{delay:.4f}"])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Least-squares link delay tomography over a packed corpus store',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('store_dir', type=str, help='Corpus store directory (see corpus_store.py)')
+    parser.add_argument('--solver', choices=['lsq', 'nnls'], default='nnls', help='Sparse solver')
+    parser.add_argument('--pool', choices=['cell', 'sim', 'all'], default='cell',
+                        help='Share link delay unknowns per cell, per simulation or across everything')
+    parser.add_argument('--damp', type=float, default=0.0, help='LSQR damping')
+    parser.add_argument('--output', type=str, help='Write link delay estimates to this CSV file')
+    args = parser.parse_args()
+
+    hop_index = build_hop_index()
+    corpus = CorpusStore(args.store_dir)
+
+    start = time.perf_counter()
+    routing = build_routing_matrix(corpus, pool=args.pool, index=hop_index)
+    built = time.perf_counter()
+    delays = solve_link_delays(routing, solver=args.solver, damp=args.damp)
+    solved = time.perf_counter()
+
+    print(f"{routing['matrix'].shape[0]} equations, {routing['matrix'].shape[1]} unknowns, "
+          f"{len(routing['groups'])} groups: built in {built - start:.3f} s, solved in {solved - built:.3f} s")
+    print(f"Observed directed links per group: {delays['observed'][:, :routing['num_dlinks']].sum(axis=1).mean():.1f}"
+          f" / {routing['num_dlinks']}, mean residual RMS {delays['residual_rms'].mean():.4f} ms")
+
+    if args.output:
+        save_link_delays(args.output, corpus, routing, delays, hop_index)
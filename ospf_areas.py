@@ -0,0 +1,466 @@
+#!/usr/bin/python3
+"""
+Hierarchical OSPF area assignment.
+
+Splits a topology into OSPF areas, per tier (topology_spec.ROUTER_TIERS) or
+per site group (the sites of generate_site_topology(), or regions grown
+around the host-attached routers). Links inside a group belong to the
+group's area and links between groups to the backbone (area 0), which is
+made contiguous if needed. Routers on both sides are the ABRs.
+Non-backbone areas can be stub or totally stubby.
+
+The plan drives the FRR configuration (topo_runner.create_frr_configs()),
+the area-aware path prediction (predict_area_paths(), used by
+path_predictor.predict_router_paths(areas=...)) and the convergence check.
+Every ospfd then floods and runs SPF over its own areas only, plus one
+summary per prefix of the other areas (none in totally stubby areas).
+"""
+
+import argparse
+from collections import deque
+
+from path_predictor import shortest_path_dag, edge_router_map
+from topology_spec import ROUTER_LINKS, HOST_ROUTER_LINKS, ROUTER_TIERS, generate_site_topology
+
+
+BACKBONE = 0
+
+STUB_TYPES = ("stub", "totally-stubby")
+
+# Site mode default: one area per this many routers
+ROUTERS_PER_SITE = 25
+
+# Cost of the default summary an ABR injects into a stub area (FRR default)
+DEFAULT_COST = 1
+
+
+def _router_key(router):
+    return int(router[1:])
+
+
+def _adjacency(router_links):
+    adjacency = {}
+    for rA, rB, _, _, _, _ in router_links:
+        adjacency.setdefault(rA, set()).add(rB)
+        adjacency.setdefault(rB, set()).add(rA)
+    return adjacency
+
+
+def _bfs_distances(adjacency, sources):
+    distance = {source: 0 for source in sources}
+    queue = deque(sources)
+    while queue:
+        u = queue.popleft()
+        for v in adjacency.get(u, ()):
+            if v not in distance:
+                distance[v] = distance[u] + 1
+                queue.append(v)
+    return distance
+
+
+def site_groups(router_links=None, host_router_links=None, num_groups=None):
+    """
+    Group routers into connected sites: seeds are host-attached routers
+    spread by farthest-point sampling, and every router joins the site of
+    its nearest seed (fewest hops, ties to the earlier seed).
+
+    Args:
+        router_links: Router-to-router link table (default: topology_spec.ROUTER_LINKS)
+        host_router_links: Host-router link table (default: topology_spec.HOST_ROUTER_LINKS)
+        num_groups: Number of sites (default: one per ROUTERS_PER_SITE routers, at least 2)
+
+    Returns:
+        dict: router -> site number (1..num_groups)
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+
+    adjacency = _adjacency(router_links)
+    routers = sorted(adjacency, key=_router_key)
+    if num_groups is None:
+        num_groups = max(2, len(routers) // ROUTERS_PER_SITE)
+    candidates = sorted({r for _, r, _, _ in host_router_links if r in adjacency}, key=_router_key) or routers
+
+    seeds = [candidates[0]]
+    distance = _bfs_distances(adjacency, seeds)
+    while len(seeds) < min(num_groups, len(candidates)):
+        farthest = max(candidates, key=lambda r: (distance.get(r, 0), -_router_key(r)))
+        if distance.get(farthest, 0) == 0:
+            break
+        seeds.append(farthest)
+        distance = _bfs_distances(adjacency, seeds)
+
+    groups = {seed: number for number, seed in enumerate(seeds, 1)}
+    queue = deque(seeds)
+    while queue:
+        u = queue.popleft()
+        for v in sorted(adjacency[u], key=_router_key):
+            if v not in groups:
+                groups[v] = groups[u]
+                queue.append(v)
+
+    return groups
+
+
+def _components(links):
+    """Connected components (sets of routers) of a list of (rA, rB) links."""
+    parent = {}
+
+    def find(r):
+        parent.setdefault(r, r)
+        while parent[r] != r:
+            parent[r] = parent[parent[r]]
+            r = parent[r]
+        return r
+
+    for rA, rB in links:
+        parent[find(rA)] = find(rB)
+
+    components = {}
+    for r in parent:
+        components.setdefault(find(r), set()).add(r)
+    return list(components.values())
+
+
+def _connect_backbone(router_links, link_areas):
+    """Move links on shortest hop paths into area 0 until it is contiguous."""
+    adjacency = _adjacency(router_links)
+    link_index = {}
+    for i, (rA, rB, _, _, _, _) in enumerate(router_links):
+        link_index[(rA, rB)] = link_index[(rB, rA)] = i
+
+    while True:
+        components = _components([(l[0], l[1]) for l, area in zip(router_links, link_areas) if area == BACKBONE])
+        if len(components) <= 1:
+            return
+
+        # Shortest path from the first component to any other backbone router
+        start = components[0]
+        others = set().union(*components[1:])
+        previous = {r: None for r in start}
+        queue = deque(sorted(start, key=_router_key))
+        end = None
+        while queue and end is None:
+            u = queue.popleft()
+            for v in sorted(adjacency[u], key=_router_key):
+                if v not in previous:
+                    previous[v] = u
+                    if v in others:
+                        end = v
+                        break
+                    queue.append(v)
+
+        while previous[end] is not None:
+            link_areas[link_index[(previous[end], end)]] = BACKBONE
+            end = previous[end]
+
+
+def area_plan(mode="tier", router_links=None, host_router_links=None, stub=None, num_groups=None, groups=None):
+    """
+    Assign every router interface to an OSPF area.
+
+    Args:
+        mode: "tier" (groups from tiers) or "site" (see site_groups())
+        router_links: Router-to-router link table
+        host_router_links: Host-router link table
+        stub: None, "stub" or "totally-stubby" for every non-backbone area
+        num_groups: Number of derived site groups (site mode)
+        groups: router -> tier or site of the topology spec (default:
+                topology_spec.ROUTER_TIERS in tier mode, site_groups() in site mode)
+
+    Returns:
+        dict: {"mode", "stub", "interface_areas": "router.interface" -> area}
+
+    Raises:
+        ValueError: For an unknown mode or stub type, or routers without a group
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+    if stub is not None and stub not in STUB_TYPES:
+        raise ValueError(f"unknown stub area type: {stub}")
+
+    if mode == "tier":
+        groups = ROUTER_TIERS if groups is None else groups
+    elif mode == "site":
+        groups = site_groups(router_links, host_router_links, num_groups) if groups is None else groups
+    else:
+        raise ValueError(f"unknown area mode: {mode}")
+
+    missing = set(_adjacency(router_links)) - set(groups)
+    if missing:
+        raise ValueError(f"routers without a {mode}: {', '.join(sorted(missing, key=_router_key))}")
+
+    if len(set(groups.values())) <= 1:
+        link_areas = [BACKBONE] * len(router_links)
+    else:
+        link_areas = [groups[rA] if groups[rA] == groups[rB] else BACKBONE
+                      for rA, rB, _, _, _, _ in router_links]
+        _connect_backbone(router_links, link_areas)
+
+        # Areas cut in pieces by the backbone become separate areas
+        next_area = max(link_areas) + 1
+        for area in sorted(set(link_areas) - {BACKBONE}):
+            links = [i for i, a in enumerate(link_areas) if a == area]
+            for piece in _components([(router_links[i][0], router_links[i][1]) for i in links])[1:]:
+                for i in links:
+                    if router_links[i][0] in piece:
+                        link_areas[i] = next_area
+                next_area += 1
+
+    interface_areas = {}
+    home_area = {}
+    for (rA, rB, intfA, intfB, _, _), area in zip(router_links, link_areas):
+        interface_areas[f"{rA}.{intfA}"] = interface_areas[f"{rB}.{intfB}"] = area
+        for router in (rA, rB):
+            if area != BACKBONE:
+                home_area.setdefault(router, area)
+
+    # Host subnets join their router's area (area 0 for pure backbone routers)
+    for _, router, interface, _ in host_router_links:
+        interface_areas[f"{router}.{interface}"] = home_area.get(router, BACKBONE)
+
+    return {"mode": mode, "stub": stub, "interface_areas": interface_areas}
+
+
+def router_areas(plan):
+    """router -> set of the areas of its interfaces."""
+    areas = {}
+    for key, area in plan["interface_areas"].items():
+        areas.setdefault(key.split('.', 1)[0], set()).add(area)
+    return areas
+
+
+def area_border_routers(plan):
+    """Routers attached to the backbone and to at least one other area."""
+    return sorted((r for r, areas in router_areas(plan).items() if BACKBONE in areas and len(areas) > 1),
+                  key=_router_key)
+
+
+def ospf_area_lines(plan, router):
+    """
+    "router ospf" lines of one router for its stub areas
+    ("no-summary" on the ABRs of totally stubby areas).
+    """
+    if not plan.get("stub"):
+        return []
+    areas = router_areas(plan).get(router, set())
+    summary = " no-summary" if plan["stub"] == "totally-stubby" and BACKBONE in areas else ""
+    return [f" area {area} stub{summary}" for area in sorted(areas - {BACKBONE})]
+
+
+def describe_plan(plan):
+    """Summary of an area plan for metadata files."""
+    areas = router_areas(plan)
+    members = {}
+    for router, router_area_set in areas.items():
+        for area in router_area_set:
+            members.setdefault(area, []).append(router)
+    return {
+        "mode": plan["mode"],
+        "stub": plan["stub"],
+        "areas": {str(area): sorted(routers, key=_router_key) for area, routers in sorted(members.items())},
+        "abrs": area_border_routers(plan),
+    }
+
+
+def expected_ospf_routes(plan, host_router_links=None):
+    """
+    OSPF routes each router has once converged: every other host subnet,
+    except that non-ABR routers of totally stubby areas only learn their own
+    areas' subnets; routers of stub areas also get a "default" route.
+
+    Returns:
+        dict: router -> set of "a.b.c.0/24" prefixes (and "default")
+    """
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+    areas = router_areas(plan)
+    subnets = {}
+    for _, router, interface, ip in host_router_links:
+        subnets[ip.rsplit('.', 1)[0] + '.0/24'] = plan["interface_areas"][f"{router}.{interface}"]
+    own = {router: ip.rsplit('.', 1)[0] + '.0/24' for _, router, _, ip in host_router_links}
+
+    expected = {}
+    for router, router_area_set in areas.items():
+        stub_member = plan.get("stub") and BACKBONE not in router_area_set
+        if stub_member and plan["stub"] == "totally-stubby":
+            routes = {subnet for subnet, area in subnets.items() if area in router_area_set}
+        else:
+            routes = set(subnets)
+        routes.discard(own.get(router))
+        if stub_member:
+            routes.add("default")
+        expected[router] = routes
+    return expected
+
+
+def predict_area_paths(ospf_costs, plan, pairs=None, router_links=None, host_router_links=None, max_paths=64):
+    """
+    predict_router_paths() under OSPF area rules: intra-area routes win over
+    inter-area ones. Routers outside the destination's area reach it through
+    the backbone ABRs attached to that area, and non-backbone routers through
+    the ABRs of their own area. In totally stubby areas, traffic leaves
+    through the ABR closest by its default route.
+
+    Returns:
+        dict: (src, dst) -> sorted list of equal-cost router tuples
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+    interface_areas = plan["interface_areas"]
+
+    edge = edge_router_map(host_router_links)
+    if pairs is None:
+        hosts = sorted(edge)
+        pairs = [(s, d) for s in hosts for d in hosts if s != d]
+    prefix_area = {router: interface_areas[f"{router}.{interface}"] for _, router, interface, _ in host_router_links}
+
+    graphs = {}
+    reverse = {}
+    for rA, rB, intfA, intfB, _, _ in router_links:
+        area = interface_areas[f"{rA}.{intfA}"]
+        for u, v, cost in ((rA, rB, ospf_costs.get(f"{rA}.{intfA}", 1)), (rB, rA, ospf_costs.get(f"{rB}.{intfB}", 1))):
+            graphs.setdefault(area, {}).setdefault(u, []).append((v, cost))
+            reverse.setdefault(area, {}).setdefault(v, []).append((u, cost))
+
+    areas = router_areas(plan)
+    abrs = area_border_routers(plan)
+    totally_stubby = plan.get("stub") == "totally-stubby"
+    distances = {}
+    routes = {}
+
+    def distance_to(area, target):
+        """Distances of every router of an area to target, inside the area."""
+        if (area, target) not in distances:
+            distances[(area, target)] = shortest_path_dag(reverse.get(area, {}), target)[0]
+        return distances[(area, target)]
+
+    def route(u, d):
+        """(cost, [(area, target)]) of u's best routes to the subnet of router d."""
+        if (u, d) in routes:
+            return routes[(u, d)]
+        infinity = float('inf')
+        dst_area = prefix_area[d]
+
+        if dst_area in areas[u]:
+            result = (distance_to(dst_area, d).get(u, infinity), [(dst_area, d)])
+        else:
+            if BACKBONE in areas[u]:
+                area = BACKBONE
+                candidates = [(distance_to(BACKBONE, c).get(u, infinity) + distance_to(dst_area, d).get(c, infinity), c)
+                              for c in abrs if dst_area in areas[c]]
+            else:
+                area = min(areas[u])
+                exits = [b for b in abrs if area in areas[b]]
+                if totally_stubby:
+                    candidates = [(distance_to(area, b).get(u, infinity) + DEFAULT_COST, b) for b in exits]
+                else:
+                    candidates = [(distance_to(area, b).get(u, infinity) + route(b, d)[0], b) for b in exits]
+            best = min((cost for cost, _ in candidates), default=infinity)
+            result = (best, [(area, t) for cost, t in candidates if cost == best < infinity])
+
+        routes[(u, d)] = result
+        return result
+
+    def next_hops(u, d):
+        hops = set()
+        for area, target in route(u, d)[1]:
+            dist = distance_to(area, target)
+            for v, cost in graphs[area].get(u, ()):
+                if v in dist and cost + dist[v] == dist[u]:
+                    hops.add(v)
+        return sorted(hops, key=_router_key)
+
+    predicted = {}
+    for src, dst in pairs:
+        r_src, r_dst = edge[src], edge[dst]
+        paths = []
+        stack = [(r_src, (r_src,))]
+        while stack and len(paths) < max_paths:
+            node, prefix = stack.pop()
+            if node == r_dst:
+                paths.append(prefix)
+                continue
+            for v in next_hops(node, r_dst):
+                if v not in prefix:
+                    stack.append((v, prefix + (v,)))
+        predicted[(src, dst)] = sorted(paths)
+
+    return predicted
+
+
+def lsdb_sizes(plan, router_links=None, host_router_links=None):
+    """
+    Per-router LSDB estimate: the routers of its areas (the SPF graph, one
+    router LSA each) plus one summary LSA per subnet outside each of its
+    areas (a single default summary in a totally stubby area).
+
+    Returns:
+        dict: router -> {"spf_routers", "lsas"}
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+    interface_areas = plan["interface_areas"]
+    areas = router_areas(plan)
+
+    members = {}
+    subnets = {}
+    for router, router_area_set in areas.items():
+        for area in router_area_set:
+            members.setdefault(area, set()).add(router)
+    for rA, rB, intfA, _, _, _ in router_links:
+        subnets.setdefault(interface_areas[f"{rA}.{intfA}"], set()).add((rA, rB))
+    for _, router, interface, ip in host_router_links:
+        subnets.setdefault(interface_areas[f"{router}.{interface}"], set()).add(ip)
+    total_subnets = sum(len(s) for s in subnets.values())
+
+    sizes = {}
+    for router, router_area_set in areas.items():
+        spf_routers = sum(len(members[area]) for area in router_area_set)
+        summaries = 0
+        for area in router_area_set:
+            if area != BACKBONE and plan.get("stub") == "totally-stubby":
+                summaries += 1
+            elif len(members) > 1:
+                summaries += total_subnets - len(subnets.get(area, ()))
+        sizes[router] = {"spf_routers": spf_routers, "lsas": spf_routers + summaries}
+    return sizes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Plan OSPF areas for the topology (or a generated one) and optionally write the FRR configurations',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--mode', choices=['tier', 'site'], default='tier', help='Area grouping')
+    parser.add_argument('--stub', choices=STUB_TYPES, help='Make every non-backbone area stub or totally stubby')
+    parser.add_argument('--site-groups', type=int, help='Number of derived site groups (site mode)')
+    parser.add_argument('--num-sites', type=int, help='Plan a generated site topology with this many sites (site mode)')
+    parser.add_argument('--routers-per-site', type=int, default=20, help='Routers per site of the generated topology')
+    parser.add_argument('--num-hosts', type=int, default=50, help='Hosts of the generated topology')
+    parser.add_argument('--seed', type=int, default=42, help='Seed of the generated topology')
+    parser.add_argument('--config-dir', type=str, help='Write the FRR configurations here')
+    args = parser.parse_args()
+
+    router_links, host_router_links, groups = ROUTER_LINKS, HOST_ROUTER_LINKS, None
+    if args.num_sites:
+        router_links, host_router_links, _, groups = generate_site_topology(
+            args.num_sites, args.routers_per_site, num_hosts=args.num_hosts, seed=args.seed)
+
+    plan = area_plan(args.mode, router_links, host_router_links, args.stub, args.site_groups,
+                     groups if args.mode == 'site' else None)
+    summary = describe_plan(plan)
+    sizes = lsdb_sizes(plan, router_links, host_router_links)
+    internal = [size for router, size in sizes.items() if router not in summary["abrs"]] or list(sizes.values())
+
+    print(f"Areas: {len(summary['areas'])}, ABRs: {len(summary['abrs'])}")
+    for area, routers in summary["areas"].items():
+        print(f"  area {area}: {len(routers)} routers")
+    print(f"Largest SPF graph: {max(s['spf_routers'] for s in sizes.values())} routers "
+          f"(single area: {len(sizes)})")
+    print(f"Largest LSDB: {max(s['lsas'] for s in internal)} LSAs on internal routers, "
+          f"{max(s['lsas'] for s in sizes.values())} overall")
+
+    if args.config_dir:
+        from topo_runner import create_frr_configs
+        create_frr_configs(None, args.config_dir, plan, router_links, host_router_links)
+        print(f"FRR configurations written to {args.config_dir}")
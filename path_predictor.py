@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+
+import heapq
+
+from topology_spec import ROUTER_LINKS, HOST_ROUTER_LINKS, HOSTS
+
+
+def build_directed_graph(ospf_costs, router_links=None):
+    """
+    Build the directed OSPF graph for a cost table.
+    The cost of A->B is the cost configured on A's interface towards B;
+    interfaces missing from the table keep the default cost 1.
+
+    Args:
+        ospf_costs: Dictionary with "router.interface" keys and OSPF costs as values
+        router_links: Router-to-router link table (default: topology_spec.ROUTER_LINKS)
+
+    Returns:
+        dict: router -> list of (neighbor, cost)
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    graph = {}
+
+    for rA, rB, intfA, intfB, _, _ in router_links:
+        graph.setdefault(rA, []).append((rB, ospf_costs.get(f"{rA}.{intfA}", 1)))
+        graph.setdefault(rB, []).append((rA, ospf_costs.get(f"{rB}.{intfB}", 1)))
+
+    return graph
+
+
+def shortest_path_dag(graph, source):
+    """
+    Dijkstra from source keeping every equal-cost predecessor.
+
+    Returns:
+        tuple: (distances, predecessors) where predecessors[v] lists all
+               neighbors u with dist[u] + cost(u, v) == dist[v]
+    """
+    dist = {source: 0}
+    preds = {source: []}
+    heap = [(0, source)]
+    done = set()
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+
+        for v, cost in graph.get(u, ()):
+            nd = d + cost
+            if v not in dist or nd < dist[v]:
+                dist[v] = nd
+                preds[v] = [u]
+                heapq.heappush(heap, (nd, v))
+            elif nd == dist[v] and u not in preds[v]:
+                preds[v].append(u)
+
+    return dist, preds
+
+
+def enumerate_paths(preds, source, target, max_paths=64):
+    """
+    Enumerate the equal-cost router paths from source to target
+    encoded in a predecessor DAG.
+
+    Returns:
+        list: Router tuples from source to target (at most max_paths)
+    """
+    if target not in preds:
+        return []
+
+    paths = []
+    stack = [(target, (target,))]
+    while stack and len(paths) < max_paths:
+        node, suffix = stack.pop()
+        if node == source:
+            paths.append(suffix)
+            continue
+        for p in preds[node]:
+            stack.append((p, (p,) + suffix))
+
+    return sorted(paths)
+
+
+def edge_router_map(host_router_links=None):
+    """Map every host to the edge router it is attached to."""
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+    return {hname: rname for hname, rname, _, _ in host_router_links}
+
+
+def predict_router_paths(ospf_costs, pairs=None, router_links=None, host_router_links=None,
+                         max_paths=64, areas=None):
+    """
+    Predict the forward router-level paths between hosts for a cost table.
+
+    Args:
+        ospf_costs: Dictionary with "router.interface" keys and OSPF costs as values
+        pairs: Iterable of (src_host, dst_host); default is every ordered host pair
+        router_links: Router-to-router link table
+        host_router_links: Host-router link table
+        max_paths: Upper bound on enumerated ECMP paths per pair
+        areas: OSPF area plan (see ospf_areas.area_plan()); default is a single area
+
+    Returns:
+        dict: (src, dst) -> sorted list of equal-cost router tuples
+    """
+    if areas is not None:
+        from ospf_areas import predict_area_paths
+        return predict_area_paths(ospf_costs, areas, pairs, router_links, host_router_links, max_paths)
+
+    edge = edge_router_map(host_router_links)
+    if pairs is None:
+        hosts = sorted(edge)
+        pairs = [(s, d) for s in hosts for d in hosts if s != d]
+
+    graph = build_directed_graph(ospf_costs, router_links)
+    dags = {}
+    predicted = {}
+
+    for src, dst in pairs:
+        r_src, r_dst = edge[src], edge[dst]
+        if r_src not in dags:
+            dags[r_src] = shortest_path_dag(graph, r_src)
+        _, preds = dags[r_src]
+        predicted[(src, dst)] = enumerate_paths(preds, r_src, r_dst, max_paths)
+
+    return predicted
+
+
+def interface_owner_map(router_links=None, host_router_links=None):
+    """
+    Map every router interface address to its router name.
+    Used to turn traceroute hop addresses into router-level paths.
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+
+    owners = {}
+    for rA, rB, _, _, ipA, ipB in router_links:
+        owners[ipA.split('/')[0]] = rA
+        owners[ipB.split('/')[0]] = rB
+    for _, rname, _, ip in host_router_links:
+        owners[ip.split('/')[0]] = rname
+
+    return owners
+
+
+def host_address_map(hosts=None):
+    """Map every host address to its host name."""
+    hosts = HOSTS if hosts is None else hosts
+    return {ip.split('/')[0]: name for name, (ip, _) in hosts.items()}
@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+
+import time
+
+from path_predictor import predict_router_paths, interface_owner_map, host_address_map
+from traceroute_parser import (parse_traceroute_text, split_traceroute_blocks,
+                               write_traceroute_blocks)
+
+
+# Statuses that count as agreement between prediction and observation
+AGREEING_STATUSES = ("match", "ecmp_match")
+
+# Statuses that trigger a targeted re-trace of the pair
+RETRACE_STATUSES = ("mismatch", "incomplete", "star_hops")
+
+
+def observed_router_path(hops, dst_ip, owners):
+    """
+    Convert parsed traceroute hops into a router-level path.
+
+    Args:
+        hops: Hop dictionaries from traceroute_parser
+        dst_ip: Address of the destination host
+        owners: Interface address -> router name (see interface_owner_map())
+
+    Returns:
+        dict: {"routers": list with None for '*' hops, "reached": bool,
+               "unknown_ips": addresses not owned by any router,
+               "multi_router_hops": TTLs answered by more than one router}
+    """
+    routers = []
+    unknown = []
+    multi = []
+    reached = False
+
+    for hop in hops:
+        if hop["ip"] == dst_ip:
+            reached = True
+            break
+        if hop["ip"] is None:
+            routers.append(None)
+            continue
+
+        owner = owners.get(hop["ip"])
+        if owner is None:
+            unknown.append(hop["ip"])
+        routers.append(owner)
+
+        hop_owners = {owners.get(ip) for ip in hop["ips"] if ip != dst_ip}
+        if len(hop_owners) > 1:
+            multi.append(hop["ttl"])
+
+    return {"routers": routers, "reached": reached, "unknown_ips": unknown, "multi_router_hops": multi}
+
+
+def _consistent_with(observed, path):
+    """True if observed (None = unknown hop) can be the router path 'path'."""
+    return len(observed) == len(path) and all(o is None or o == p for o, p in zip(observed, path))
+
+
+def classify_pair(observed, predicted_paths):
+    """
+    Compare an observed router path against the SPF-predicted equal-cost paths.
+
+    Returns:
+        str: One of "match", "ecmp_match", "ecmp_divergence", "star_hops",
+             "incomplete" or "mismatch"
+    """
+    routers = observed["routers"]
+
+    if observed["unknown_ips"] or not predicted_paths:
+        return "mismatch"
+    if not observed["reached"]:
+        return "incomplete"
+    if observed["multi_router_hops"]:
+        return "ecmp_divergence"
+    if None in routers:
+        if any(_consistent_with(routers, p) for p in predicted_paths):
+            return "star_hops"
+        return "mismatch"
+    if tuple(routers) in predicted_paths:
+        return "match" if len(predicted_paths) == 1 else "ecmp_match"
+    return "mismatch"
+
+
+def verify_traceroutes(traceroutes, ospf_costs, owners=None, host_addresses=None, areas=None):
+    """
+    Verify parsed traceroutes against the paths predicted for a cost table.
+
+    Args:
+        traceroutes: (src, dst) -> hops, as returned by parse_traceroute_text()
+        ospf_costs: Dictionary with "router.interface" keys and the applied OSPF costs
+        owners: Interface address -> router name
+        host_addresses: Host address -> host name
+        areas: OSPF area plan of the cell (see ospf_areas.area_plan())
+
+    Returns:
+        dict: Cell report with agreement score, per-status counts,
+              flagged pairs and the pairs that should be re-traced
+    """
+    owners = interface_owner_map() if owners is None else owners
+    host_addresses = host_address_map() if host_addresses is None else host_addresses
+    host_ips = {name: ip for ip, name in host_addresses.items()}
+
+    predicted = predict_router_paths(ospf_costs, pairs=list(traceroutes), areas=areas)
+
+    status_counts = {}
+    flagged = {}
+    to_retrace = []
+
+    for (src, dst), hops in traceroutes.items():
+        observed = observed_router_path(hops, host_ips.get(dst), owners)
+        status = classify_pair(observed, predicted[(src, dst)])
+        status_counts[status] = status_counts.get(status, 0) + 1
+
+        if status not in AGREEING_STATUSES:
+            flagged[f"{src}->{dst}"] = {
+                "status": status,
+                "observed": observed["routers"],
+                "predicted": [list(p) for p in predicted[(src, dst)]],
+            }
+        if status in RETRACE_STATUSES:
+            to_retrace.append((src, dst))
+
+    pairs_checked = len(traceroutes)
+    agreeing = sum(status_counts.get(s, 0) for s in AGREEING_STATUSES)
+
+    return {
+        "pairs_checked": pairs_checked,
+        "agreement": agreeing / pairs_checked if pairs_checked else 0.0,
+        "status_counts": status_counts,
+        "flagged": flagged,
+        "pairs_to_retrace": to_retrace,
+    }
+
+
+def verify_traceroute_file(filename, ospf_costs, areas=None):
+    """Verify a traceroutes_asymmetry_Xpercent.txt file (see verify_traceroutes())."""
+    with open(filename, 'r') as f:
+        return verify_traceroutes(parse_traceroute_text(f.read()), ospf_costs, areas=areas)
+
+
+def replace_traceroute_blocks(filename, new_outputs):
+    """
+    Replace the raw output of some pairs in a collected traceroute file,
+    keeping every other block and the file order unchanged.
+
+    Args:
+        filename: Traceroute file
+        new_outputs: (src, dst) -> raw traceroute output
+    """
+    with open(filename, 'r') as f:
+        blocks = split_traceroute_blocks(f.read())
+
+    blocks = [(src, dst, new_outputs.get((src, dst), output)) for src, dst, output in blocks]
+    write_traceroute_blocks(filename, blocks)
+
+
+def verify_and_retrace(filename, ospf_costs, trace_pair, max_rounds=2, retrace_wait=10, sleep=time.sleep,
+                       areas=None):
+    """
+    Verify a cell and re-trace only the pairs that disagree with the prediction,
+    e.g. because OSPF had not fully converged when they were traced.
+
+    Args:
+        filename: Traceroute file of the cell
+        ospf_costs: Cost table applied to the cell
+        trace_pair: Callable (src, dst) -> raw traceroute output
+        max_rounds: Maximum number of re-trace rounds
+        retrace_wait: Seconds to wait before each round
+        sleep: Function used to wait (e.g. an emulation backend's sleep)
+        areas: OSPF area plan of the cell (see ospf_areas.area_plan())
+
+    Returns:
+        dict: Final report of verify_traceroutes() plus re-trace bookkeeping
+    """
+    report = verify_traceroute_file(filename, ospf_costs, areas)
+    initial_agreement = report["agreement"]
+    retraced = set()
+    rounds = 0
+
+    while report["pairs_to_retrace"] and rounds < max_rounds:
+        sleep(retrace_wait)
+        pairs = report["pairs_to_retrace"]
+        replace_traceroute_blocks(filename, {(src, dst): trace_pair(src, dst) for src, dst in pairs})
+        retraced.update(pairs)
+        rounds += 1
+        report = verify_traceroute_file(filename, ospf_costs, areas)
+
+    report["initial_agreement"] = initial_agreement
+    report["retrace_rounds"] = rounds
+    report["retraced_pairs"] = sorted(f"{src}->{dst}" for src, dst in retraced)
+    del report["pairs_to_retrace"]
+
+    return report
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+
+import argparse
+import heapq
+import json
+
+from cost_models import cost_table_for_cell
+from path_predictor import predict_router_paths
+from topology_spec import ROUTER_LINKS, baseline_ospf_costs
+
+
+def pair_link_coverage(predicted):
+    """
+    Directed router links a traceroute of each pair is guaranteed to cross.
+    With ECMP only the links shared by every equal-cost path are counted,
+    since the probe may take any of them.
+
+    Args:
+        predicted: (src, dst) -> list of router tuples (predict_router_paths() output)
+
+    Returns:
+        dict: (src, dst) -> frozenset of (router_from, router_to)
+    """
+    coverage = {}
+    for pair, paths in predicted.items():
+        link_sets = [set(zip(path[:-1], path[1:])) for path in paths]
+        coverage[pair] = frozenset(set.intersection(*link_sets)) if link_sets else frozenset()
+    return coverage
+
+
+def greedy_probe_plan(coverage, redundancy=1):
+    """
+    Greedy set cover of the directed links by host pairs.
+
+    Every link must be crossed by min(redundancy, pairs able to cover it)
+    planned pairs. At each step the pair covering the most still-needed
+    links is chosen; ties go to the first pair in sorted order.
+
+    Args:
+        coverage: (src, dst) -> set of directed links (see pair_link_coverage())
+        redundancy: Number of distinct planned pairs wanted per link
+
+    Returns:
+        list: Planned (src, dst) pairs in selection order
+    """
+    demand = {}
+    for links in coverage.values():
+        for link in links:
+            demand[link] = demand.get(link, 0) + 1
+    demand = {link: min(redundancy, count) for link, count in demand.items()}
+
+    # Lazy greedy: gains only shrink as links get covered, so a popped pair
+    # whose recomputed gain still beats the next best stale gain is the best
+    heap = [(-len(links), pair) for pair, links in sorted(coverage.items()) if links]
+    heapq.heapify(heap)
+    plan = []
+
+    while heap:
+        _, pair = heapq.heappop(heap)
+        gain = sum(1 for link in coverage[pair] if demand[link] > 0)
+        if gain == 0:
+            continue
+        if heap and heap[0] < (-gain, pair):
+            heapq.heappush(heap, (-gain, pair))
+            continue
+
+        plan.append(pair)
+        for link in coverage[pair]:
+            if demand[link] > 0:
+                demand[link] -= 1
+
+    return plan
+
+
+def plan_probes(ospf_costs, redundancy=1, router_links=None, host_router_links=None):
+    """
+    Choose a small set of (src, dst) pairs whose predicted paths cover
+    every directed router link of the current cost table.
+
+    Args:
+        ospf_costs: Dictionary with "router.interface" keys and OSPF costs as values
+        redundancy: Number of distinct planned pairs wanted per directed link
+        router_links: Router-to-router link table (default: topology_spec.ROUTER_LINKS)
+        host_router_links: Host-router link table (default: topology_spec.HOST_ROUTER_LINKS)
+
+    Returns:
+        dict: "pairs" (planned pairs), "num_candidate_pairs", "covered_links"
+              and "uncoverable_links" (directed links on no host pair's shortest path)
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    predicted = predict_router_paths(ospf_costs, router_links=router_links,
+                                     host_router_links=host_router_links)
+    coverage = pair_link_coverage(predicted)
+    plan = greedy_probe_plan(coverage, redundancy)
+
+    all_links = {(rA, rB) for rA, rB, _, _, _, _ in router_links} | \
+                {(rB, rA) for rA, rB, _, _, _, _ in router_links}
+    covered = set().union(*(coverage[pair] for pair in plan)) if plan else set()
+
+    return {
+        "pairs": plan,
+        "num_candidate_pairs": len(coverage),
+        "covered_links": len(covered),
+        "uncoverable_links": sorted(all_links - covered),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Plan a coverage-optimal set of traceroute probes for a cost table',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--metadata', type=str,
+                        help='simulation_metadata.json of the run (default: baseline costs)')
+    parser.add_argument('--percentage', type=int, default=0, help='Asymmetry percentage of the cell')
+    parser.add_argument('--redundancy', type=int, default=1, help='Planned pairs wanted per directed link')
+    args = parser.parse_args()
+
+    if args.metadata:
+        with open(args.metadata, 'r') as f:
+            costs = cost_table_for_cell(json.load(f), args.percentage)
+    else:
+        costs = baseline_ospf_costs()
+
+    result = plan_probes(costs, args.redundancy)
+    print(f"{len(result['pairs'])} of {result['num_candidate_pairs']} pairs cover "
+          f"{result['covered_links']} directed links")
+    for src, dst in result["pairs"]:
+        print(f"  {src} -> {dst}")
+    if result["uncoverable_links"]:
+        print(f"On no shortest path: {', '.join(f'{u}->{v}' for u, v in result['uncoverable_links'])}")
@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from corpus_store import CorpusStore
+from hop_index import build_hop_index, ipv4_to_uint32
+from traceroute_corpus import directed_link_table
+
+
+def observed_ip_edges(store, cells=None, index=None):
+    """
+    Interface-level edges seen in the traceroutes of a set of cells:
+    consecutive hops that both answered, excluding the destination host replies.
+
+    Returns:
+        tuple: (cell, ip_u, ip_v) arrays of unique undirected edges (ip_u < ip_v)
+    """
+    index = build_hop_index() if index is None else index
+    cells = store.live_cells if cells is None else np.asarray(cells, dtype=np.int64)
+    host_ips = ipv4_to_uint32([ip for _, ip in index.host_addresses])
+
+    # Edges of every interned hop path, computed once
+    lengths = store.paths['length'].astype(np.int64)
+    max_len = max(int(lengths.max(initial=0)), 2)
+    hop = np.arange(max_len)
+    inside = hop[None, :] < lengths[:, None]
+    paths = np.zeros((len(lengths), max_len), dtype=np.uint32)
+    if inside.any():
+        paths[inside] = store.path_hops[(store.paths['offset'].astype(np.int64)[:, None] + hop[None, :])[inside]]
+    paths[np.isin(paths, host_ips)] = 0
+
+    u, v = paths[:, :-1], paths[:, 1:]
+    path_id, pos = np.nonzero((u != 0) & (v != 0))
+    edge_u = np.minimum(u[path_id, pos], v[path_id, pos]).astype(np.int64)
+    edge_v = np.maximum(u[path_id, pos], v[path_id, pos]).astype(np.int64)
+    edge_start = np.searchsorted(path_id, np.arange(len(lengths) + 1))
+
+    # Distinct paths of every cell, then their edges
+    first = store.cells['first_record'][cells].astype(np.int64)
+    count = store.cells['num_records'][cells].astype(np.int64)
+    record = np.repeat(first - np.cumsum(count) + count, count) + np.arange(count.sum())
+    cell_paths = np.unique(np.stack([store.records['cell'][record].astype(np.int64),
+                                     store.records['path'][record].astype(np.int64)], axis=1), axis=0)
+
+    num_edges = edge_start[cell_paths[:, 1] + 1] - edge_start[cell_paths[:, 1]]
+    edge_cell = np.repeat(cell_paths[:, 0], num_edges)
+    edge_pos = (np.repeat(edge_start[cell_paths[:, 1]] - np.cumsum(num_edges) + num_edges, num_edges) +
+                np.arange(num_edges.sum()))
+
+    edges = np.unique(np.stack([edge_cell, edge_u[edge_pos], edge_v[edge_pos]], axis=1), axis=0)
+    return edges[:, 0], edges[:, 1].astype(np.uint32), edges[:, 2].astype(np.uint32)
+
+
+def resolve_none(ips, index):
+    """No alias resolution: every interface address is its own node."""
+    return ips.astype(np.int64)
+
+
+def resolve_interface_table(ips, index):
+    """Alias resolution through the topology's interface tables (exact)."""
+    return index.router_of(ips).astype(np.int64)
+
+
+def resolve_subnet30(ips, index):
+    """
+    Naive prefix heuristic: addresses of the same /30 are aliases.
+    Merges both ends of every point-to-point link, a false-merge stress case.
+    """
+    return (ips & np.uint32(0xFFFFFFFC)).astype(np.int64)
+
+
+# Fixed algorithm set of the benchmark
+ALGORITHMS = {
+    "interface_table": resolve_interface_table,
+    "no_alias": resolve_none,
+    "subnet30": resolve_subnet30,
+}
+
+
+def true_router_adjacency(index):
+    """Symmetric [routers, routers] adjacency of the ground-truth router links."""
+    return directed_link_table(index) >= 0
+
+
+def score_reconstruction(cell, ip_u, ip_v, resolve, num_cells, index=None):
+    """
+    Score the router graphs reconstructed by an alias resolver in every cell.
+
+    A reconstructed node is the set of addresses the resolver maps to the same
+    label. It is assigned to the true router owning most of its addresses;
+    a node owning addresses of several routers is a false merge, and a router
+    appearing as several nodes is split.
+
+    Args:
+        cell, ip_u, ip_v: Observed interface edges (see observed_ip_edges())
+        resolve: Function mapping a uint32 address array to node labels
+        num_cells: Number of cells (length of the per-cell outputs)
+
+    Returns:
+        dict: Per cell arrays "edges" (reconstructed), "correct_edges",
+              "precision", "recall", "missing_links", "false_merges",
+              "split_routers", and [cells, router links] boolean "found"
+    """
+    index = build_hop_index() if index is None else index
+    adjacency = true_router_adjacency(index)
+    num_routers = index.num_routers
+    link_table = directed_link_table(index)
+
+    # Every observed (cell, address) with its label and true router
+    ips = np.concatenate([ip_u, ip_v])
+    cells = np.concatenate([cell, cell])
+    cell_ip = np.unique(np.stack([cells, ips.astype(np.int64)], axis=1), axis=0)
+    obs_cell, obs_ip = cell_ip[:, 0], cell_ip[:, 1].astype(np.uint32)
+    obs_label = resolve(obs_ip, index)
+    obs_router = index.router_of(obs_ip)
+
+    # Nodes: unique (cell, label); majority true router and false merges
+    nodes, node_of = np.unique(np.stack([obs_cell, obs_label], axis=1), axis=0, return_inverse=True)
+    node_of = node_of.ravel()
+    votes, vote_of = np.unique(np.stack([node_of, obs_router], axis=1), axis=0, return_inverse=True)
+    vote_count = np.bincount(vote_of.ravel(), minlength=len(votes))
+    order = np.lexsort((-vote_count, votes[:, 0]))
+    first_vote = order[np.searchsorted(votes[order, 0], np.arange(len(nodes)))]
+    node_router = votes[first_vote, 1]
+    routers_per_node = np.bincount(votes[:, 0], minlength=len(nodes))
+    false_merges = np.bincount(nodes[routers_per_node > 1, 0], minlength=num_cells)
+
+    # Splits: routers represented by more than one node in a cell
+    known = node_router >= 0
+    cell_router, nodes_per_router = np.unique(np.stack([nodes[known, 0], node_router[known]], axis=1),
+                                              axis=0, return_counts=True)
+    split_routers = np.bincount(cell_router[nodes_per_router > 1, 0], minlength=num_cells)
+
+    # Reconstructed edges between distinct nodes, and their true-router mapping
+    key = cell_ip[:, 0] * (1 << 32) + cell_ip[:, 1]
+    node_u = node_of[np.searchsorted(key, cell * (1 << 32) + ip_u.astype(np.int64))]
+    node_v = node_of[np.searchsorted(key, cell * (1 << 32) + ip_v.astype(np.int64))]
+    keep = node_u != node_v
+    edges = np.unique(np.stack([cell[keep], np.minimum(node_u, node_v)[keep],
+                                np.maximum(node_u, node_v)[keep]], axis=1), axis=0)
+    edge_cell = edges[:, 0]
+    ru, rv = node_router[edges[:, 1]], node_router[edges[:, 2]]
+    valid = (ru >= 0) & (rv >= 0)
+    correct = np.zeros(len(edges), dtype=bool)
+    correct[valid] = adjacency[ru[valid], rv[valid]]
+
+    num_edges = np.bincount(edge_cell, minlength=num_cells)
+    num_correct = np.bincount(edge_cell, weights=correct, minlength=num_cells).astype(np.int64)
+
+    # Recall over the undirected ground-truth router links
+    found = np.zeros((num_cells, index.num_router_links), dtype=bool)
+    found[edge_cell[correct], link_table[ru[correct], rv[correct]] // 2] = True
+    num_found = found.sum(axis=1)
+
+    return {
+        "edges": num_edges,
+        "correct_edges": num_correct,
+        "precision": np.where(num_edges > 0, num_correct / np.maximum(num_edges, 1), 0.0),
+        "recall": num_found / index.num_router_links,
+        "missing_links": index.num_router_links - num_found,
+        "false_merges": false_merges,
+        "split_routers": split_routers,
+        "found": found,
+    }
+
+
+def run_benchmark(store, algorithms=None, repeat=3, index=None):
+    """
+    Score every algorithm of the benchmark set on every cell of the store.
+
+    Timing covers alias resolution and scoring of all cells (best of 'repeat'
+    runs); the edge extraction shared by all algorithms is timed separately.
+
+    Returns:
+        dict: "extract_seconds", and per algorithm name a dict with
+              "seconds" and the score_reconstruction() output
+    """
+    index = build_hop_index() if index is None else index
+    algorithms = ALGORITHMS if algorithms is None else algorithms
+    num_cells = len(store.cells)
+
+    start = time.perf_counter()
+    cell, ip_u, ip_v = observed_ip_edges(store, index=index)
+    results = {"extract_seconds": time.perf_counter() - start}
+
+    for name, resolve in algorithms.items():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scores = score_reconstruction(cell, ip_u, ip_v, resolve, num_cells, index)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {"seconds": best, "scores": scores}
+
+    return results
+
+
+def summarize_benchmark(store, results):
+    """
+    Summary rows per algorithm and cost model (mean over cells).
+
+    Returns:
+        list: Row dictionaries
+    """
+    cost_model = np.array([store.sim_metadata.get(store.sims[c['sim']], {}).get("cost_model", "unknown")
+                           for c in store.cells], dtype=object)
+    rows = []
+
+    for name, result in results.items():
+        if name == "extract_seconds":
+            continue
+        scores = result["scores"]
+        for model in sorted(set(cost_model[store.live])):
+            group = (cost_model == model) & store.live
+            rows.append({
+                "algorithm": name,
+                "cost_model": model,
+                "cells": int(group.sum()),
+                "seconds": result["seconds"],
+                "precision": float(scores["precision"][group].mean()),
+                "recall": float(scores["recall"][group].mean()),
+                "missing_links": float(scores["missing_links"][group].mean()),
+                "false_merges": float(scores["false_merges"][group].mean()),
+                "split_routers": float(scores["split_routers"][group].mean()),
+            })
+
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Score router-level topology reconstruction against the true router links',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('store_dir', type=str, help='Corpus store directory (see corpus_store.py)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per algorithm')
+    parser.add_argument('--output', type=str, help='Write the summary rows to this JSON file')
+    args = parser.parse_args()
+
+    corpus = CorpusStore(args.store_dir)
+    benchmark = run_benchmark(corpus, repeat=args.repeat)
+    summary = summarize_benchmark(corpus, benchmark)
+
+    print(f"Edge extraction over {len(corpus.live_cells)} cells: {benchmark['extract_seconds']:.3f} s")
+    header = f"{'algorithm':<16} {'cost_model':<24} {'cells':>5} {'prec':>6} {'recall':>6} {'miss':>6} {'merge':>6} {'split':>6} {'time_s':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in summary:
+        print(f"{r['algorithm']:<16} {r['cost_model']:<24} {r['cells']:>5} {r['precision']:>6.2f} "
+              f"{r['recall']:>6.2f} {r['missing_links']:>6.1f} {r['false_merges']:>6.1f} "
+              f"{r['split_routers']:>6.1f} {r['seconds']:>8.4f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
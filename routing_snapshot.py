@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+# Marker echoed between the sections of the batched per-router command
+SNAPSHOT_SEPARATOR = "@@ROUTING_SNAPSHOT@@"
+
+# Sections collected from every router, in command order
+SNAPSHOT_SECTIONS = ("fib", "ospf_database", "ospf_routes")
+
+
+def build_snapshot_command(router_name):
+    """
+    Build a single shell command that dumps the kernel FIB and the FRR
+    OSPF state of one router. FRR runs with a per-router pathspace
+    (frrinit.sh start rX), so vtysh must be pointed at it with -N.
+    """
+    return (
+        f"ip -j route; echo {SNAPSHOT_SEPARATOR}; "
+        f"vtysh -N {router_name} -c 'show ip ospf database json'; echo {SNAPSHOT_SEPARATOR}; "
+        f"vtysh -N {router_name} -c 'show ip route json'"
+    )
+
+
+def parse_snapshot_output(output):
+    """
+    Split the output of build_snapshot_command() into its JSON sections.
+
+    Returns:
+        dict: Section name -> parsed JSON (or None), plus "errors" for sections that failed
+    """
+    parts = output.split(SNAPSHOT_SEPARATOR)
+    snapshot = {"errors": {}}
+
+    for i, section in enumerate(SNAPSHOT_SECTIONS):
+        text = parts[i].strip() if i < len(parts) else ""
+        try:
+            snapshot[section] = json.loads(text) if text else None
+        except ValueError:
+            snapshot[section] = None
+            snapshot["errors"][section] = text[:200]
+
+        if snapshot[section] is None and section not in snapshot["errors"]:
+            snapshot["errors"][section] = "empty output"
+
+    return snapshot
+
+
+def collect_router_snapshot(net, router_name):
+    """Collect the routing state of a single router with one batched command."""
+    output = net[router_name].cmd(build_snapshot_command(router_name))
+    return parse_snapshot_output(output)
+
+
+def collect_routing_snapshot(net, routers=None, max_workers=None):
+    """
+    Collect FIB and OSPF state from every router concurrently.
+    Each router namespace receives exactly one batched command.
+
+    Args:
+        net: Mininet network
+        routers: Router names to snapshot (default: every node starting with 'r')
+        max_workers: Thread pool size (default: one thread per router)
+
+    Returns:
+        dict: Router name -> snapshot sections
+    """
+    if routers is None:
+        routers = [n for n in net.keys() if n.startswith('r')]
+
+    if not routers:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(routers)) as pool:
+        snapshots = pool.map(lambda r: collect_router_snapshot(net, r), routers)
+        return dict(zip(routers, snapshots))
+
+
+def snapshot_filename(sim_dir, percentage):
+    """Path of the snapshot stored next to traceroutes_asymmetry_Xpercent.txt."""
+    return os.path.join(sim_dir, f"routing_snapshot_asymmetry_{percentage}percent.json.gz")
+
+
+def save_routing_snapshot(net, filename, routers=None, metadata=None):
+    """
+    Collect the routing ground truth and store it as compact gzipped JSON.
+
+    Args:
+        net: Mininet network
+        filename: Output path (see snapshot_filename())
+        routers: Router names to snapshot
+        metadata: Optional dict stored alongside the snapshot (e.g. the applied cost table)
+
+    Returns:
+        str: Generated filename
+    """
+    snapshot = {
+        "timestamp": datetime.now().isoformat(),
+        "metadata": metadata or {},
+        "routers": collect_routing_snapshot(net, routers),
+    }
+
+    with gzip.open(filename, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+
+    return filename
+
+
+def load_routing_snapshot(filename):
+    """Load a snapshot written by save_routing_snapshot()."""
+    with gzip.open(filename, 'rt', encoding='utf-8') as f:
+        return json.load(f)
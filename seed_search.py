@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cost_models import cost_table_for_cell
+from cost_model_plugins import COST_MODELS
+from path_predictor import predict_router_paths
+
+
+DEFAULT_PERCENTAGES = [0, 20, 40, 60, 80, 100]
+
+
+def predicted_asymmetry(ospf_costs, areas=None):
+    """
+    Share of unordered host pairs whose predicted forward paths differ from
+    their reversed reverse paths (compared as ECMP path sets), optionally
+    under an OSPF area plan (see ospf_areas.area_plan()).
+    """
+    predicted = predict_router_paths(ospf_costs, areas=areas)
+    pairs = [(src, dst) for src, dst in predicted if src < dst]
+    asymmetric = sum(1 for src, dst in pairs
+                     if set(predicted[(src, dst)]) != {p[::-1] for p in predicted[(dst, src)]})
+    return asymmetric / len(pairs) if pairs else 0.0
+
+
+def seed_asymmetry(seed, cost_model, percentages, cost_params, areas=None):
+    """
+    Predicted asymmetry of one seed at every percentage (process pool worker).
+
+    Args:
+        seed: Candidate seed
+        cost_model: Cost model plugin name (see cost_model_plugins.py)
+        percentages: Asymmetry percentages of the sweep
+        cost_params: Cost model parameters as stored in simulation_metadata.json
+        areas: OSPF area plan (default: single area)
+
+    Returns:
+        tuple: (seed, {percentage: predicted asymmetry})
+    """
+    metadata = dict(cost_params, cost_model=cost_model, seed=seed)
+    return seed, {pct: predicted_asymmetry(cost_table_for_cell(metadata, pct), areas) for pct in percentages}
+
+
+def search_seeds(cost_model, band, num_seeds, percentages=None, cost_params=None,
+                 candidates=None, max_workers=None, areas=None):
+    """
+    Search seed space offline for seeds whose predicted asymmetry falls
+    inside band at every non-zero percentage.
+
+    Candidates are evaluated in a process pool in order, so the result
+    is the same for any number of workers.
+
+    Args:
+        cost_model: Cost model plugin name (see cost_model_plugins.py)
+        band: (low, high) accepted predicted asymmetry, as fractions of host pairs
+        num_seeds: Number of seeds wanted
+        percentages: Asymmetry percentages of the sweep (default: 0, 20, ..., 100)
+        cost_params: Cost parameters (see seed_asymmetry())
+        candidates: Seeds to try, in order (default: 1..10000)
+        max_workers: Process pool size (default: CPU count)
+        areas: OSPF area plan of the sweep (default: single area)
+
+    Returns:
+        list: (seed, {percentage: predicted asymmetry}) of the accepted seeds
+    """
+    percentages = DEFAULT_PERCENTAGES if percentages is None else percentages
+    cost_params = {} if cost_params is None else cost_params
+    candidates = list(range(1, 10001) if candidates is None else candidates)
+    low, high = band
+    checked = [p for p in percentages if p > 0]
+    max_workers = max_workers or os.cpu_count() or 1
+
+    accepted = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        batch_size = max_workers * 8
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start:start + batch_size]
+            results = executor.map(seed_asymmetry, batch, [cost_model] * len(batch),
+                                   [percentages] * len(batch), [cost_params] * len(batch),
+                                   [areas] * len(batch))
+            for seed, asymmetry in results:
+                if all(low <= asymmetry[p] <= high for p in checked):
+                    accepted.append((seed, asymmetry))
+                    if len(accepted) == num_seeds:
+                        return accepted
+
+    return accepted
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Search seeds whose predicted path asymmetry falls in a target band',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--cost-model', choices=sorted(COST_MODELS),
+                        default='random_different', help='Cost model of the sweep')
+    parser.add_argument('--target-asymmetry', type=float, nargs=2, required=True, metavar=('LOW', 'HIGH'),
+                        help='Accepted share of asymmetric host pairs at every non-zero percentage')
+    parser.add_argument('--num-sims', type=int, default=5, help='Number of seeds wanted')
+    parser.add_argument('--asymmetry-percentages', type=int, nargs='+', help='Percentages of the sweep')
+    parser.add_argument('--min-cost', type=int, default=10, help='Minimum OSPF cost (random model)')
+    parser.add_argument('--max-cost', type=int, default=100, help='Maximum OSPF cost (random model)')
+    parser.add_argument('--low-cost-range', type=int, nargs=2, default=[20, 40], help='Low cost range (directional model)')
+    parser.add_argument('--high-cost-range', type=int, nargs=2, default=[100, 200], help='High cost range (directional model)')
+    parser.add_argument('--workers', type=int, help='Process pool size (default: CPU count)')
+    args = parser.parse_args()
+
+    params = COST_MODELS[args.cost_model].params_from_args(args)
+
+    found = search_seeds(args.cost_model, args.target_asymmetry, args.num_sims,
+                         args.asymmetry_percentages, params, max_workers=args.workers)
+    for seed, asymmetry in found:
+        print(f"seed {seed}: " + ", ".join(f"{p}%={a:.2f}" for p, a in asymmetry.items()))
+    if len(found) < args.num_sims:
+        print(f"Only {len(found)} of {args.num_sims} seeds found in the band")
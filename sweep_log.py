@@ -0,0 +1,267 @@
+#!/usr/bin/python3
+"""
+Append-only JSON-lines event log of a simulation sweep.
+
+topo_runner.py writes one line per phase transition and per cell result to
+<base_dir>/events.jsonl (<sim_dir>/events.jsonl for a lone run_simulation()),
+flushed and synced as it happens, instead of keeping the results in memory
+until the end. A running sweep can be followed with "tail -f", a crash
+loses at most the event being written, and results_summary.json and
+global_summary.json are materialized from the log: by the runner when a
+simulation or the sweep ends, or at any time with this script.
+
+Events (every line also has "ts" and "event"):
+    sweep_start       base_directory, percentages, simulation_type, cost_model, total_simulations
+    simulation        sim, sim_dir, config                   (sweeps only)
+    simulation_start  sim, sim_dir, seed, params, percentages, prober, flows, ospf_areas, simulation_type
+    phase             sim, phase[, percentage]
+    converged         sim, percentage, converged, seconds   (FIBs complete and stable after the restart;
+                      a cell that did not converge is skipped)
+    cell              sim, percentage, file, routing_snapshot, verification, traceroutes,
+                      hops, silent_hops, bytes_written, corpus_replaced[, probe_plan, ecmp_paths, failover]
+                      (corpus_replaced: percentages of the simulation's corpus cells from an
+                      earlier sweep that this cell replaced)
+    cell_skipped      sim, percentage, reason
+    simulation_end    sim
+    simulation_error  sim, error
+    sweep_end
+
+A new sweep_start (or simulation_start for the same simulation) starts the
+materialized state over, so a directory reused by several sweeps yields the
+summaries of the last one.
+"""
+
+import argparse
+import json
+import os
+import threading
+from datetime import datetime
+
+
+EVENT_LOG = "events.jsonl"
+
+
+class EventLog:
+    """
+    Append-only JSON-lines log, one flushed and synced line per event.
+    Listeners (e.g. sweep_metrics.SweepMetrics.observe_event) get every record once logged.
+    """
+
+    def __init__(self, filename, listeners=()):
+        self.filename = filename
+        self.listeners = list(listeners)
+        self.file = open(filename, 'a')
+        # Cells may report from several threads (concurrent probing)
+        self.lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        """
+        Append one event.
+
+        Returns:
+            dict: The logged record
+        """
+        record = {"ts": datetime.now().isoformat(), "event": event, **fields}
+        line = json.dumps(record) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            for listener in self.listeners:
+                listener(record)
+        return record
+
+    def close(self):
+        self.file.close()
+
+
+def read_events(filename):
+    """
+    Events of a log in order; a line cut short by a crash is skipped.
+
+    Yields:
+        dict: Event record
+    """
+    with open(filename, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _cell_key(event):
+    return f"{event['percentage']}%"
+
+
+def materialize_results_summary(filename, sim_number):
+    """
+    results_summary.json of one simulation from the event log.
+
+    Returns:
+        dict: Summary (None if the simulation never started); "complete" is
+              False for a simulation that did not reach its end
+    """
+    summary = None
+    for event in read_events(filename):
+        kind = event["event"]
+        if event.get("sim") != sim_number:
+            continue
+        if kind == "simulation_start":
+            summary = {
+                "simulation_number": sim_number,
+                "seed": event["seed"],
+                **event["params"],
+                "percentages_tested": event["percentages"],
+                "files_generated": {},
+                "routing_snapshots": {},
+                "verification": {},
+                "probe_plans": {},
+                "prober": event["prober"],
+                "flows": event["flows"],
+                "ecmp_paths": {},
+                "ospf_areas": event["ospf_areas"],
+                "failover": {},
+                "convergence_seconds": {},
+                "skipped": {},
+                "timestamp": event["ts"],
+                "simulation_type": event["simulation_type"],
+                "complete": False,
+            }
+        elif summary is None:
+            continue
+        elif kind == "cell":
+            cell = _cell_key(event)
+            summary["files_generated"][cell] = event["file"]
+            summary["routing_snapshots"][cell] = event["routing_snapshot"]
+            summary["verification"][cell] = event["verification"]
+            for field, key in (("probe_plan", "probe_plans"), ("ecmp_paths", "ecmp_paths"),
+                               ("failover", "failover")):
+                if event.get(field) is not None:
+                    summary[key][cell] = event[field]
+            summary["timestamp"] = event["ts"]
+        elif kind == "converged":
+            summary["convergence_seconds"][_cell_key(event)] = event["seconds"]
+        elif kind == "cell_skipped":
+            summary["skipped"][_cell_key(event)] = event["reason"]
+        elif kind in ("simulation_end", "simulation_error"):
+            summary["timestamp"] = event["ts"]
+            summary["complete"] = kind == "simulation_end"
+    return summary
+
+
+def materialize_global_summary(filename):
+    """
+    global_summary.json of the last sweep in the event log.
+
+    Returns:
+        dict: Summary (None without a sweep); "complete" is False for a sweep
+              that did not reach its end
+    """
+    summary = None
+    for event in read_events(filename):
+        kind = event["event"]
+        if kind == "sweep_start":
+            summary = {
+                "total_simulations": event["total_simulations"],
+                "base_directory": event["base_directory"],
+                "percentages_tested": event["percentages"],
+                "simulation_type": event["simulation_type"],
+                "cost_model": event["cost_model"],
+                "simulations": {},
+                "timestamp": event["ts"],
+                "complete": False,
+            }
+        elif summary is None:
+            continue
+        elif kind == "simulation":
+            summary["simulations"][f"sim{event['sim']}"] = {
+                "config": event["config"], "sim_dir": event["sim_dir"], "results": {}}
+        elif kind == "cell":
+            simulation = summary["simulations"].get(f"sim{event['sim']}")
+            if simulation is not None:
+                simulation["results"][_cell_key(event)] = os.path.join(simulation["sim_dir"], event["file"])
+        elif kind == "simulation_error":
+            simulation = summary["simulations"].get(f"sim{event['sim']}")
+            if simulation is not None:
+                simulation.pop("results", None)
+                simulation["error"] = event["error"]
+        elif kind == "sweep_end":
+            summary["timestamp"] = event["ts"]
+            summary["complete"] = True
+    return summary
+
+
+def sweep_progress(filename):
+    """
+    Progress of the last sweep in the event log.
+
+    Returns:
+        dict: Simulations started/total, cells done/skipped/total, errors and the last phase event
+    """
+    progress = None
+    for event in read_events(filename):
+        kind = event["event"]
+        if kind == "sweep_start":
+            progress = {"simulations": 0, "total_simulations": event["total_simulations"],
+                        "cells": 0, "skipped": 0,
+                        "total_cells": event["total_simulations"] * len(event["percentages"]),
+                        "errors": 0, "last_phase": None, "complete": False}
+        elif progress is None:
+            continue
+        elif kind == "simulation":
+            progress["simulations"] += 1
+        elif kind == "cell":
+            progress["cells"] += 1
+        elif kind == "cell_skipped":
+            progress["skipped"] += 1
+        elif kind == "simulation_error":
+            progress["errors"] += 1
+        elif kind == "phase":
+            progress["last_phase"] = event
+        elif kind == "sweep_end":
+            progress["complete"] = True
+    return progress
+
+
+def write_summary(filename, summary):
+    """Write a materialized summary (via a temporary file, so readers never see half of it)."""
+    temporary = f"{filename}.tmp"
+    with open(temporary, 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(temporary, filename)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Show the progress of a sweep or materialize its summaries from the event log',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('base_dir', type=str, help='Sweep directory holding events.jsonl')
+    parser.add_argument('--write', action='store_true',
+                        help='Write global_summary.json and every simulation\'s results_summary.json')
+    parser.add_argument('--sim', type=int, help='Print the results summary of this simulation')
+    args = parser.parse_args()
+
+    log = os.path.join(args.base_dir, EVENT_LOG)
+    if args.sim is not None:
+        print(json.dumps(materialize_results_summary(log, args.sim), indent=2))
+    elif args.write:
+        summary = materialize_global_summary(log)
+        write_summary(os.path.join(args.base_dir, "global_summary.json"), summary)
+        for name, simulation in summary["simulations"].items():
+            results = materialize_results_summary(log, int(name[3:]))
+            if results is not None:
+                write_summary(os.path.join(simulation["sim_dir"], "results_summary.json"), results)
+        print(f"Materialized {len(summary['simulations'])} simulations from {log}")
+    else:
+        progress = sweep_progress(log)
+        phase = progress["last_phase"]
+        print(f"Simulations: {progress['simulations']}/{progress['total_simulations']}, "
+              f"cells: {progress['cells']}/{progress['total_cells']} ({progress['skipped']} skipped), "
+              f"errors: {progress['errors']}, {'complete' if progress['complete'] else 'running or interrupted'}")
+        if phase:
+            where = f" {phase['percentage']}%" if "percentage" in phase else ""
+            print(f"Last phase: sim{phase['sim']}{where} {phase['phase']} at {phase['ts']}")
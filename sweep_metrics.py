@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+"""
+Prometheus metrics of a running sweep.
+
+SweepMetrics listens to the sweep's event log (sweep_log.EventLog) and keeps
+counters, gauges and histograms of its progress and throughput: cells
+completed, traceroutes per second, measured OSPF convergence and phase seconds, the share
+of silent ('* * *') hops, FRR restarts and bytes written. After every event
+it renders them in the Prometheus text exposition format to a textfile,
+replaced atomically (e.g. for the node_exporter textfile collector), and
+serve_metrics() optionally exposes them on a localhost-only HTTP endpoint.
+"""
+
+import argparse
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sweep_log import EVENT_LOG, read_events
+from topology_spec import ROUTERS
+
+
+# Textfile written next to the sweep's events.jsonl by default
+METRICS_FILE = "metrics.prom"
+
+PREFIX = "topo_sweep_"
+
+# Histogram buckets (seconds) of the phase and convergence durations
+DURATION_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 90, 120, 300, 600, 1800)
+
+# name -> (type, help)
+METRICS = {
+    "simulations_total": ("counter", "Simulations by status (started, completed, failed)"),
+    "cells_planned": ("gauge", "Cells (simulation x percentage) of the sweep"),
+    "cells_completed_total": ("counter", "Cells whose traceroutes were collected and verified"),
+    "cells_skipped_total": ("counter", "Cells skipped because FRR could not be configured or restarted"),
+    "traceroutes_total": ("counter", "Traceroutes collected"),
+    "traceroutes_per_second": ("gauge", "Traceroutes per second of the last cell's trace phase"),
+    "hops_total": ("counter", "Hops of the collected traceroutes"),
+    "silent_hops_total": ("counter", "Hops without any answer ('* * *')"),
+    "silent_hop_ratio": ("gauge", "Share of silent hops in the last cell"),
+    "frr_restarts_total": ("counter", "FRR router restarts"),
+    "bytes_written_total": ("counter", "Bytes of the cells' output files"),
+    "convergence_seconds": ("histogram", "Seconds from FRR restart to complete and stable FIBs"),
+    "convergence_timeouts_total": ("counter", "Restarts whose FIBs did not converge within the model's wait"),
+    "phase_seconds": ("histogram", "Seconds per cell phase"),
+    "running": ("gauge", "1 while the sweep runs"),
+    "last_event_timestamp_seconds": ("gauge", "Unix time of the last sweep event"),
+}
+
+# Phase that contains the FRR restart and the convergence wait
+RESTART_PHASE = "restart"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _timestamp(record):
+    return datetime.fromisoformat(record["ts"]).timestamp()
+
+
+class SweepMetrics:
+    """
+    Metrics registry fed by sweep events (observe_event()), rendered in the
+    Prometheus text format to an optional textfile after every event.
+    """
+
+    def __init__(self, textfile=None, buckets=DURATION_BUCKETS):
+        self.textfile = textfile
+        self.buckets = tuple(buckets)
+        # Held while applying an event and rendering (render() runs inside observe_event())
+        self.lock = threading.RLock()
+        # (name, sorted label items) -> value, or (bucket counts, sum, count) for histograms
+        self.values = {}
+        self.common = ()
+        self.phase = None
+        self.trace_seconds = None
+
+    def _key(self, name, labels):
+        return name, tuple(sorted(dict(self.common, **labels).items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        self.values[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        counts, total, count = self.values.get(key, ([0] * len(self.buckets), 0.0, 0))
+        counts = [c + (value <= bound) for c, bound in zip(counts, self.buckets)]
+        self.values[key] = (counts, total + value, count + 1)
+
+    def _close_phase(self, t):
+        """Observe the duration of the running phase."""
+        if self.phase is None:
+            return
+        name, start = self.phase
+        self.phase = None
+        self.observe("phase_seconds", t - start, phase=name)
+        if name == "trace":
+            self.trace_seconds = t - start
+
+    def observe_event(self, record):
+        """Update the metrics from one sweep event and rewrite the textfile."""
+        with self.lock:
+            self._apply(record)
+            if self.textfile:
+                self.write_textfile()
+
+    def _apply(self, record):
+        kind, t = record["event"], _timestamp(record)
+
+        if kind == "sweep_start":
+            self.common = (("cost_model", record["cost_model"]),)
+            self.set("cells_planned", record["total_simulations"] * len(record["percentages"]))
+            self.set("running", 1)
+            for name in ("cells_completed_total", "cells_skipped_total", "traceroutes_total", "hops_total",
+                         "silent_hops_total", "frr_restarts_total", "convergence_timeouts_total",
+                         "bytes_written_total"):
+                self.inc(name, 0)
+        self.set("last_event_timestamp_seconds", t)
+
+        if kind in ("phase", "cell", "cell_skipped", "simulation", "simulation_start", "simulation_end",
+                    "simulation_error", "sweep_end"):
+            self._close_phase(t)
+
+        if kind == "phase":
+            self.phase = (record["phase"], t)
+            if record["phase"] == RESTART_PHASE:
+                self.inc("frr_restarts_total", len(ROUTERS))
+        elif kind == "converged":
+            # Measured by topo_runner.wait_for_convergence()
+            self.observe("convergence_seconds", record["seconds"])
+            if not record["converged"]:
+                self.inc("convergence_timeouts_total")
+        elif kind == "simulation":
+            self.inc("simulations_total", status="started")
+        elif kind == "simulation_end":
+            self.inc("simulations_total", status="completed")
+        elif kind == "simulation_error":
+            self.inc("simulations_total", status="failed")
+        elif kind == "cell_skipped":
+            self.inc("cells_skipped_total")
+        elif kind == "cell":
+            self.inc("cells_completed_total")
+            traceroutes = record.get("traceroutes", 0)
+            self.inc("traceroutes_total", traceroutes)
+            if self.trace_seconds:
+                self.set("traceroutes_per_second", traceroutes / self.trace_seconds)
+            self.inc("hops_total", record.get("hops", 0))
+            self.inc("silent_hops_total", record.get("silent_hops", 0))
+            if record.get("hops"):
+                self.set("silent_hop_ratio", record["silent_hops"] / record["hops"])
+            self.inc("bytes_written_total", record.get("bytes_written", 0))
+        elif kind == "sweep_end":
+            self.set("running", 0)
+
+    def render(self):
+        """Metrics in the Prometheus text exposition format."""
+        with self.lock:
+            lines = []
+            for name, (kind, help_text) in METRICS.items():
+                samples = sorted(((labels, value) for (metric, labels), value in self.values.items()
+                                  if metric == name), key=lambda sample: sample[0])
+                if not samples:
+                    continue
+                lines.append(f"# HELP {PREFIX}{name} {help_text}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                for labels, value in samples:
+                    if kind != "histogram":
+                        lines.append(f"{PREFIX}{name}{_labels(labels)} {_number(value)}")
+                        continue
+                    counts, total, count = value
+                    for bound, bucket_count in zip(self.buckets, counts):
+                        lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', _number(bound)),))} "
+                                     f"{bucket_count}")
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {_number(total)}")
+                    lines.append(f"{PREFIX}{name}_count{_labels(labels)} {count}")
+            return "\n".join(lines) + "\n"
+
+    def write_textfile(self):
+        """Write the rendered metrics to the textfile via a rename, so readers never see half of it."""
+        temporary = f"{self.textfile}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(self.render())
+        os.replace(temporary, self.textfile)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics (or /) returns the rendered metrics of self.server.metrics."""
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(metrics, port):
+    """
+    Serve the metrics on http://127.0.0.1:<port>/metrics from a background
+    thread. The endpoint only listens on the loopback interface.
+
+    Returns:
+        ThreadingHTTPServer: Running server (shutdown() stops it)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def metrics_from_log(filename, textfile=None):
+    """Rebuild the metrics of a sweep from its event log."""
+    metrics = SweepMetrics(textfile)
+    for record in read_events(filename):
+        metrics.observe_event(record)
+    return metrics
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Rebuild the Prometheus metrics of a sweep from its event log',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('base_dir', type=str, help='Sweep directory holding events.jsonl')
+    parser.add_argument('--textfile', type=str, help='Write the metrics to this file instead of stdout')
+    parser.add_argument('--port', type=int, help='Then serve them on 127.0.0.1:PORT/metrics until interrupted')
+    args = parser.parse_args()
+
+    metrics = metrics_from_log(os.path.join(args.base_dir, EVENT_LOG), args.textfile)
+    if not args.textfile:
+        print(metrics.render(), end="")
+    if args.port:
+        server = serve_metrics(metrics, args.port)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
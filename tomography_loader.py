@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+
+import argparse
+import queue
+import threading
+import time
+
+import numpy as np
+
+from corpus_store import CorpusStore
+from cost_models import cost_table_for_cell, cost_vector
+from hop_index import build_hop_index
+
+
+# Hop router sentinels: non-router replies / padding, and '*' hops
+PAD = -1
+STAR = -2
+
+
+class TracerouteBatchLoader:
+    """
+    Fixed-shape NumPy batches streamed from a packed corpus store.
+
+    Every batch is a dict of arrays with a leading batch dimension:
+      "hop_ip"     uint32  [B, K]  responding address per hop (0 for '*' or padding)
+      "hop_router" int32   [B, K]  router node id, STAR for '*', PAD for host replies
+                                   and after the end
+      "mask"       bool    [B, K]  hop exists
+      "rtt"        float32 [B, K]  mean RTT in ms (0 where not answered)
+      "rtt_mask"   bool    [B, K]  hop answered
+      "src", "dst" int32   [B]     host index in the store
+      "cost_model" int32   [B]     index into loader.cost_models
+      "percentage" float32 [B]
+      "seed"       int64   [B]     simulation seed (-1 if unknown)
+      "link_costs" float32 [B, D]  directed link costs of the run (NaN if unknown)
+      "valid"      bool    [B]     False for the padding rows of the last batch
+    """
+
+    def __init__(self, store, batch_size=256, max_hops=32, shuffle=True, seed=0,
+                 drop_last=False, prefetch=2, cells=None, index=None):
+        self.store = CorpusStore(store) if isinstance(store, str) else store
+        self.batch_size = batch_size
+        self.max_hops = max_hops
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.prefetch = prefetch
+        self.index = build_hop_index() if index is None else index
+        self.epoch = 0
+
+        cells = self.store.live_cells if cells is None else cells
+        self.record_ids = np.concatenate(
+            [np.arange(c['first_record'], c['first_record'] + c['num_records'], dtype=np.int64)
+             for c in (self.store.cells[i] for i in cells)] or [np.empty(0, dtype=np.int64)])
+
+        self._build_cell_labels()
+
+    def _build_cell_labels(self):
+        """Per-cell labels, rebuilt once from the simulation metadata."""
+        num_cells = len(self.store.cells)
+        metadata = [self.store.sim_metadata.get(self.store.sims[c['sim']], {}) for c in self.store.cells]
+
+        self.cost_models = sorted({m.get("cost_model", "unknown") for m in metadata})
+        model_id = {name: i for i, name in enumerate(self.cost_models)}
+
+        num_dlinks = 2 * self.index.num_router_links
+        self.cell_cost_model = np.zeros(num_cells, dtype=np.int32)
+        self.cell_percentage = np.zeros(num_cells, dtype=np.float32)
+        self.cell_seed = np.full(num_cells, -1, dtype=np.int64)
+        self.cell_link_costs = np.full((num_cells, num_dlinks), np.nan, dtype=np.float32)
+
+        for i, (cell, meta) in enumerate(zip(self.store.cells, metadata)):
+            percentage = int(cell['percentage'])
+            self.cell_cost_model[i] = model_id[meta.get("cost_model", "unknown")]
+            self.cell_percentage[i] = percentage
+            if meta.get("seed") is not None:
+                self.cell_seed[i] = meta["seed"]
+                ospf_costs = cost_table_for_cell(meta, percentage)
+                if ospf_costs is not None:
+                    self.cell_link_costs[i] = cost_vector(ospf_costs)
+
+    def __len__(self):
+        full, rest = divmod(len(self.record_ids), self.batch_size)
+        return full if self.drop_last or rest == 0 else full + 1
+
+    def make_batch(self, record_ids):
+        """Gather one batch for the given record positions (vectorized over the batch)."""
+        store = self.store
+        n = len(record_ids)
+        k = np.arange(self.max_hops)
+
+        records = store.records[record_ids]
+        lengths = np.minimum(records['num_hops'], self.max_hops)
+        mask = k[None, :] < lengths[:, None]
+
+        hop_ip = np.zeros((n, self.max_hops), dtype=np.uint32)
+        rtt = np.zeros((n, self.max_hops), dtype=np.float32)
+        answered = np.zeros((n, self.max_hops), dtype=bool)
+        if mask.any():
+            path_offset = store.paths['offset'][records['path']].astype(np.int64)
+            hop_ip[mask] = store.path_hops[(path_offset[:, None] + k[None, :])[mask]]
+
+            hops = store.hops[(records['hop_offset'].astype(np.int64)[:, None] + k[None, :])[mask]]
+            answered[mask] = hops['answered'] > 0
+            rtt[mask] = np.where(hops['answered'] > 0, hops['rtt'], 0.0)
+
+        hop_router = np.where(mask, np.where(hop_ip == 0, STAR, self.index.router_of(hop_ip)), PAD)
+        cells = records['cell'].astype(np.int64)
+
+        return {
+            "hop_ip": hop_ip,
+            "hop_router": hop_router.astype(np.int32),
+            "mask": mask,
+            "rtt": rtt,
+            "rtt_mask": answered,
+            "src": records['src'].astype(np.int32),
+            "dst": records['dst'].astype(np.int32),
+            "cost_model": self.cell_cost_model[cells],
+            "percentage": self.cell_percentage[cells],
+            "seed": self.cell_seed[cells],
+            "link_costs": self.cell_link_costs[cells],
+            "valid": np.ones(n, dtype=bool),
+        }
+
+    def _pad_batch(self, batch):
+        """Pad a short last batch to batch_size rows (marked invalid)."""
+        missing = self.batch_size - len(batch["valid"])
+        if missing <= 0:
+            return batch
+        padded = {}
+        for name, array in batch.items():
+            pad_width = [(0, missing)] + [(0, 0)] * (array.ndim - 1)
+            fill = False if array.dtype == bool else (PAD if name == "hop_router" else 0)
+            padded[name] = np.pad(array, pad_width, constant_values=fill)
+        return padded
+
+    def _epoch_order(self):
+        if not self.shuffle:
+            return self.record_ids
+        rng = np.random.default_rng([self.seed, self.epoch])
+        return rng.permutation(self.record_ids)
+
+    @staticmethod
+    def _put(out, stop, item):
+        """Queue an item unless the consumer has stopped iterating."""
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, order, out, stop):
+        try:
+            for b in range(len(self)):
+                ids = order[b * self.batch_size:(b + 1) * self.batch_size]
+                if not self._put(out, stop, self._pad_batch(self.make_batch(np.sort(ids)))):
+                    return
+            self._put(out, stop, None)
+        except Exception as e:
+            self._put(out, stop, e)
+
+    def __iter__(self):
+        """
+        Iterate over one epoch. Batches are assembled by a background thread
+        up to 'prefetch' batches ahead; each epoch reshuffles with a seeded RNG.
+        """
+        order = self._epoch_order()
+        self.epoch += 1
+
+        out = queue.Queue(maxsize=max(1, self.prefetch))
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(order, out, stop), daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                item = out.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Iterate tomography training batches from a packed corpus store',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('store_dir', type=str, help='Corpus store directory (see corpus_store.py)')
+    parser.add_argument('--batch-size', type=int, default=256, help='Traceroutes per batch')
+    parser.add_argument('--max-hops', type=int, default=32, help='Hop dimension of the batches')
+    parser.add_argument('--seed', type=int, default=0, help='Shuffling seed')
+    parser.add_argument('--epochs', type=int, default=1, help='Epochs to iterate')
+    args = parser.parse_args()
+
+    loader = TracerouteBatchLoader(args.store_dir, batch_size=args.batch_size,
+                                   max_hops=args.max_hops, seed=args.seed)
+    for epoch in range(args.epochs):
+        start = time.perf_counter()
+        rows = sum(int(batch["valid"].sum()) for batch in loader)
+        elapsed = time.perf_counter() - start
+        print(f"Epoch {epoch}: {len(loader)} batches, {rows} traceroutes in {elapsed:.3f} s")
@@ -7,6 +7,9 @@ from mininet.log import setLogLevel, info
 from mininet.cli import CLI
 import time
 import json
+from cost_model_plugins import CostModel
+from topo_runner import run_prober, probe_host, probe_pairs, disable_icmp_ratelimit
+from emulation_cleanup import EmulationLock, reap_stale_state, node_record
 
 
 class LinuxRouter(Node):
@@ -109,107 +112,118 @@ class NetworkTopo(Topo):
             self.addLink(routers[rA], routers[rB], intfName1=intfA, intfName2=intfB)
             
 
+def collect_traceroutes(net, format_results):
+    """
+    Trace every host pair with one icmp_prober.py run per source host, all
+    sources concurrently, with the probe options of the base cost model
+    (-m 64). Router ICMP rate limiting is lifted first, otherwise the
+    concurrent probes would silence most near hops.
+
+    Args:
+        net: Mininet network
+        format_results: True for "traceroute -n" text (topo_runner.probe_host()),
+                        False for the prober results (topo_runner.run_prober())
+
+    Returns:
+        dict: (src, dst) -> text or prober result (missing if the prober failed)
+    """
+    hosts = sorted(h for h in net.keys() if h.startswith('h'))  # Solo host
+    pairs = [(src, dst) for src in hosts for dst in hosts if src != dst]
+    probe = probe_host if format_results else run_prober
+
+    disable_icmp_ratelimit(net)
+    info(f"Probing {len(pairs)} pairs from {len(hosts)} hosts\n")
+    return probe_pairs(net, pairs, lambda src, dsts: probe(net, src, dsts, CostModel))
+
+
 def save_traceroutes_raw(net, filename="traceroutes.txt"):
-  
-    hosts = [h for h in net.keys() if h.startswith('h')]  # Solo host
+
+    traces = collect_traceroutes(net, format_results=True)
 
     with open(filename, 'w') as f:
-        for src in hosts:
-            for dst in hosts:
-                if src != dst:
-                    f.write(f"Traceroute from {src} to {dst}:\n")
-                    info(f"Traceroute from {src} to {dst}\n")
-                    
-                 
-                    # Connectivity pre-check reduces failed traceroute attempts
-                    net[src].cmd(f"ping -c 1 {net[dst].IP()}")
-
-                   
-                    # -I flag uses ICMP instead of UDP
-                    # -n flag avoids DNS lookups which can skew timing measurements
-                    # -m 64 accommodates networks
-                    result = net[src].cmd(f"traceroute -I -n -m 64 {net[dst].IP()}")
-
-                    # Write on file
-                    f.write(result + "\n\n")
-                    # 4-second delay 
-                    time.sleep(4)  
+        for (src, dst), trace in traces.items():
+            f.write(f"Traceroute from {src} to {dst}:\n")
+            # Same text as traceroute -n
+            f.write(trace + "\n\n")
 
     info(f"Traceroutes salvati in {filename}\n")
-           
-    
+
+
 def save_traceroutes_json(net, filename="traceroutes"):
- 
-    hosts = [h for h in net.keys() if h.startswith('h')]  # Solo host
+
+    hosts = sorted(h for h in net.keys() if h.startswith('h'))  # Solo host
+    results = collect_traceroutes(net, format_results=False)
     traceroutes = {}
 
     for src in hosts:
         traceroutes[src] = {}
         for dst in hosts:
             if src != dst:
-                info(f"Traceroute from {src} to {dst}\n")
-                    result = net[src].cmd(f"traceroute -I -n -m 64 {net[dst].IP()}")
-                hops = []
-                for line in result.splitlines()[1:]:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        hops.append(parts[1])  
+                result = results.get((src, dst), {"hops": []})
+                hops = [hop["ip"] or "*" for hop in result["hops"]]
                 traceroutes[src][dst] = {
                     "path": hops,
                     "hops": len(hops)
                 }
-               
-                time.sleep(4)
 
-   
     with open(filename, 'w') as f:
         json.dump(traceroutes, f, indent=4)
     info(f"Traceroutes salvati in {filename}\n")
 
 
-
 def run():
     """Run the network with FRR"""
-    topo = NetworkTopo()
-    net = Mininet(topo=topo)
-    net.start()
-
-    # Assign IP addresses to router interfaces (host-router links)
-    # Manual IP assignment required since Mininet doesn't handle multi-interface routers
-    for hname, rname, intfName, ip in topo.host_router_links:
-        net[rname].setIP(ip, intf=intfName)
-
-    # Assign IP addresses to router interfaces (router-router links)
-    # Point-to-point interface configuration
-    for rA, rB, intfA, intfB, ipA, ipB in topo.router_links:
-        net[rA].setIP(ipA, intf=intfA)
-        net[rB].setIP(ipB, intf=intfB)
-
-    # Start FRR daemons on each router
-    for i in range(1, 19):
-        router_name = f'r{i}'
-        info(f"Starting FRR on {router_name}\n")
-        net[router_name].cmd(f"/usr/lib/frr/frrinit.sh start {router_name}")
-
-    # Wait for FRR daemons to start
-    time.sleep(5)
-
-    # Optionally, display routing tables
-    # Useful for debugging
-    for i in range(1, 19):
-        router_name = f'r{i}'
-        info(f"*** Routing Table on {router_name}:\n")
-        info(net[router_name].cmd("ip route"))
-
-    CLI(net)
-
-    # Stop FRR daemons on each router
-    for i in range(1, 19):
-        router_name = f'r{i}'
-        info(f"Stopping FRR on {router_name}\n")
-        net[router_name].cmd(f"/usr/lib/frr/frrinit.sh stop {router_name}")
-
-    net.stop()
+    # Only one emulation at a time: node names and FRR pathspaces are global
+    lock = EmulationLock()
+    lock.acquire()
+    try:
+        reap_stale_state(lock.previous)
+
+        topo = NetworkTopo()
+        net = Mininet(topo=topo)
+        lock.record(node_record(net))
+        net.start()
+
+        # Assign IP addresses to router interfaces (host-router links)
+        # Manual IP assignment required since Mininet doesn't handle multi-interface routers
+        for hname, rname, intfName, ip in topo.host_router_links:
+            net[rname].setIP(ip, intf=intfName)
+
+        # Assign IP addresses to router interfaces (router-router links)
+        # Point-to-point interface configuration
+        for rA, rB, intfA, intfB, ipA, ipB in topo.router_links:
+            net[rA].setIP(ipA, intf=intfA)
+            net[rB].setIP(ipB, intf=intfB)
+
+        # Start FRR daemons on each router
+        for i in range(1, 19):
+            router_name = f'r{i}'
+            info(f"Starting FRR on {router_name}\n")
+            net[router_name].cmd(f"/usr/lib/frr/frrinit.sh start {router_name}")
+
+        # Wait for FRR daemons to start
+        time.sleep(5)
+
+        # Optionally, display routing tables
+        # Useful for debugging
+        for i in range(1, 19):
+            router_name = f'r{i}'
+            info(f"*** Routing Table on {router_name}:\n")
+            info(net[router_name].cmd("ip route"))
+
+        CLI(net)
+
+        # Stop FRR daemons on each router
+        for i in range(1, 19):
+            router_name = f'r{i}'
+            info(f"Stopping FRR on {router_name}\n")
+            net[router_name].cmd(f"/usr/lib/frr/frrinit.sh stop {router_name}")
+
+        net.stop()
+        lock.record({})
+    finally:
+        # Whatever is still recorded is reaped by the next run
+        lock.release()
 
 
 if __name__ == '__main__':
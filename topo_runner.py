@@ -0,0 +1,1239 @@
+#!/usr/bin/python3
+"""
+Shared orchestration of the asymmetry experiments.
+
+Builds the 18-router topology, generates and deploys the FRR configurations,
+restarts OSPF, collects and verifies the traceroutes of every percentage and
+writes the simulation metadata and summaries. Everything model-specific comes
+from a cost model plugin (cost_model_plugins.py); topo_randomcost.py and
+topo_directional.py run this module with their model preselected.
+"""
+
+try:
+    from mininet.topo import Topo
+    from mininet.net import Mininet
+    from mininet.node import Node
+    from mininet.log import setLogLevel
+    from mininet.cli import CLI
+except ImportError:
+    # Without Mininet only the replay backend (emulation_backend.py) can run
+    Topo = Node = object
+    Mininet = CLI = None
+
+    def setLogLevel(level):
+        pass
+
+import time
+import json
+import os
+import subprocess
+import argparse
+import random
+import shlex
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from routing_snapshot import save_routing_snapshot, snapshot_filename
+from path_verifier import verify_and_retrace, observed_router_path
+from path_predictor import interface_owner_map
+from corpus_store import CorpusWriter, append_collected_cell, corpus_store_dir
+from cost_model_plugins import COST_MODELS
+from topology_spec import HOSTS, HOST_ROUTER_LINKS, ROUTER_LINKS, ROUTERS, host_ip
+from probe_planner import plan_probes
+from seed_search import search_seeds, DEFAULT_PERCENTAGES
+from emulation_backend import RecordBackend, ReplayBackend
+from icmp_prober import prober_command, format_traceroute, path_flow
+from sweep_log import (EventLog, EVENT_LOG, materialize_results_summary, materialize_global_summary,
+                       write_summary)
+from sweep_metrics import SweepMetrics, METRICS_FILE, serve_metrics
+from traceroute_parser import traceroute_file_stats
+from emulation_cleanup import EmulationLock, reap_stale_state, delete_links, node_record
+from ospf_areas import area_plan, ospf_area_lines, expected_ospf_routes, describe_plan
+from failure_scenarios import (load_scenario, event_commands, restore_commands, ping_command,
+                               monitor_command, analyze_scenario)
+
+
+class LinuxRouter(Node):
+    "A Node with IP forwarding enabled."
+
+    def config(self, **params):
+        super(LinuxRouter, self).config(**params)
+        # Enable IP forwarding on the router
+        self.cmd('sysctl net.ipv4.ip_forward=1')
+
+    def terminate(self):
+        self.cmd('sysctl net.ipv4.ip_forward=0')
+        super(LinuxRouter, self).terminate()
+
+
+class NetworkTopo(Topo):
+    "A LinuxRouter connecting multiple IP subnets"
+
+    def build(self, hostless=False, **_opts):
+        # Create routers r1 to r18
+        routers = {}
+        for router_name in ROUTERS:
+            routers[router_name] = self.addHost(router_name, cls=LinuxRouter)
+
+        # Host-less edge mode: the host subnets are attached by attach_edge_subnets()
+        self.host_router_links = HOST_ROUTER_LINKS
+        if not hostless:
+            # Create hosts
+            for hname, (hip, hgw) in HOSTS.items():
+                self.addHost(hname, ip=hip, defaultRoute=f'via {hgw}')
+
+            # Connect hosts to routers
+            for hname, rname, intfName, ip in self.host_router_links:
+                self.addLink(hname, routers[rname], intfName2=intfName)
+
+        # Add router-to-router links with explicit interface names
+        self.router_links = ROUTER_LINKS
+        for rA, rB, intfA, intfB, ipA, ipB in self.router_links:
+            self.addLink(routers[rA], routers[rB], intfName1=intfA, intfName2=intfB)
+
+
+# First routing table of the host-less edge VRFs (one table per host)
+EDGE_VRF_TABLE = 1000
+
+
+def edge_vrf(host_name):
+    """VRF holding a host's address inside its edge router (host-less edge mode)."""
+    return f"vrf-{host_name}"
+
+
+def attach_edge_subnets(net, host_router_links=None):
+    """
+    Host-less edge mode: realize every host as a veth pair inside its edge
+    router's namespace, the router end carrying the gateway address and the
+    host end the host address in a VRF of its own with a default route via
+    the gateway. Probes from the VRF are forwarded by the router like those
+    of a host namespace, and probes to it leave the router before delivery,
+    so both edge routers stay hops and the output is unchanged.
+
+    Args:
+        net: Mininet network built with NetworkTopo(hostless=True)
+        host_router_links: Host-router link table
+    """
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+    for table, (hname, rname, intfName, ip) in enumerate(host_router_links, EDGE_VRF_TABLE):
+        hip, hgw = HOSTS[hname]
+        vrf, hintf = edge_vrf(hname), f"{hname}-eth0"
+        net[rname].cmd(
+            f"ip link add {intfName} type veth peer name {hintf}; "
+            f"ip link add {vrf} type vrf table {table}; "
+            f"ip link set {hintf} master {vrf}; "
+            f"ip link set {vrf} up; ip link set {hintf} up; ip link set {intfName} up; "
+            f"ip addr add {ip} dev {intfName}; ip addr add {hip} dev {hintf}; "
+            f"ip route add vrf {vrf} default via {hgw}"
+        )
+
+
+class EdgeHost:
+    """
+    Host-less stand-in for a host node: commands run in the host's VRF
+    inside its edge router's namespace (see attach_edge_subnets()).
+    """
+
+    def __init__(self, name, router):
+        self.name = name
+        self.router = router
+
+    def cmd(self, command, *args, **kwargs):
+        return self.router.cmd(f"ip vrf exec {edge_vrf(self.name)} sh -c {shlex.quote(command)}", *args, **kwargs)
+
+    def IP(self):
+        return host_ip(self.name)
+
+
+class HostlessNetwork:
+    """Network proxy handing out EdgeHost stand-ins for the hosts."""
+
+    def __init__(self, net, host_router_links=None):
+        self.net = net
+        host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+        self.hosts = {hname: EdgeHost(hname, net[rname]) for hname, rname, _, _ in host_router_links}
+
+    def __getitem__(self, name):
+        return self.hosts[name] if name in self.hosts else self.net[name]
+
+    def keys(self):
+        return list(self.net.keys()) + list(self.hosts)
+
+    def __getattr__(self, name):
+        return getattr(self.net, name)
+
+
+def ospf_router_id(router_name):
+    """OSPF router-id of rN: N.N.N.N, or 0.x.y.z from N beyond 255 routers."""
+    number = int(router_name[1:])
+    if number <= 255:
+        return f"{number}.{number}.{number}.{number}"
+    return f"0.{(number >> 16) & 255}.{(number >> 8) & 255}.{number & 255}"
+
+
+def create_frr_configs(ospf_costs=None, config_dir="./config", areas=None, router_links=None,
+                       host_router_links=None):
+    """
+    Write the FRR configuration of every router, with the OSPF cost of each
+    interface taken from a cost table (cost 1 where missing).
+
+    Args:
+        ospf_costs: Dictionary with "router.interface" keys and OSPF costs as values
+                    (default: symmetric baseline)
+        config_dir: Configuration directory
+        areas: OSPF area plan (see ospf_areas.area_plan()); default is everything in area 0
+        router_links: Router-to-router link table (default: topology_spec.ROUTER_LINKS)
+        host_router_links: Host-router link table (default: topology_spec.HOST_ROUTER_LINKS)
+
+    Returns:
+        bool: True on success
+    """
+    ospf_costs = {} if ospf_costs is None else ospf_costs
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+
+    # Create interface mapping for routers
+    router_interfaces = {}
+
+    # Add host-router interfaces
+    for hname, rname, intfName, ip in host_router_links:
+        router_interfaces.setdefault(rname, []).append((intfName, ip.split('/')[0], int(ip.split('/')[1])))
+
+    # Add router-router interfaces
+    for rA, rB, intfA, intfB, ipA, ipB in router_links:
+        router_interfaces.setdefault(rA, []).append((intfA, ipA.split('/')[0], int(ipA.split('/')[1])))
+        router_interfaces.setdefault(rB, []).append((intfB, ipB.split('/')[0], int(ipB.split('/')[1])))
+
+    # Generate configuration file for each router
+    for router_name, interfaces in sorted(router_interfaces.items(), key=lambda item: int(item[0][1:])):
+        router_dir = os.path.join(config_dir, router_name)
+        os.makedirs(router_dir, exist_ok=True)
+
+        frr_conf_path = os.path.join(router_dir, "frr.conf")
+
+        with open(frr_conf_path, 'w') as f:
+            f.write(f"# FRR Configuration for {router_name}\n")
+            f.write(f"# Generated automatically - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+            f.write("frr version 8.1\n")
+            f.write("frr defaults traditional\n")
+            f.write(f"hostname {router_name}\n")
+            f.write("log syslog informational\n")
+            f.write("service integrated-vtysh-config\n\n")
+
+            # Interface configuration with the cell's costs
+            for intf_name, ip_addr, prefix_len in interfaces:
+                f.write(f"interface {intf_name}\n")
+                f.write(f" ip address {ip_addr}/{prefix_len}\n")
+                f.write(f" ip ospf cost {ospf_costs.get(f'{router_name}.{intf_name}', 1)}\n")
+                if areas is not None:
+                    f.write(f" ip ospf area {areas['interface_areas'][f'{router_name}.{intf_name}']}\n")
+                f.write("!\n")
+
+            # OSPF configuration
+            f.write("router ospf\n")
+            f.write(f" router-id {ospf_router_id(router_name)}\n")
+            f.write(" log-adjacency-changes\n")
+
+            # Stub areas (interfaces carry their area in multi-area mode)
+            if areas is not None:
+                for line in ospf_area_lines(areas, router_name):
+                    f.write(line + "\n")
+
+            # Announce networks
+            for intf_name, ip_addr, prefix_len in (interfaces if areas is None else []):
+                ip_parts = [int(part) for part in ip_addr.split('.')]
+
+                if prefix_len == 30:
+                    network_ip = ip_parts.copy()
+                    network_ip[3] = (network_ip[3] // 4) * 4
+                elif prefix_len == 24:
+                    network_ip = ip_parts.copy()
+                    network_ip[3] = 0
+
+                network_addr = ".".join(map(str, network_ip))
+                f.write(f" network {network_addr}/{prefix_len} area 0\n")
+
+            f.write("!\n")
+            f.write("line vty\n")
+            f.write("!\n")
+
+    return True
+
+
+def run_shell_command(cmd, timeout=120):
+    """Execute shell command with error handling."""
+    try:
+        subprocess.run(cmd, shell=True, check=True, timeout=timeout,
+                       capture_output=True, text=True)
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+    except subprocess.CalledProcessError:
+        return False
+    except Exception:
+        return False
+
+
+def copy_configs_to_frr(config_dir="./config"):
+    """Copy configurations from config_dir to /etc/frr with correct permissions."""
+    copy_cmd = f"""
+    for i in $(seq 1 18); do
+        if [ -f "{config_dir}/r${{i}}/frr.conf" ]; then
+            sudo install -m 775 -o frr -g frrvty -d "/etc/frr/r${{i}}"
+            sudo install -m 644 -o frr -g frr "{config_dir}/r${{i}}/frr.conf" "/etc/frr/r${{i}}/frr.conf"
+        fi
+    done
+    """
+
+    return BACKEND.shell(copy_cmd)
+
+
+def frrinit_all(net, action, routers=None):
+    """Run "frrinit.sh <action> rX" on every router, all routers concurrently."""
+    routers = ROUTERS if routers is None else routers
+    with ThreadPoolExecutor(max_workers=len(routers) or 1) as pool:
+        list(pool.map(lambda router_name: net[router_name].cmd(f"/usr/lib/frr/frrinit.sh {action} {router_name}"),
+                      routers))
+
+
+def restart_frr_routers(net, convergence_wait=70):
+    """Restart all FRR routers in topology and wait for OSPF convergence."""
+    # Stop all routers
+    frrinit_all(net, "stop")
+
+    BACKEND.sleep(5)
+
+    # Restart all routers
+    frrinit_all(net, "start")
+
+    # Wait for OSPF convergence
+    BACKEND.sleep(convergence_wait)
+
+    return True
+
+
+def wait_for_convergence(net, timeout=120, interval=2, stable_polls=3, areas=None):
+    """
+    Poll the kernel FIB of every router until each one has an OSPF route to
+    every host subnet and no router's OSPF routes changed for stable_polls
+    consecutive polls.
+
+    Args:
+        net: Mininet network
+        timeout: Maximum seconds to wait
+        interval: Seconds between two polls
+        stable_polls: Consecutive unchanged polls required
+        areas: OSPF area plan (stub areas get a default route instead of some subnets)
+
+    Returns:
+        tuple: (converged, seconds waited)
+    """
+    # OSPF routes expected on each router: every host subnet but its own
+    if areas is None:
+        subnets = {rname: ip.rsplit('.', 1)[0] + '.0/24' for _, rname, _, ip in HOST_ROUTER_LINKS}
+        expected = {r: set(subnets.values()) - {subnets.get(r)} for r in ROUTERS}
+    else:
+        expected = expected_ospf_routes(areas)
+    start = BACKEND.clock()
+    previous = None
+    unchanged = 0
+
+    while True:
+        fibs = {r: net[r].cmd("ip -4 route show proto ospf") for r in ROUTERS}
+        complete = all(
+            expected[r] <= {line.split()[0] for line in fib.splitlines() if line.strip()}
+            for r, fib in fibs.items()
+        )
+        unchanged = unchanged + 1 if complete and fibs == previous else 0
+        previous = fibs
+
+        elapsed = BACKEND.clock() - start
+        if unchanged >= stable_polls:
+            return True, elapsed
+        if elapsed >= timeout:
+            return False, elapsed
+        BACKEND.sleep(interval)
+
+
+class MininetBackend:
+    """
+    Real emulation backend: Mininet network with FRR, wall-clock waits and
+    commands in the host shell. See emulation_backend.py for record/replay.
+    """
+
+    # The network supports the interactive Mininet CLI
+    interactive = True
+
+    def __init__(self, hostless=False):
+        # Host-less edge mode: host subnets inside the edge routers (see attach_edge_subnets())
+        self.hostless = hostless
+        self.lock = EmulationLock()
+
+    def start_network(self):
+        """
+        Reap the leftovers of the previous run, start the Mininet topology,
+        assign the router addresses, start FRR on every router and wait for
+        the initial OSPF convergence. If any step fails, whatever was started
+        is stopped and the lock is released.
+
+        Returns:
+            Mininet: Running network (a HostlessNetwork in host-less edge mode)
+        """
+        self.lock.acquire()
+        net = None
+        try:
+            reap_stale_state(self.lock.previous)
+
+            topo = NetworkTopo(hostless=self.hostless)
+            net = Mininet(topo=topo)
+            # Record the nodes first, so the next run can reap them after a crash
+            self.lock.record(node_record(net))
+            net.start()
+
+            # Assign IP addresses to router interfaces (host-router links)
+            if self.hostless:
+                attach_edge_subnets(net, topo.host_router_links)
+            else:
+                for hname, rname, intfName, ip in topo.host_router_links:
+                    net[rname].setIP(ip, intf=intfName)
+
+            # Assign IP addresses to router interfaces (router-router links)
+            for rA, rB, intfA, intfB, ipA, ipB in topo.router_links:
+                net[rA].setIP(ipA, intf=intfA)
+                net[rB].setIP(ipB, intf=intfB)
+
+            # Start FRR daemons on each router
+            frrinit_all(net, "start")
+
+            self.sleep(10)
+
+            # Wait for initial OSPF convergence
+            self.sleep(60)
+        except BaseException:
+            try:
+                if net is not None:
+                    self._teardown(net)
+            except Exception:
+                # Still recorded in the lock file: the next run reaps it
+                pass
+            finally:
+                self.lock.release()
+            raise
+
+        return HostlessNetwork(net, topo.host_router_links) if self.hostless else net
+
+    def _teardown(self, net):
+        """Stop FRR, delete the links in bulk, stop Mininet and clear the node record."""
+        frrinit_all(net, "stop")
+        delete_links(net)
+        # Already deleted above, Mininet would delete them one command at a time
+        net.links = []
+        net.stop()
+        self.lock.record({})
+
+    def stop_network(self, net):
+        """
+        Stop FRR on every router concurrently, delete the links in bulk and
+        stop the Mininet network.
+        """
+        if isinstance(net, HostlessNetwork):
+            net = net.net
+        try:
+            self._teardown(net)
+        finally:
+            self.lock.release()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def clock(self):
+        return time.time()
+
+    def shell(self, cmd, timeout=120):
+        return run_shell_command(cmd, timeout)
+
+
+# Backend used by every orchestration function (see set_backend())
+BACKEND = MininetBackend()
+
+
+def set_backend(backend):
+    """
+    Select the emulation backend of the orchestration functions.
+
+    Returns:
+        The previous backend
+    """
+    global BACKEND
+    previous, BACKEND = BACKEND, backend
+    return previous
+
+
+def start_network():
+    """Start the network of the current backend (see MininetBackend.start_network())."""
+    return BACKEND.start_network()
+
+
+def stop_network(net):
+    """Stop a network started by start_network()."""
+    BACKEND.stop_network(net)
+
+
+def probe_options(model):
+    """
+    icmp_prober.py settings matching the model's traceroute options
+    (-m max TTL, -w wait, -q queries; traceroute defaults otherwise).
+    """
+    tokens = model.traceroute_options.split()
+    options = {"max_ttl": 30, "wait": 5.0, "queries": 3}
+    for flag, key, cast in (("-m", "max_ttl", int), ("-w", "wait", float), ("-q", "queries", int)):
+        if flag in tokens[:-1]:
+            options[key] = cast(tokens[tokens.index(flag) + 1])
+    return options
+
+
+def run_prober(net, src, dsts, model, flows=0):
+    """
+    Trace from host src to every host in dsts with one icmp_prober.py run
+    inside src's namespace (Paris-style UDP flows if flows is set).
+
+    Returns:
+        dict: Destination host -> prober result (missing if the prober failed)
+    """
+    ips = {net[dst].IP(): dst for dst in dsts}
+    output = net[src].cmd(prober_command(list(ips), flows=flows, **probe_options(model))).strip()
+
+    try:
+        results = json.loads(output.splitlines()[-1]) if output else []
+    except ValueError:
+        results = []
+    return {ips[result["dst"]]: result for result in results if result["dst"] in ips}
+
+
+def probe_host(net, src, dsts, model):
+    """
+    Trace from host src to every host in dsts with one icmp_prober.py run.
+
+    Returns:
+        dict: Destination host -> "traceroute -n" formatted output ("" if the prober failed)
+    """
+    results = run_prober(net, src, dsts, model)
+    max_ttl = probe_options(model)["max_ttl"]
+    return {dst: format_traceroute(results[dst], max_ttl) if dst in results else "" for dst in dsts}
+
+
+def probe_pairs(net, pairs, probe):
+    """
+    Run probe(src, dsts) once per source host of pairs, all sources concurrently.
+
+    Returns:
+        dict: (src, dst) -> what probe() returned for dst
+    """
+    destinations = {}
+    for src, dst in pairs:
+        destinations.setdefault(src, []).append(dst)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(destinations) or 1) as pool:
+        futures = {src: pool.submit(probe, src, dsts) for src, dsts in destinations.items()}
+        for src, future in futures.items():
+            results.update({(src, dst): result for dst, result in future.result().items()})
+    return results
+
+
+def disable_icmp_ratelimit(net, nodes=None):
+    """
+    Let nodes (default: the routers) answer concurrent probes without ICMP
+    rate limiting, per peer or global.
+    """
+    for name in ROUTERS if nodes is None else nodes:
+        net[name].cmd("sysctl -w net.ipv4.icmp_ratelimit=0 net.ipv4.icmp_ratemask=0")
+
+
+def enable_flow_hashing(net):
+    """Spread ECMP routes per flow (layer 4 hash) rather than per address pair."""
+    for router_name in ROUTERS:
+        net[router_name].cmd("sysctl -w net.ipv4.fib_multipath_hash_policy=1")
+
+
+def trace_pair(net, src, dst, model, prober="traceroute"):
+    """
+    Run a single traceroute from host src to host dst with the model's probe
+    options, with the traceroute command or the built-in ICMP prober.
+    """
+    if prober == "icmp":
+        return probe_host(net, src, [dst], model)[dst]
+
+    # Connectivity test
+    ping_options = f"{model.ping_options} " if model.ping_options else ""
+    net[src].cmd(f"ping -c 1 {ping_options}{net[dst].IP()}")
+
+    # Execute traceroute
+    return net[src].cmd(f"traceroute {model.traceroute_options} {net[dst].IP()}")
+
+
+def save_traceroutes(net, filename, model, pairs=None, prober="traceroute"):
+    """
+    Save the traceroutes between all hosts in a single TXT file.
+
+    With the "traceroute" prober the pairs are traced one after the other;
+    with "icmp" every source host runs one icmp_prober.py for all of its
+    destinations, all sources at the same time.
+
+    Args:
+        net: Mininet network
+        filename: TXT filename to generate
+        model: Cost model plugin (probe options and delay between traceroutes)
+        pairs: (src, dst) pairs to trace, e.g. a probe plan (default: all host pairs)
+        prober: "traceroute" or "icmp"
+
+    Returns:
+        str: Generated filename
+    """
+    if pairs is None:
+        hosts = sorted(HOSTS)
+        pairs = [(src, dst) for src in hosts for dst in hosts if src != dst]
+
+    if prober == "icmp":
+        disable_icmp_ratelimit(net)
+        traces = probe_pairs(net, pairs, lambda src, dsts: probe_host(net, src, dsts, model))
+
+        with open(filename, 'w') as f:
+            for src, dst in pairs:
+                f.write(f"Traceroute from {src} to {dst}:\n")
+                f.write(traces[(src, dst)] + "\n\n")
+        return filename
+
+    with open(filename, 'w') as f:
+        for src, dst in pairs:
+            f.write(f"Traceroute from {src} to {dst}:\n")
+            f.write(trace_pair(net, src, dst, model) + "\n\n")
+            BACKEND.sleep(model.trace_delay)
+
+    return filename
+
+
+def ecmp_paths_filename(sim_dir, percentage):
+    """Path of the multi-flow path sets stored next to traceroutes_asymmetry_Xpercent.txt."""
+    return os.path.join(sim_dir, f"ecmp_paths_asymmetry_{percentage}percent.json")
+
+
+def save_flow_traceroutes(net, filename, paths_filename, model, pairs=None, flows=8):
+    """
+    Multi-flow (Paris-style) collection: every source host probes all of its
+    destinations with 'flows' UDP flows in one icmp_prober.py run, all sources
+    concurrently, with per-flow ECMP hashing on the routers.
+
+    Args:
+        net: Mininet network
+        filename: TXT file with, per pair, the traceroute of a flow on its most frequent path
+        paths_filename: JSON file with the observed path set of every pair
+        model: Cost model plugin (probe options)
+        pairs: (src, dst) pairs to trace (default: all host pairs)
+        flows: Flows per pair
+
+    Returns:
+        dict: Number of pairs with more than one observed path, and the file names
+    """
+    if pairs is None:
+        hosts = sorted(HOSTS)
+        pairs = [(src, dst) for src in hosts for dst in hosts if src != dst]
+
+    enable_flow_hashing(net)
+    disable_icmp_ratelimit(net, ROUTERS + sorted(HOSTS))
+    results = probe_pairs(net, pairs, lambda src, dsts: run_prober(net, src, dsts, model, flows))
+    max_ttl = probe_options(model)["max_ttl"]
+    owners = interface_owner_map()
+
+    path_sets = {}
+    with open(filename, 'w') as f:
+        for src, dst in pairs:
+            result = results.get((src, dst))
+            f.write(f"Traceroute from {src} to {dst}:\n")
+            if result is None:
+                f.write("\n\n")
+                path_sets[f"{src}->{dst}"] = []
+                continue
+            f.write(format_traceroute(path_flow(result, result["paths"][0]), max_ttl) + "\n\n")
+
+            path_sets[f"{src}->{dst}"] = []
+            for path in result["paths"]:
+                observed = observed_router_path(path_flow(result, path)["hops"], host_ip(dst), owners)
+                path_sets[f"{src}->{dst}"].append({
+                    "hops": path["hops"],
+                    "routers": observed["routers"],
+                    "reached": observed["reached"],
+                    "flows": path["flows"],
+                    "frequency": path["frequency"],
+                })
+
+    multipath_pairs = sum(1 for paths in path_sets.values() if len(paths) > 1)
+    with open(paths_filename, 'w') as f:
+        json.dump({"flows": flows, "multipath_pairs": multipath_pairs, "pairs": path_sets}, f, indent=2)
+
+    return {"file": os.path.basename(paths_filename), "multipath_pairs": multipath_pairs}
+
+
+def failover_filename(sim_dir, percentage):
+    """Path of the failure scenario results stored next to traceroutes_asymmetry_Xpercent.txt."""
+    return os.path.join(sim_dir, f"failover_asymmetry_{percentage}percent.json")
+
+
+def run_failure_scenario(net, filename, scenario, ospf_costs, pairs=None):
+    """
+    Run a link failure/recovery scenario (see failure_scenarios.py) on the
+    converged network: log the FIB changes of every router and ping every
+    pair continuously while the events are applied at their times, then
+    restore the links and costs and save the per-event latencies.
+
+    Args:
+        net: Mininet network
+        filename: JSON file with the analyzed scenario
+        scenario: Normalized scenario
+        ospf_costs: Cost table of the cell (restored after cost events)
+        pairs: (src, dst) pairs to probe (default: all host pairs)
+
+    Returns:
+        dict: File name and per-event headline numbers
+    """
+    if pairs is None:
+        hosts = sorted(HOSTS)
+        pairs = [(src, dst) for src in hosts for dst in hosts if src != dst]
+
+    log_dir = tempfile.mkdtemp(prefix="failover_")
+    fib_logs = {r: os.path.join(log_dir, f"{r}.route") for r in ROUTERS}
+    ping_logs = {(src, dst): os.path.join(log_dir, f"{src}-{dst}.ping") for src, dst in pairs}
+
+    # Background FIB monitors and pings, one shell command per node
+    pids = {r: net[r].cmd(monitor_command(log)).split() for r, log in fib_logs.items()}
+    sources = {}
+    for (src, dst), log in ping_logs.items():
+        sources.setdefault(src, []).append(ping_command(net[dst].IP(), scenario["probe_interval"], log))
+    for src, commands in sources.items():
+        pids[src] = net[src].cmd("; ".join(commands)).split()
+
+    try:
+        start = BACKEND.clock()
+        event_times = []
+        for event in scenario["events"]:
+            BACKEND.sleep(max(0.0, start + event["at"] - BACKEND.clock()))
+            event_times.append(BACKEND.clock())
+            for router, command in event_commands(event):
+                net[router].cmd(command)
+        BACKEND.sleep(max(0.0, start + scenario["duration"] - BACKEND.clock()))
+        end = BACKEND.clock()
+    finally:
+        for node, node_pids in pids.items():
+            if node_pids:
+                net[node].cmd(f"kill {' '.join(node_pids)}")
+        for router, command in restore_commands(scenario, ospf_costs):
+            net[router].cmd(command)
+
+    report = analyze_scenario(
+        scenario, event_times, start, end,
+        {r: net[r].cmd(f"cat {log}") for r, log in fib_logs.items()},
+        {(src, dst): net[src].cmd(f"cat {log}") for (src, dst), log in ping_logs.items()},
+    )
+    shutil.rmtree(log_dir, ignore_errors=True)
+
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    return {
+        "file": os.path.basename(filename),
+        "events": [{key: event[key] for key in ("time", "action", "link", "fib_reconvergence",
+                                                "pairs_affected", "pairs_unrecovered")}
+                   for event in report["events"]],
+    }
+
+
+def create_simulation_directory(sim_number, base_dir="./simulations"):
+    """
+    Create directory for a specific simulation.
+
+    Args:
+        sim_number: Simulation number
+        base_dir: Base directory for simulations
+
+    Returns:
+        str: Path of created directory
+    """
+    sim_dir = os.path.join(base_dir, f"sim{sim_number}")
+    os.makedirs(sim_dir, exist_ok=True)
+    return sim_dir
+
+
+def save_simulation_metadata(sim_dir, sim_number, model, seed, percentages, areas=None):
+    """
+    Save simulation metadata to JSON file.
+
+    Args:
+        sim_dir: Simulation directory
+        sim_number: Simulation number
+        model: Cost model plugin (its describe_metadata() fields are included)
+        seed: Used seed
+        percentages: List of tested percentages
+        areas: OSPF area plan (see ospf_areas.area_plan()); default is a single area
+    """
+    metadata = {
+        "simulation_number": sim_number,
+        "timestamp": datetime.now().isoformat(),
+        "seed": seed,
+        **model.describe_metadata(),
+        "ospf_areas": describe_plan(areas) if areas is not None else None,
+        "asymmetry_percentages": percentages,
+        "description": f"Simulation {sim_number} with {model.description}, seed {seed}",
+    }
+
+    metadata_file = os.path.join(sim_dir, "simulation_metadata.json")
+    with open(metadata_file, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+
+def run_simulation(net, sim_dir, sim_number, model, percentages=None, seed=None,
+                   probe_redundancy=None, config_dir="./config", prober="traceroute", flows=0, areas=None,
+                   failure_scenario=None, events=None, corpus=None):
+    """
+    Execute the asymmetry tests of one simulation for every percentage.
+
+    Args:
+        net: Mininet network
+        sim_dir: Simulation directory
+        sim_number: Simulation number
+        model: Cost model plugin
+        percentages: List of percentages to test
+        seed: Seed for reproducibility
+        probe_redundancy: If set, trace only a probe plan covering every directed
+                          link this many times instead of all host pairs
+        config_dir: Configuration directory
+        prober: "traceroute" or "icmp" (see save_traceroutes())
+        flows: If set, collect this many Paris-style flows per pair and store
+               the observed ECMP path sets (see save_flow_traceroutes())
+        areas: OSPF area plan (see ospf_areas.area_plan()); default is a single area
+        failure_scenario: If set, run this link failure/recovery scenario after
+                          the traceroutes of every percentage (see run_failure_scenario())
+        events: Event log of the sweep (default: <sim_dir>/events.jsonl, see sweep_log.py)
+        corpus: CorpusWriter of the sweep's corpus store (default: one opened for this simulation)
+
+    Returns:
+        dict: Test results with information about generated files
+    """
+    if percentages is None:
+        percentages = DEFAULT_PERCENTAGES
+    corpus = corpus or CorpusWriter(corpus_store_dir(sim_dir))
+
+    # Stream phases and cell results to the event log (the sweep's, or one of our own)
+    log = events or EventLog(os.path.join(sim_dir, EVENT_LOG))
+    log.emit("simulation_start", sim=sim_number, sim_dir=sim_dir, seed=seed, params=model.params,
+             percentages=percentages, prober=prober, flows=flows,
+             ospf_areas=describe_plan(areas) if areas is not None else None,
+             simulation_type=model.simulation_type)
+    results = {}
+
+    # Save simulation metadata
+    save_simulation_metadata(sim_dir, sim_number, model, seed, percentages, areas)
+
+    # Test for each asymmetry percentage (including 0%)
+    for percentage in percentages:
+        cell = {"sim": sim_number, "percentage": percentage}
+
+        # Cost table of this cell, kept to verify the collected paths
+        log.emit("phase", phase="configure", **cell)
+        ospf_costs = model.cost_table(percentage, seed)
+
+        if not create_frr_configs(ospf_costs, config_dir, areas):
+            log.emit("cell_skipped", reason="FRR configuration failed", **cell)
+            continue
+
+        # Copy configurations to /etc/frr and restart all FRR routers
+        log.emit("phase", phase="restart", **cell)
+        if not copy_configs_to_frr(config_dir) or not restart_frr_routers(net, convergence_wait=0):
+            log.emit("cell_skipped", reason="FRR deployment failed", **cell)
+            continue
+
+        # Wait for complete and stable FIBs, at most the model's convergence wait;
+        # traceroutes taken during reconvergence would not match the cell's costs
+        converged, seconds = wait_for_convergence(net, timeout=model.convergence_wait, areas=areas)
+        log.emit("converged", converged=converged, seconds=seconds, **cell)
+        if not converged:
+            log.emit("cell_skipped", reason="OSPF did not converge", **cell)
+            continue
+
+        # Save FIB/LSDB ground truth right after convergence
+        log.emit("phase", phase="snapshot", **cell)
+        snapshot = save_routing_snapshot(
+            net,
+            snapshot_filename(sim_dir, percentage),
+            metadata={"percentage": percentage, "seed": seed, "convergence_seconds": seconds}
+        )
+
+        # Probe only the pairs needed to cover every directed link
+        pairs = None
+        probe_plan = None
+        if probe_redundancy:
+            pairs = plan_probes(ospf_costs, probe_redundancy)["pairs"]
+            probe_plan = [f"{src}->{dst}" for src, dst in pairs]
+
+        # Execute and save traceroutes in simulation directory
+        log.emit("phase", phase="trace", **cell)
+        filename = os.path.join(sim_dir, f"traceroutes_asymmetry_{percentage}percent.txt")
+        ecmp_paths = None
+        if flows:
+            ecmp_paths = save_flow_traceroutes(
+                net, filename, ecmp_paths_filename(sim_dir, percentage), model, pairs, flows)
+        else:
+            save_traceroutes(net, filename, model, pairs, prober)
+
+        # Compare with SPF prediction, re-trace disagreeing pairs
+        log.emit("phase", phase="verify", **cell)
+        verification = verify_and_retrace(
+            filename,
+            ospf_costs,
+            trace_pair=lambda src, dst: trace_pair(net, src, dst, model, prober),
+            sleep=BACKEND.sleep,
+            areas=areas
+        )
+
+        # Append the verified cell to the sweep's packed corpus, replacing an earlier sweep's
+        _, corpus_replaced = append_collected_cell(sim_dir, percentage, filename, corpus)
+
+        # Inject the link failures last: they leave FRR state behind until the next restart
+        failover = None
+        if failure_scenario:
+            log.emit("phase", phase="failover", **cell)
+            failover = run_failure_scenario(
+                net, failover_filename(sim_dir, percentage), failure_scenario, ospf_costs, pairs)
+
+        # Output files of the cell, for the throughput metrics
+        written = [filename, snapshot]
+        if flows:
+            written.append(ecmp_paths_filename(sim_dir, percentage))
+        if failure_scenario:
+            written.append(failover_filename(sim_dir, percentage))
+
+        log.emit("cell", file=os.path.basename(filename), routing_snapshot=os.path.basename(snapshot),
+                 verification=verification, probe_plan=probe_plan, ecmp_paths=ecmp_paths,
+                 failover=failover, corpus_replaced=corpus_replaced, **traceroute_file_stats(filename),
+                 bytes_written=sum(os.path.getsize(path) for path in written if os.path.exists(path)),
+                 **cell)
+        results[f'{percentage}%'] = filename
+
+    log.emit("simulation_end", sim=sim_number)
+
+    # Save results summary in simulation directory, materialized from the log
+    write_summary(os.path.join(sim_dir, "results_summary.json"),
+                  materialize_results_summary(log.filename, sim_number))
+    if events is None:
+        log.close()
+
+    return results
+
+
+def run_multiple_simulations(model_cls, sim_configs, base_dir="./simulations", percentages=None, metrics=None):
+    """
+    Execute multiple simulations of one cost model with different configurations.
+
+    Every phase and cell result is appended to <base_dir>/events.jsonl as it
+    happens (see sweep_log.py); the summaries are materialized from that log,
+    and the sweep metrics (see sweep_metrics.py) follow it.
+
+    Args:
+        model_cls: Cost model plugin class
+        sim_configs: List of dictionaries with configurations for each simulation
+                    Format: [{"seed": 123, <model parameters>, "probe_redundancy": None,
+                              "prober": "traceroute", "flows": 0, "ospf_areas": None,
+                              "stub_areas": None, "failure_scenario": None}, ...]
+        base_dir: Base directory for simulations
+        percentages: List of percentages to test
+        metrics: Sweep metrics (default: written to <base_dir>/metrics.prom)
+
+    Returns:
+        dict: Results of all simulations
+    """
+    if percentages is None:
+        percentages = DEFAULT_PERCENTAGES
+
+    os.makedirs(base_dir, exist_ok=True)
+    if metrics is None:
+        metrics = SweepMetrics(os.path.join(base_dir, METRICS_FILE))
+    log = EventLog(os.path.join(base_dir, EVENT_LOG), listeners=[metrics.observe_event])
+    log.emit("sweep_start", base_directory=base_dir, percentages=percentages,
+             simulation_type=model_cls.simulation_type, cost_model=model_cls.name,
+             total_simulations=len(sim_configs))
+
+    # One corpus writer for the whole sweep: its intern tables are loaded once
+    corpus = CorpusWriter(os.path.join(base_dir, "corpus"))
+
+    for sim_number, config in enumerate(sim_configs, 1):
+        # Create directory for this simulation
+        sim_dir = create_simulation_directory(sim_number, base_dir)
+        log.emit("simulation", sim=sim_number, sim_dir=sim_dir, config=config)
+
+        # Execute automatic asymmetry tests for this simulation
+        net = None
+        try:
+            log.emit("phase", sim=sim_number, phase="start_network")
+            net = start_network()
+            run_simulation(
+                net=net,
+                sim_dir=sim_dir,
+                sim_number=sim_number,
+                model=model_cls.from_config(config),
+                percentages=percentages,
+                seed=config.get('seed'),
+                probe_redundancy=config.get('probe_redundancy'),
+                prober=config.get('prober', 'traceroute'),
+                flows=config.get('flows', 0),
+                areas=area_plan(config['ospf_areas'], stub=config.get('stub_areas'))
+                      if config.get('ospf_areas') else None,
+                failure_scenario=config.get('failure_scenario'),
+                events=log,
+                corpus=corpus
+            )
+
+        except Exception as e:
+            log.emit("simulation_error", sim=sim_number, error=str(e))
+            # Keep the summary of the cells completed before the failure
+            results_summary = materialize_results_summary(log.filename, sim_number)
+            if results_summary is not None:
+                write_summary(os.path.join(sim_dir, "results_summary.json"), results_summary)
+        finally:
+            if net is not None:
+                log.emit("phase", sim=sim_number, phase="stop_network")
+                stop_network(net)
+
+    log.emit("sweep_end")
+    log.close()
+
+    # Save global summary of all simulations, materialized from the log
+    global_summary = materialize_global_summary(log.filename)
+    write_summary(os.path.join(base_dir, "global_summary.json"), global_summary)
+
+    return global_summary["simulations"]
+
+
+def run(model_cls, auto_multi_sim=False, sim_configs=None, asymmetry_percentages=None,
+        single_traceroute=None, base_sim_dir="./simulations", prober="traceroute", metrics=None):
+    """
+    Run the network with FRR and optional automated multiple simulations.
+
+    Args:
+        model_cls: Cost model plugin class
+        auto_multi_sim: If True, automatically execute multiple simulations
+        sim_configs: List of configurations for simulations
+        asymmetry_percentages: List of percentages to test
+        single_traceroute: If specified, execute traceroute collection into this file
+        base_sim_dir: Base directory for simulations
+        prober: "traceroute" or "icmp" for the single traceroute collection
+        metrics: Sweep metrics of the multiple simulations (see run_multiple_simulations())
+    """
+    if auto_multi_sim:
+        if not sim_configs:
+            raise ValueError("auto_multi_sim needs at least one simulation configuration")
+        return run_multiple_simulations(
+            model_cls=model_cls,
+            sim_configs=sim_configs,
+            base_dir=base_sim_dir,
+            percentages=asymmetry_percentages,
+            metrics=metrics
+        )
+
+    # Single simulation on the running baseline, with an interactive CLI
+    net = start_network()
+    try:
+        if single_traceroute:
+            save_traceroutes(net, single_traceroute, model_cls(), prober=prober)
+
+        if BACKEND.interactive:
+            CLI(net)
+
+    finally:
+        stop_network(net)
+
+    return True
+
+
+def build_sim_configs(model_cls, args):
+    """
+    Simulation configurations from the command line: the given seeds,
+    seeds found by seed_search.py in the target asymmetry band, or random seeds.
+
+    Returns:
+        list: Configuration dictionaries for run_multiple_simulations()
+
+    Raises:
+        SystemExit: If the seed search finds no seed in the target band
+    """
+    params = model_cls.params_from_args(args)
+    # Options shared by every simulation besides the model parameters
+    shared = {'ospf_areas': args.ospf_areas, 'stub_areas': args.stub_areas,
+              'failure_scenario': load_scenario(args.failure_scenario) if args.failure_scenario else None}
+    sim_configs = []
+
+    if args.sim_seeds:
+        # Use specified seeds
+        for seed in args.sim_seeds:
+            sim_configs.append({'seed': seed, **params, 'probe_redundancy': args.probe_redundancy,
+                                'prober': args.prober, 'flows': args.flows, **shared})
+    elif args.target_asymmetry:
+        # Search seeds whose predicted asymmetry falls in the target band
+        plan = area_plan(args.ospf_areas, stub=args.stub_areas) if args.ospf_areas else None
+        for seed, asymmetry in search_seeds(model_cls.name, args.target_asymmetry, args.num_sims,
+                                            args.asymmetry_percentages, params, areas=plan):
+            sim_configs.append({
+                'seed': seed,
+                **params,
+                'probe_redundancy': args.probe_redundancy,
+                'prober': args.prober,
+                'flows': args.flows,
+                **shared,
+                'predicted_asymmetry': {f'{p}%': a for p, a in asymmetry.items()}
+            })
+        low, high = args.target_asymmetry
+        if not sim_configs:
+            raise SystemExit(f"No seed found with predicted asymmetry in [{low}, {high}]")
+        if len(sim_configs) < args.num_sims:
+            print(f"Only {len(sim_configs)} of {args.num_sims} seeds found in [{low}, {high}], "
+                  f"running {len(sim_configs)} simulations")
+    else:
+        # Generate seeds automatically
+        for _ in range(args.num_sims):
+            sim_configs.append({'seed': random.randint(1, 10000), **params,
+                                'probe_redundancy': args.probe_redundancy, 'prober': args.prober,
+                                'flows': args.flows, **shared})
+
+    return sim_configs
+
+
+def build_parser(model_cls, description=None, select_model=False):
+    """
+    Command-line parser with the common options and those of the cost model
+    (plus --cost-model itself when the model is chosen on the command line).
+    """
+    parser = argparse.ArgumentParser(
+        description=description or f'Automated multiple simulation tests with {model_cls.description}',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    if select_model:
+        parser.add_argument('--cost-model', choices=sorted(COST_MODELS), default=model_cls.name,
+                          help='Cost model plugin (its options are listed below)')
+
+    # Parameters for multiple simulations
+    parser.add_argument('--multi-sim', action='store_true',
+                      help='Execute multiple simulations automatically')
+    parser.add_argument('--sim-seeds', type=int, nargs='+',
+                      help='List of seeds for each simulation (e.g. --sim-seeds 123 456 789)')
+    parser.add_argument('--num-sims', type=int, default=5,
+                      help='Number of simulations to execute (default: 5, ignored if --sim-seeds specified)')
+    parser.add_argument('--base-sim-dir', type=str, default='./simulations',
+                      help='Base directory for simulations (default: ./simulations)')
+
+    # Asymmetry parameters (applied to all simulations)
+    parser.add_argument('--asymmetry-percentages', type=int, nargs='+',
+                      help='Asymmetry percentages to test (e.g. --asymmetry-percentages 0 30 60 100)')
+
+    # Cost model parameters (applied to all simulations)
+    model_cls.add_arguments(parser.add_argument_group(f'{model_cls.name} cost model'))
+
+    # Seed search (replaces automatic seed generation)
+    parser.add_argument('--target-asymmetry', type=float, nargs=2, metavar=('LOW', 'HIGH'),
+                      help='Only use seeds whose predicted share of asymmetric host pairs is in [LOW, HIGH] at every non-zero percentage')
+
+    # Probe planning (applied to all simulations)
+    parser.add_argument('--probe-redundancy', type=int,
+                      help='Trace only a probe plan covering every directed router link this many times (default: all host pairs)')
+    parser.add_argument('--prober', choices=['traceroute', 'icmp'], default='traceroute',
+                      help='One traceroute per pair, or one concurrent ICMP prober per source host (icmp_prober.py)')
+    parser.add_argument('--flows', type=int, default=0,
+                      help='Trace this many Paris-style UDP flows per pair and store the observed ECMP path sets (0: off)')
+
+    # OSPF areas (applied to all simulations, see ospf_areas.py)
+    parser.add_argument('--ospf-areas', choices=['tier', 'site'],
+                      help='Split OSPF into areas per router tier or per site group (default: single area 0)')
+    parser.add_argument('--stub-areas', choices=['stub', 'totally-stubby'],
+                      help='Make every non-backbone area stub or totally stubby (with --ospf-areas)')
+
+    # Link failure injection (applied to every cell, see failure_scenarios.py)
+    parser.add_argument('--failure-scenario', type=str,
+                      help='JSON scenario of timed link down/up/cost events to run after the traceroutes of every cell')
+
+    # Sweep metrics in Prometheus format (see sweep_metrics.py)
+    parser.add_argument('--metrics-file', type=str,
+                      help='Textfile with the sweep metrics, replaced after every event (default: <base-sim-dir>/metrics.prom)')
+    parser.add_argument('--metrics-port', type=int,
+                      help='Also serve the sweep metrics on http://127.0.0.1:PORT/metrics')
+
+    # Legacy parameters (for single simulation)
+    parser.add_argument('--single-traceroute', type=str,
+                      help='Execute complete traceroute collection and save with specified prefix')
+    parser.add_argument('--log-level', type=str, default='info', choices=['debug', 'info', 'warning', 'error'],
+                      help='Logging level (default: info)')
+
+    # Emulation backend (see emulation_backend.py)
+    parser.add_argument('--hostless', action='store_true',
+                      help='Realize the host subnets as VRFs inside their edge routers instead of host namespaces')
+    parser.add_argument('--backend', choices=['mininet', 'record', 'replay'], default='mininet',
+                      help='Mininet emulation, Mininet emulation recorded to --recording, or root-free replay')
+    parser.add_argument('--recording', type=str,
+                      help='Recording written by the record backend, replayed by the replay backend '
+                           '(replay answers unrecorded commands from the SPF predictor)')
+
+    return parser
+
+
+def main(cost_model=None, description=None):
+    """
+    Command-line entry point. The cost model is the given one, or the one
+    chosen with --cost-model (whose options are then added to the parser).
+    """
+    select_model = cost_model is None
+    if select_model:
+        selector = argparse.ArgumentParser(add_help=False)
+        selector.add_argument('--cost-model', choices=sorted(COST_MODELS), default='random_different')
+        cost_model = selector.parse_known_args()[0].cost_model
+
+    model_cls = COST_MODELS[cost_model]
+    parser = build_parser(model_cls, description, select_model)
+    args = parser.parse_args()
+
+    setLogLevel(args.log_level)
+    if args.stub_areas and not args.ospf_areas:
+        parser.error('--stub-areas needs --ospf-areas')
+
+    if args.hostless:
+        set_backend(MininetBackend(hostless=True))
+    if args.backend == 'record':
+        if not args.recording:
+            parser.error('--backend record needs --recording')
+        set_backend(RecordBackend(BACKEND, args.recording))
+    elif args.backend == 'replay':
+        set_backend(ReplayBackend(args.recording))
+
+    start = time.perf_counter()
+    if args.multi_sim:
+        sim_configs = build_sim_configs(model_cls, args)
+        os.makedirs(args.base_sim_dir, exist_ok=True)
+        metrics = SweepMetrics(args.metrics_file or os.path.join(args.base_sim_dir, METRICS_FILE))
+        if args.metrics_port:
+            serve_metrics(metrics, args.metrics_port)
+        result = run(
+            model_cls,
+            auto_multi_sim=True,
+            sim_configs=sim_configs,
+            asymmetry_percentages=args.asymmetry_percentages,
+            base_sim_dir=args.base_sim_dir,
+            metrics=metrics
+        )
+    else:
+        # Single simulation (original behavior)
+        result = run(model_cls, single_traceroute=args.single_traceroute, prober=args.prober)
+
+    if args.backend == 'replay':
+        print(f"Replayed in {time.perf_counter() - start:.3f} s ({BACKEND.clock():.0f} s emulated)")
+    return result
+
+
+if __name__ == '__main__':
+    main()
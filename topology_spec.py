@@ -0,0 +1,220 @@
+#!/usr/bin/python3
+"""
+Static description of the 18-router, 12-host SD-WAN topology.
+
+Same tables as NetworkTopo.build(), kept free of Mininet imports so that
+offline analysis (path prediction, verification, tomography) can use them
+without root privileges or an emulated network.
+"""
+
+import random
+
+# Hosts: name -> (address/prefix, default gateway)
+HOSTS = {
+    'h11': ('10.0.11.100/24', '10.0.11.10'),
+    'h12': ('10.0.12.100/24', '10.0.12.10'),
+    'h22': ('10.0.22.100/24', '10.0.22.10'),
+    'h23': ('10.0.23.100/24', '10.0.23.10'),
+    'h33': ('10.0.33.100/24', '10.0.33.10'),
+    'h34': ('10.0.34.100/24', '10.0.34.10'),
+    'h13': ('10.0.13.100/24', '10.0.13.10'),
+    'h14': ('10.0.14.100/24', '10.0.14.10'),
+    'h24': ('10.0.24.100/24', '10.0.24.10'),
+    'h25': ('10.0.25.100/24', '10.0.25.10'),
+    'h35': ('10.0.35.100/24', '10.0.35.10'),
+    'h36': ('10.0.36.100/24', '10.0.36.10'),
+}
+
+# Edge network configuration - /24 subnets
+HOST_ROUTER_LINKS = [
+    ('h11', 'r1', 'r1-eth0', '10.0.11.10/24'),
+    ('h12', 'r2', 'r2-eth0', '10.0.12.10/24'),
+    ('h22', 'r7', 'r7-eth0', '10.0.22.10/24'),
+    ('h23', 'r8', 'r8-eth0', '10.0.23.10/24'),
+    ('h33', 'r13', 'r13-eth0', '10.0.33.10/24'),
+    ('h34', 'r14', 'r14-eth0', '10.0.34.10/24'),
+    ('h13', 'r5', 'r5-eth0', '10.0.13.10/24'),
+    ('h14', 'r6', 'r6-eth0', '10.0.14.10/24'),
+    ('h24', 'r11', 'r11-eth0', '10.0.24.10/24'),
+    ('h25', 'r12', 'r12-eth0', '10.0.25.10/24'),
+    ('h35', 'r17', 'r17-eth0', '10.0.35.10/24'),
+    ('h36', 'r18', 'r18-eth0', '10.0.36.10/24'),
+]
+
+# Router-to-router /30 point-to-point links
+ROUTER_LINKS = [
+    ('r1', 'r2', 'r1-eth1', 'r2-eth1', '10.0.1.1/30', '10.0.1.2/30'),
+    ('r1', 'r3', 'r1-eth2', 'r3-eth1', '10.0.1.5/30', '10.0.1.6/30'),
+    ('r2', 'r4', 'r2-eth2', 'r4-eth1', '10.0.1.9/30', '10.0.1.10/30'),
+    ('r3', 'r4', 'r3-eth2', 'r4-eth2', '10.0.1.13/30', '10.0.1.14/30'),
+    ('r3', 'r5', 'r3-eth3', 'r5-eth1', '10.0.1.17/30', '10.0.1.18/30'),
+    ('r4', 'r6', 'r4-eth3', 'r6-eth1', '10.0.1.21/30', '10.0.1.22/30'),
+    ('r5', 'r6', 'r5-eth2', 'r6-eth2', '10.0.1.25/30', '10.0.1.26/30'),
+    ('r4', 'r9', 'r4-eth4', 'r9-eth1', '10.0.4.5/30', '10.0.4.6/30'),
+    ('r4', 'r10', 'r4-eth5', 'r10-eth1', '10.0.6.5/30', '10.0.6.6/30'),
+    ('r4', 'r16', 'r4-eth6', 'r16-eth1', '10.0.5.5/30', '10.0.5.6/30'),
+    ('r7', 'r8', 'r7-eth1', 'r8-eth1', '10.0.2.1/30', '10.0.2.2/30'),
+    ('r7', 'r9', 'r7-eth2', 'r9-eth2', '10.0.2.5/30', '10.0.2.6/30'),
+    ('r8', 'r10', 'r8-eth2', 'r10-eth2', '10.0.2.9/30', '10.0.2.10/30'),
+    ('r9', 'r10', 'r9-eth3', 'r10-eth3', '10.0.2.13/30', '10.0.2.14/30'),
+    ('r9', 'r11', 'r9-eth4', 'r11-eth1', '10.0.2.17/30', '10.0.2.18/30'),
+    ('r10', 'r15', 'r10-eth4', 'r15-eth1', '10.0.7.5/30', '10.0.7.6/30'),
+    ('r10', 'r16', 'r10-eth5', 'r16-eth2', '10.0.8.5/30', '10.0.8.6/30'),
+    ('r10', 'r12', 'r10-eth6', 'r12-eth1', '10.0.2.21/30', '10.0.2.22/30'),
+    ('r11', 'r12', 'r11-eth2', 'r12-eth2', '10.0.2.25/30', '10.0.2.26/30'),
+    ('r13', 'r14', 'r13-eth1', 'r14-eth1', '10.0.3.1/30', '10.0.3.2/30'),
+    ('r13', 'r15', 'r13-eth2', 'r15-eth2', '10.0.3.5/30', '10.0.3.6/30'),
+    ('r14', 'r16', 'r14-eth2', 'r16-eth3', '10.0.3.9/30', '10.0.3.10/30'),
+    ('r15', 'r16', 'r15-eth3', 'r16-eth4', '10.0.3.13/30', '10.0.3.14/30'),
+    ('r15', 'r17', 'r15-eth4', 'r17-eth1', '10.0.3.17/30', '10.0.3.18/30'),
+    ('r16', 'r18', 'r16-eth5', 'r18-eth1', '10.0.3.21/30', '10.0.3.22/30'),
+    ('r17', 'r18', 'r17-eth2', 'r18-eth2', '10.0.3.25/30', '10.0.3.26/30'),
+]
+
+ROUTERS = [f'r{i}' for i in range(1, 19)]
+
+# Tier of every router (hosts 1x, 2x and 3x); inter-tier links join r4, r9,
+# r10, r15 and r16 (see ospf_areas.py)
+ROUTER_TIERS = {router: (int(router[1:]) - 1) // 6 + 1 for router in ROUTERS}
+
+
+def host_ip(host_name, hosts=None):
+    """Return the bare address of a host (without prefix length)."""
+    hosts = HOSTS if hosts is None else hosts
+    return hosts[host_name][0].split('/')[0]
+
+
+def baseline_ospf_costs(router_links=None, host_router_links=None):
+    """
+    Cost table of the symmetric baseline: every interface has cost 1.
+
+    Returns:
+        dict: Dictionary with "router.interface" keys and OSPF cost 1 as values
+    """
+    router_links = ROUTER_LINKS if router_links is None else router_links
+    host_router_links = HOST_ROUTER_LINKS if host_router_links is None else host_router_links
+
+    ospf_costs = {}
+    for rA, rB, intfA, intfB, _, _ in router_links:
+        ospf_costs[f"{rA}.{intfA}"] = 1
+        ospf_costs[f"{rB}.{intfB}"] = 1
+    for _, router, interface, _ in host_router_links:
+        ospf_costs[f"{router}.{interface}"] = 1
+
+    return ospf_costs
+
+
+def generate_topology(num_routers=500, avg_degree=4, num_hosts=50, seed=42):
+    """
+    Generate a larger connected router topology in the same table format,
+    for scaling experiments of the offline analysis tools.
+
+    Routers are joined by a random spanning tree plus random extra links
+    up to the requested average degree. Router-router links get /30
+    subnets from 172.16.0.0/12 and hosts get /24 subnets from 10.128.0.0/9.
+
+    Args:
+        num_routers: Number of routers (named r1..rN)
+        avg_degree: Target average router degree
+        num_hosts: Number of hosts, each attached to a distinct random router
+        seed: Seed of the generator
+
+    Returns:
+        tuple: (router_links, host_router_links, hosts) as ROUTER_LINKS,
+               HOST_ROUTER_LINKS and HOSTS
+    """
+    rng = random.Random(seed)
+    routers = [f'r{i}' for i in range(1, num_routers + 1)]
+
+    edges = _random_connected_edges(rng, routers, num_routers * avg_degree // 2)
+    return _address_topology(routers, edges, rng.sample(routers, min(num_hosts, num_routers)))
+
+
+def _address_topology(routers, edges, host_routers):
+    """
+    Link tables of a generated topology: /30 router-router subnets from
+    172.16.0.0/12 in edge order, one /24 host (g1, g2, ...) from
+    10.128.0.0/9 per host router.
+
+    Returns:
+        tuple: (router_links, host_router_links, hosts)
+    """
+    next_intf = {r: 1 for r in routers}
+    router_links = []
+    for link_id, (rA, rB) in enumerate(sorted(edges, key=lambda e: (int(e[0][1:]), int(e[1][1:])))):
+        offset = link_id * 4
+        subnet = f"172.{16 + (offset >> 16)}.{(offset >> 8) & 255}"
+        ipA = f"{subnet}.{(offset & 255) + 1}/30"
+        ipB = f"{subnet}.{(offset & 255) + 2}/30"
+        router_links.append((rA, rB, f"{rA}-eth{next_intf[rA]}", f"{rB}-eth{next_intf[rB]}", ipA, ipB))
+        next_intf[rA] += 1
+        next_intf[rB] += 1
+
+    host_router_links = []
+    hosts = {}
+    for k, router in enumerate(host_routers):
+        subnet = f"10.{128 + k // 256}.{k % 256}"
+        name = f"g{k + 1}"
+        hosts[name] = (f"{subnet}.100/24", f"{subnet}.10")
+        host_router_links.append((name, router, f"{router}-eth{next_intf[router]}", f"{subnet}.10/24"))
+        next_intf[router] += 1
+
+    return router_links, host_router_links, hosts
+
+
+def _random_connected_edges(rng, nodes, target):
+    """Random spanning tree over nodes plus random extra edges up to target edges."""
+    def edge(a, b):
+        return tuple(sorted((a, b), key=lambda r: int(r[1:])))
+
+    edges = set()
+    order = nodes[:]
+    rng.shuffle(order)
+    for i in range(1, len(order)):
+        edges.add(edge(order[i], order[rng.randrange(i)]))
+
+    target = min(target, len(nodes) * (len(nodes) - 1) // 2)
+    while len(edges) < target:
+        edges.add(edge(*rng.sample(nodes, 2)))
+    return edges
+
+
+def generate_site_topology(num_sites=10, routers_per_site=20, avg_degree=4, gateways_per_site=2,
+                           core_degree=3, num_hosts=50, seed=42):
+    """
+    Generate a site-structured topology in the same table format: random
+    connected sites whose first gateways_per_site routers also join a random
+    connected core mesh, the only links between sites.
+
+    Args:
+        num_sites: Number of sites
+        routers_per_site: Routers per site
+        avg_degree: Target average router degree inside a site
+        gateways_per_site: Routers of each site attached to the core
+        core_degree: Target average degree of the gateways in the core
+        num_hosts: Number of hosts, each attached to a distinct random router
+        seed: Seed of the generator
+
+    Returns:
+        tuple: (router_links, host_router_links, hosts, sites) with sites
+               mapping every router to its site number (1..num_sites)
+    """
+    rng = random.Random(seed)
+    routers = [f'r{i}' for i in range(1, num_sites * routers_per_site + 1)]
+    sites = {router: i // routers_per_site + 1 for i, router in enumerate(routers)}
+
+    edges = set()
+    gateways = []
+    for site in range(num_sites):
+        members = routers[site * routers_per_site:(site + 1) * routers_per_site]
+        edges |= _random_connected_edges(rng, members, routers_per_site * avg_degree // 2)
+        gateways.extend(members[:gateways_per_site])
+
+    # Core: random links plus a chain through all sites, only between gateways of different sites
+    core = _random_connected_edges(rng, gateways, len(gateways) * core_degree // 2)
+    core |= set(zip(gateways[:-1], gateways[1:]))
+    edges |= {edge for edge in core if sites[edge[0]] != sites[edge[1]]}
+
+    router_links, host_router_links, hosts = _address_topology(
+        routers, edges, rng.sample(routers, min(num_hosts, len(routers))))
+    return router_links, host_router_links, hosts, sites
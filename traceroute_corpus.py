@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+
+import json
+import os
+import re
+
+import numpy as np
+
+from hop_index import build_hop_index, ipv4_to_uint32
+from traceroute_parser import parse_traceroute_file
+
+
+TRACEROUTE_FILE = re.compile(r'^traceroutes_asymmetry_(\d+)percent\.txt$')
+
+
+def discover_cells(base_dir):
+    """
+    Find every collected cell (one traceroute file per simulation and percentage)
+    below a simulations/ tree, in a stable order.
+
+    Returns:
+        list: Dictionaries with "sim", "sim_dir", "percentage", "filename",
+              "seed", "cost_model" and "simulation_type"
+    """
+    cells = []
+
+    for root, dirs, files in os.walk(base_dir):
+        dirs.sort()
+        matches = sorted((int(m.group(1)), name) for name in files
+                         for m in [TRACEROUTE_FILE.match(name)] if m)
+        if not matches:
+            continue
+
+        metadata = {}
+        metadata_file = os.path.join(root, "simulation_metadata.json")
+        if os.path.exists(metadata_file):
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+
+        for percentage, name in matches:
+            cells.append({
+                "sim": os.path.relpath(root, base_dir),
+                "sim_dir": root,
+                "percentage": percentage,
+                "filename": os.path.join(root, name),
+                "seed": metadata.get("seed"),
+                "cost_model": metadata.get("cost_model", "unknown"),
+                "simulation_type": metadata.get("simulation_type", "unknown"),
+            })
+
+    return cells
+
+
+def load_corpus(base_dir=None, cells=None, index=None):
+    """
+    Parse a simulations/ tree into padded NumPy arrays, one row per traceroute.
+
+    Args:
+        base_dir: Root of the simulations tree (ignored if cells is given)
+        cells: Cells from discover_cells()
+        index: HopIndex of the topology (default: build_hop_index())
+
+    Returns:
+        dict: "cells" (list), "cell", "src", "dst" (host node ids), "length",
+              "reached" per record, and [records, max_hops] matrices
+              "hop_ip" (uint32, 0 for '*'), "rtt" (float32 mean ms, NaN if lost)
+              and "router" (router node id, -1 otherwise)
+    """
+    index = build_hop_index() if index is None else index
+    cells = discover_cells(base_dir) if cells is None else cells
+    node_id = {name: i for i, name in enumerate(index.nodes)}
+    host_ip = dict(index.host_addresses)
+
+    records = []
+    for cell_id, cell in enumerate(cells):
+        for (src, dst), hops in parse_traceroute_file(cell["filename"]).items():
+            records.append((cell_id, node_id[src], node_id[dst], hops, host_ip.get(dst)))
+
+    max_hops = max((len(r[3]) for r in records), default=0)
+    n = len(records)
+
+    hop_ip = np.zeros((n, max_hops), dtype=np.uint32)
+    rtt = np.full((n, max_hops), np.nan, dtype=np.float32)
+    length = np.zeros(n, dtype=np.int16)
+    reached = np.zeros(n, dtype=bool)
+
+    for i, (_, _, _, hops, dst_ip) in enumerate(records):
+        length[i] = len(hops)
+        if hops:
+            hop_ip[i, :len(hops)] = ipv4_to_uint32([h["ip"] for h in hops])
+            rtt[i, :len(hops)] = [sum(h["rtts"]) / len(h["rtts"]) if h["rtts"] else np.nan for h in hops]
+            reached[i] = hops[-1]["ip"] == dst_ip
+
+    return {
+        "cells": cells,
+        "cell": np.array([r[0] for r in records], dtype=np.int32),
+        "src": np.array([r[1] for r in records], dtype=np.int32),
+        "dst": np.array([r[2] for r in records], dtype=np.int32),
+        "length": length,
+        "reached": reached,
+        "hop_ip": hop_ip,
+        "rtt": rtt,
+        "router": index.router_of(hop_ip),
+    }
+
+
+def directed_link_table(index):
+    """
+    Matrix mapping (router u, router v) to the directed link id u->v.
+    Directed link 2*l is rA->rB of router link l, 2*l+1 is rB->rA; -1 if not adjacent.
+    """
+    table = np.full((index.num_routers, index.num_routers), -1, dtype=np.int32)
+    node_id = {name: i for i, name in enumerate(index.nodes)}
+
+    for link_id, (rA, rB) in enumerate(index.links[:index.num_router_links]):
+        a, b = node_id[rA], node_id[rB]
+        table[a, b] = 2 * link_id
+        table[b, a] = 2 * link_id + 1
+
+    return table
+
+
+def directed_links(routers, link_table):
+    """
+    Directed links traversed by each router path.
+
+    Args:
+        routers: [records, hops] router node ids (-1 for gaps and padding)
+        link_table: Output of directed_link_table()
+
+    Returns:
+        ndarray: [records, hops - 1] directed link ids, -1 where consecutive
+                 hops are not both known adjacent routers
+    """
+    u = routers[:, :-1]
+    v = routers[:, 1:]
+    valid = (u >= 0) & (v >= 0)
+    links = np.full(u.shape, -1, dtype=np.int32)
+    links[valid] = link_table[u[valid], v[valid]]
+    return links
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+
+import re
+
+
+# Header written by the collectors before every raw traceroute output
+BLOCK_HEADER = re.compile(r'^Traceroute from (\S+) to (\S+):\s*$')
+
+# Hop line of "traceroute -n": TTL followed by addresses, RTTs and '*'
+HOP_LINE = re.compile(r'^\s*(\d+)\s+(.*)$')
+
+IPV4 = re.compile(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$')
+
+
+def parse_hop_line(line):
+    """
+    Parse a single hop line such as " 2  10.0.1.2  0.159 ms  *  0.089 ms".
+
+    Returns:
+        dict: {"ttl", "ip", "ips", "rtts", "lost"} or None if not a hop line.
+              "ip" is the first responding address (None for a '* * *' hop),
+              "rtts" holds the RTT in ms of every answered probe.
+    """
+    match = HOP_LINE.match(line)
+    if not match:
+        return None
+
+    ttl = int(match.group(1))
+    ips = []
+    rtts = []
+    lost = 0
+
+    tokens = match.group(2).split()
+    for i, token in enumerate(tokens):
+        if token == '*':
+            lost += 1
+        elif IPV4.match(token):
+            if token not in ips:
+                ips.append(token)
+        elif i + 1 < len(tokens) and tokens[i + 1] == 'ms':
+            try:
+                rtts.append(float(token))
+            except ValueError:
+                pass
+
+    return {
+        "ttl": ttl,
+        "ip": ips[0] if ips else None,
+        "ips": ips,
+        "rtts": rtts,
+        "lost": lost,
+    }
+
+
+def parse_traceroute_output(output):
+    """
+    Parse the raw output of one traceroute run.
+
+    Returns:
+        list: Hop dictionaries in TTL order (see parse_hop_line())
+    """
+    hops = []
+    for line in output.splitlines():
+        if line.startswith('traceroute to'):
+            continue
+        hop = parse_hop_line(line)
+        if hop is not None:
+            hops.append(hop)
+    return hops
+
+
+def split_traceroute_blocks(text):
+    """
+    Split a traceroutes_asymmetry_Xpercent.txt file into per-pair blocks.
+
+    Returns:
+        list: (src, dst, raw_output) tuples in file order
+    """
+    blocks = []
+    current = None
+    lines = []
+
+    for line in text.splitlines():
+        header = BLOCK_HEADER.match(line)
+        if header:
+            if current is not None:
+                blocks.append((current[0], current[1], "\n".join(lines).strip()))
+            current = (header.group(1), header.group(2))
+            lines = []
+        elif current is not None:
+            lines.append(line)
+
+    if current is not None:
+        blocks.append((current[0], current[1], "\n".join(lines).strip()))
+
+    return blocks
+
+
+def parse_traceroute_text(text):
+    """
+    Parse the content of a collected traceroute file.
+
+    Returns:
+        dict: (src, dst) -> list of hop dictionaries
+    """
+    return {(src, dst): parse_traceroute_output(output)
+            for src, dst, output in split_traceroute_blocks(text)}
+
+
+def parse_traceroute_file(filename):
+    """Parse a traceroutes_asymmetry_Xpercent.txt file (see parse_traceroute_text())."""
+    with open(filename, 'r') as f:
+        return parse_traceroute_text(f.read())
+
+
+def traceroute_file_stats(filename):
+    """
+    Size of a collected traceroute file.
+
+    Returns:
+        dict: Number of traceroutes, hops and silent ('* * *') hops
+    """
+    traces = parse_traceroute_file(filename)
+    hops = [hop for trace in traces.values() for hop in trace]
+    return {"traceroutes": len(traces), "hops": len(hops),
+            "silent_hops": sum(1 for hop in hops if hop["ip"] is None)}
+
+
+def write_traceroute_blocks(filename, blocks):
+    """
+    Write (src, dst, raw_output) blocks in the collectors' text format.
+    """
+    with open(filename, 'w') as f:
+        for src, dst, output in blocks:
+            f.write(f"Traceroute from {src} to {dst}:\n")
+            f.write(output + "\n\n")